@@ -0,0 +1,61 @@
+"""
+Compare two benchmark reports written by benchmarks.run.
+
+    python -m benchmarks.compare baseline.json current.json --threshold 0.1
+
+Prints the change of each median and exits with status 1 when any benchmark
+got slower than the threshold allows.
+"""
+
+import argparse
+import json
+import sys
+
+
+def _key(result: dict) -> tuple:
+    return result["name"], json.dumps(result["params"], sort_keys=True)
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> tuple[list, bool]:
+    previous = {_key(result): result for result in baseline["results"]}
+    rows, regressed = [], False
+    for result in current["results"]:
+        before = previous.get(_key(result))
+        if before is None or not before["median"]:
+            continue
+        change = result["median"] / before["median"] - 1
+        slower = change > threshold
+        regressed |= slower
+        rows.append((result, before, change, slower))
+    return rows, regressed
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare benchmark reports.")
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Allowed slowdown of a median, as a fraction (default: 0.1).",
+    )
+    args = parser.parse_args(argv)
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.current, encoding="utf-8") as f:
+        current = json.load(f)
+
+    rows, regressed = compare(baseline, current, args.threshold)
+    for result, before, change, slower in rows:
+        params = ", ".join(f"{k}={v}" for k, v in result["params"].items())
+        print(
+            f"{result['name']:<16} {params:<60} "
+            f"{before['median'] * 1000:9.3f} -> {result['median'] * 1000:9.3f} ms "
+            f"{change:+7.1%}{'  REGRESSION' if slower else ''}"
+        )
+    return 1 if regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,223 @@
+"""
+Loopback stand-in for a STET DSP2 API, for benchmarks.
+
+MockSTETServer serves /oauth/token, /stet/identity, /stet/account and the
+per-account, balance and paginated transaction endpoints on 127.0.0.1, from
+a background thread. Payloads are generated deterministically from the
+configuration and serialized once, so the server adds as little time as
+possible to what is measured. Latency and error rate are configurable; failed
+requests answer 503.
+"""
+
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+ACCOUNT_PATH = re.compile(r"^/stet/account/([^/]+)(/balance|/transaction)?$")
+
+
+@dataclass
+class MockServerConfig:
+    accounts: int = 3
+    balances_per_account: int = 2
+    transactions_per_account: int = 500
+    label_size: int = 16
+    latency: float = 0.0
+    error_rate: float = 0.0
+    token_expires_in: int = 3600
+    seed: int = 0
+
+
+def _object_id(prefix: str, index: int) -> str:
+    return f"{prefix}_{index:024d}"
+
+
+def make_identity() -> dict:
+    return {
+        "id": _object_id("user", 1),
+        "prefix": "MIST",
+        "first_name": "Bench",
+        "last_name": "Mark",
+        "date_of_birth": "1990-01-01",
+    }
+
+
+def make_account(index: int) -> dict:
+    return {
+        "id": _object_id("acct", index),
+        "type": "CACC" if index % 2 else "CARD",
+        "usage": "PRIV",
+        "iban": f"FR76{index:023d}",
+        "name": f"Account {index}",
+        "currency": "EUR",
+    }
+
+
+def make_balance(index: int) -> dict:
+    return {
+        "id": _object_id("blnc", index),
+        "name": f"Balance {index}",
+        "amount": 100_000 + index,
+        "currency": "EUR",
+        "type": "CLBD",
+    }
+
+
+def make_transaction(index: int, label_size: int = 16) -> dict:
+    """Transaction `index` of an account; 0 is the most recent."""
+    operated = START - timedelta(hours=index)
+    return {
+        "id": _object_id("tran", index),
+        "label": f"Card payment {index:06d}".ljust(label_size, "x"),
+        "amount": 100 + index % 10_000,
+        "crdt_dbit_indicator": "DBIT" if index % 3 else "CRDT",
+        "status": "PDNG" if index < 5 else "BOOK",
+        "currency": "EUR",
+        "date_operation": operated.isoformat(),
+        "date_processed": (operated + timedelta(days=1)).isoformat(),
+    }
+
+
+class MockSTETServer:
+    """
+    Start with `with MockSTETServer(config) as server:` and point clients at
+    `server.base_url`. `server.requests` counts the requests served.
+    """
+
+    def __init__(self, config: MockServerConfig | None = None):
+        self.config = config or MockServerConfig()
+        self.requests = 0
+        self._random = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._identity = json.dumps(make_identity()).encode()
+        accounts = [make_account(i + 1) for i in range(self.config.accounts)]
+        self._accounts = json.dumps(accounts).encode()
+        self._account_by_id = {a["id"]: json.dumps(a).encode() for a in accounts}
+        self._balances = json.dumps(
+            [make_balance(i + 1) for i in range(self.config.balances_per_account)]
+        ).encode()
+        self._transactions = [
+            make_transaction(i, self.config.label_size)
+            for i in range(self.config.transactions_per_account)
+        ]
+        self._pages: dict[tuple[int, int], bytes] = {}
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockSTETServer":
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name="mock-stet-server", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "MockSTETServer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def transactions_page(self, page: int, count: int) -> bytes:
+        key = (page, count)
+        body = self._pages.get(key)
+        if body is None:
+            start = (page - 1) * count
+            body = json.dumps(self._transactions[start : start + count]).encode()
+            self._pages[key] = body
+        return body
+
+    def _should_fail(self) -> bool:
+        if not self.config.error_rate:
+            return False
+        with self._lock:
+            return self._random.random() < self.config.error_rate
+
+    def route(self, method: str, target: str) -> tuple[int, bytes]:
+        url = urlsplit(target)
+        with self._lock:
+            self.requests += 1
+        if self.config.latency:
+            time.sleep(self.config.latency)
+        if self._should_fail():
+            return 503, b'{"error": "unavailable"}'
+
+        if method == "POST" and url.path == "/oauth/token":
+            return (
+                200,
+                json.dumps(
+                    {
+                        "access_token": f"token-{self.requests}",
+                        "refresh_token": "refresh",
+                        "expires_in": self.config.token_expires_in,
+                    }
+                ).encode(),
+            )
+        if method != "GET":
+            return 405, b"{}"
+        if url.path == "/stet/identity":
+            return 200, self._identity
+        if url.path == "/stet/account":
+            return 200, self._accounts
+
+        match = ACCOUNT_PATH.match(url.path)
+        if match is None or match.group(1) not in self._account_by_id:
+            return 404, b'{"error": "not found"}'
+        section = match.group(2)
+        if section is None:
+            return 200, self._account_by_id[match.group(1)]
+        if section == "/balance":
+            return 200, self._balances
+        query = parse_qs(url.query)
+        page = int(query.get("page", ["1"])[0])
+        count = int(query.get("count", ["10"])[0])
+        return 200, self.transactions_page(page, count)
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are separate writes; Nagle would delay the body.
+            disable_nagle_algorithm = True
+
+            def _respond(self, method: str):
+                length = int(self.headers.get("Content-Length") or 0)
+                if length:
+                    self.rfile.read(length)
+                status, body = server.route(method, self.path)
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                self._respond("GET")
+
+            def do_POST(self):
+                self._respond("POST")
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,311 @@
+"""
+Benchmark scenarios run against the loopback mock STET server.
+
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --scenario pagination --latency 0.005 --repeat 20
+
+Results are printed as a table and written as JSON, including the commit
+they were measured on, so runs can be compared with benchmarks.compare.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Callable
+
+from dsp2_client.api.api_client import DSP2Client
+from dsp2_client.api.http_config import SharedTransport
+from dsp2_client.api.scheduler import RequestScheduler, RetryPolicy
+from dsp2_client.models.bulk import dump_many, validate_dicts_json, validate_many_json
+from dsp2_client.models.offload import ProcessValidator
+from dsp2_client.models.transaction import TransactionSchema
+
+from .mock_server import MockServerConfig, MockSTETServer, make_transaction
+
+# Benchmarks measure the client, not backoff sleeps.
+SCHEDULER = RequestScheduler(RetryPolicy(max_attempts=5, backoff_base=0.001))
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    params: dict
+    unit: str
+    samples: list[float] = field(repr=False)
+    items: int = 1
+
+    def stats(self) -> dict:
+        samples = sorted(self.samples)
+        median = statistics.median(samples)
+        return {
+            "iterations": len(samples),
+            "min": samples[0],
+            "median": median,
+            "mean": statistics.fmean(samples),
+            "p95": samples[min(len(samples) - 1, int(0.95 * len(samples)))],
+            "max": samples[-1],
+            "stdev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+            "items_per_second": self.items / median if median else None,
+        }
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "params": self.params,
+            "unit": self.unit,
+            "items": self.items,
+            **self.stats(),
+        }
+
+
+def measure(fn: Callable[[], object], repeat: int, warmup: int = 1) -> list[float]:
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def client_for(server: MockSTETServer, **options) -> DSP2Client:
+    return DSP2Client(
+        "bench", "bench", base_url=server.base_url, scheduler=SCHEDULER, **options
+    )
+
+
+def bench_auth(server_config: MockServerConfig, repeat: int) -> list[BenchmarkResult]:
+    with MockSTETServer(server_config) as server:
+        transport = SharedTransport()
+        try:
+            cold = measure(lambda: client_for(server).close(), repeat)
+            warm = measure(
+                lambda: client_for(server, transport=transport).close(), repeat
+            )
+        finally:
+            transport.shutdown()
+    return [
+        # An own transport pays for a TLS context and a new connection.
+        BenchmarkResult("auth", {"transport": "own"}, "seconds", cold),
+        BenchmarkResult("auth", {"transport": "shared"}, "seconds", warm),
+    ]
+
+
+def bench_single_call(
+    server_config: MockServerConfig, repeat: int
+) -> list[BenchmarkResult]:
+    with MockSTETServer(server_config) as server:
+        with client_for(server) as client:
+            account_id = client.get_accounts()[0].id
+            calls = {
+                "get_identity": client.get_identity,
+                "get_accounts": client.get_accounts,
+                "get_balances": lambda: client.get_balances(account_id),
+                "get_transactions": lambda: client.get_transactions(account_id),
+            }
+            return [
+                BenchmarkResult(
+                    "single_call", {"call": name}, "seconds", measure(fn, repeat)
+                )
+                for name, fn in calls.items()
+            ]
+
+
+def bench_full_user_data(
+    server_config: MockServerConfig,
+    repeat: int,
+    account_counts=(1, 10, 50),
+    worker_counts=(None, 8),
+) -> list[BenchmarkResult]:
+    results = []
+    for accounts in account_counts:
+        config = MockServerConfig(**{**asdict(server_config), "accounts": accounts})
+        with MockSTETServer(config) as server:
+            for workers in worker_counts:
+                with client_for(server, max_workers=workers) as client:
+                    samples = measure(client.get_full_user_data, repeat)
+                results.append(
+                    BenchmarkResult(
+                        "full_user_data",
+                        {"accounts": accounts, "max_workers": workers},
+                        "seconds",
+                        samples,
+                        items=accounts,
+                    )
+                )
+    return results
+
+
+def bench_pagination(
+    server_config: MockServerConfig,
+    repeat: int,
+    total=5000,
+    page_size=100,
+) -> list[BenchmarkResult]:
+    config = MockServerConfig(
+        **{**asdict(server_config), "accounts": 1, "transactions_per_account": total}
+    )
+    results = []
+    with MockSTETServer(config) as server:
+        with client_for(server) as client:
+            account_id = client.get_accounts()[0].id
+            for prefetch in (0, 2):
+                samples = measure(
+                    lambda: sum(
+                        1
+                        for _ in client.iter_transactions(
+                            account_id, page_size=page_size, prefetch=prefetch
+                        )
+                    ),
+                    repeat,
+                )
+                results.append(
+                    BenchmarkResult(
+                        "pagination",
+                        {
+                            "mode": "iter_transactions",
+                            "prefetch": prefetch,
+                            "page_size": page_size,
+                            "transactions": total,
+                        },
+                        "seconds",
+                        samples,
+                        items=total,
+                    )
+                )
+            samples = measure(
+                lambda: sum(
+                    1 for _ in client.stream_transactions(account_id, count=total)
+                ),
+                repeat,
+            )
+            results.append(
+                BenchmarkResult(
+                    "pagination",
+                    {"mode": "stream_transactions", "transactions": total},
+                    "seconds",
+                    samples,
+                    items=total,
+                )
+            )
+    return results
+
+
+def bench_validation(
+    server_config: MockServerConfig, repeat: int, count=10_000
+) -> list[BenchmarkResult]:
+    items = [make_transaction(i, server_config.label_size) for i in range(count)]
+    raw = json.dumps(items).encode()
+    with ProcessValidator(max_workers=1, threshold=0) as validator:
+        runs = {
+            "validate_many_json": lambda: validate_many_json(TransactionSchema, raw),
+            "per_item": lambda: [TransactionSchema(**item) for item in json.loads(raw)],
+            "dump_many": lambda: dump_many(
+                TransactionSchema, validate_many_json(TransactionSchema, raw)
+            ),
+            "validate_dicts_json": lambda: validate_dicts_json(TransactionSchema, raw),
+            # One worker: measures the round trip, not parallelism.
+            "process_offload": lambda: validator.validate_dicts(TransactionSchema, raw),
+        }
+        return [
+            BenchmarkResult(
+                "validation",
+                {"mode": mode, "transactions": count},
+                "seconds",
+                measure(fn, repeat),
+                items=count,
+            )
+            for mode, fn in runs.items()
+        ]
+
+
+SCENARIOS = {
+    "auth": bench_auth,
+    "single_call": bench_single_call,
+    "full_user_data": bench_full_user_data,
+    "pagination": bench_pagination,
+    "validation": bench_validation,
+}
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(scenarios: list[str], server_config: MockServerConfig, repeat: int) -> dict:
+    results = []
+    for name in scenarios:
+        results.extend(SCENARIOS[name](server_config, repeat))
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": repeat,
+            "server": asdict(server_config),
+        },
+        "results": [result.to_dict() for result in results],
+    }
+
+
+def print_table(report: dict, out=sys.stdout):
+    for result in report["results"]:
+        params = ", ".join(f"{k}={v}" for k, v in result["params"].items())
+        rate = result["items_per_second"]
+        print(
+            f"{result['name']:<16} {params:<60} "
+            f"median {result['median'] * 1000:9.3f} ms  "
+            f"p95 {result['p95'] * 1000:9.3f} ms"
+            + (f"  {rate:12.0f} items/s" if result["items"] > 1 else ""),
+            file=out,
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Run dsp2client benchmarks.")
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=sorted(SCENARIOS),
+        help="Scenario to run; repeat the flag for several (default: all).",
+    )
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds.")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--transactions", type=int, default=500)
+    parser.add_argument("--label-size", type=int, default=16)
+    parser.add_argument("--output", help="Write the JSON report to this file.")
+    args = parser.parse_args(argv)
+
+    server_config = MockServerConfig(
+        latency=args.latency,
+        error_rate=args.error_rate,
+        transactions_per_account=args.transactions,
+        label_size=args.label_size,
+    )
+    report = run(args.scenario or list(SCENARIOS), server_config, args.repeat)
+    print_table(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
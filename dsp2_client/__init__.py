@@ -0,0 +1,66 @@
+"""
+Client library for STET-compliant DSP2 APIs.
+
+The client classes are importable from the package root; their modules, and
+httpx and pydantic with them, are only imported on first access.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+_EXPORTS = {
+    "DSP2Client": "dsp2_client.api.api_client",
+    "AsyncDSP2Client": "dsp2_client.api.async_api_client",
+    "DSP2ClientPool": "dsp2_client.api.client_pool",
+    "DSP2Error": "dsp2_client.api.errors",
+    "DSP2AuthenticationError": "dsp2_client.api.errors",
+    "DSP2HTTPError": "dsp2_client.api.errors",
+    "HTTPConfig": "dsp2_client.api.http_config",
+    "SharedTransport": "dsp2_client.api.http_config",
+    "ResponseCache": "dsp2_client.api.response_cache",
+    "RequestScheduler": "dsp2_client.api.scheduler",
+    "RetryPolicy": "dsp2_client.api.scheduler",
+    "RateLimiter": "dsp2_client.api.scheduler",
+    "InMemoryTokenCache": "dsp2_client.api.token_cache",
+    "FileTokenCache": "dsp2_client.api.token_cache",
+}
+
+__all__ = [
+    "AsyncDSP2Client",
+    "DSP2AuthenticationError",
+    "DSP2Client",
+    "DSP2ClientPool",
+    "DSP2Error",
+    "DSP2HTTPError",
+    "FileTokenCache",
+    "HTTPConfig",
+    "InMemoryTokenCache",
+    "RateLimiter",
+    "RequestScheduler",
+    "ResponseCache",
+    "RetryPolicy",
+    "SharedTransport",
+]
+
+if TYPE_CHECKING:
+    from .api.api_client import DSP2Client
+    from .api.async_api_client import AsyncDSP2Client
+    from .api.client_pool import DSP2ClientPool
+    from .api.errors import DSP2AuthenticationError, DSP2Error, DSP2HTTPError
+    from .api.http_config import HTTPConfig, SharedTransport
+    from .api.response_cache import ResponseCache
+    from .api.scheduler import RateLimiter, RequestScheduler, RetryPolicy
+    from .api.token_cache import FileTokenCache, InMemoryTokenCache
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
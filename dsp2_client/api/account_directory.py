@@ -0,0 +1,196 @@
+"""
+Per-session directory of the user's accounts.
+
+The directory is loaded by one get_accounts call and indexes the accounts by
+id, IBAN, type and usage, so lookups cost no request. It reloads on the first
+lookup after `ttl` seconds, and on a lookup missing an id or IBAN, unless it
+was loaded less than `miss_refresh_interval` seconds ago: a batch of lookups
+costs at most one request. Concurrent reloads are collapsed into one.
+"""
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Iterable, TypeVar
+
+from dsp2_client.models.account import AccountSchema, AccountType, AccountUsage
+
+from .. import config
+
+T = TypeVar("T")
+
+# Loaders are passed True when reloading after a miss, when cached account
+# lists must not be used.
+Loader = Callable[[bool], list[AccountSchema]]
+AsyncLoader = Callable[[bool], Awaitable[list[AccountSchema]]]
+
+
+def normalize_iban(iban: str) -> str:
+    return iban.replace(" ", "").upper()
+
+
+@dataclass(frozen=True)
+class AccountIndex:
+    accounts: tuple[AccountSchema, ...]
+    loaded_at: float
+    by_id: dict[str, AccountSchema] = field(default_factory=dict)
+    by_iban: dict[str, AccountSchema] = field(default_factory=dict)
+    by_type: dict[AccountType, tuple[AccountSchema, ...]] = field(default_factory=dict)
+    by_usage: dict[AccountUsage, tuple[AccountSchema, ...]] = field(
+        default_factory=dict
+    )
+
+    @classmethod
+    def build(cls, accounts: Iterable[AccountSchema], loaded_at: float):
+        accounts = tuple(accounts)
+        by_type, by_usage = {}, {}
+        for account in accounts:
+            by_type.setdefault(AccountType(account.type), []).append(account)
+            by_usage.setdefault(AccountUsage(account.usage), []).append(account)
+        return cls(
+            accounts,
+            loaded_at,
+            {account.id: account for account in accounts},
+            {normalize_iban(account.iban): account for account in accounts},
+            {key: tuple(value) for key, value in by_type.items()},
+            {key: tuple(value) for key, value in by_usage.items()},
+        )
+
+
+class _Directory:
+    def __init__(
+        self,
+        ttl: float | None = None,
+        miss_refresh_interval: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl = config.CACHE_TTL_ACCOUNTS if ttl is None else ttl
+        self.miss_refresh_interval = miss_refresh_interval
+        self.clock = clock
+        self.loads = 0
+        self._index: AccountIndex | None = None
+
+    def invalidate(self):
+        """Reload on the next lookup."""
+        self._index = None
+
+    def _expired(self, index: AccountIndex | None) -> bool:
+        return index is None or self.clock() - index.loaded_at >= self.ttl
+
+    def _may_refresh_after_miss(self, index: AccountIndex) -> bool:
+        return self.clock() - index.loaded_at >= self.miss_refresh_interval
+
+    def _stored(self, accounts: list[AccountSchema]) -> AccountIndex:
+        self.loads += 1
+        self._index = AccountIndex.build(accounts, self.clock())
+        return self._index
+
+    @staticmethod
+    def _find_many(index: AccountIndex, account_ids: list[str]) -> list:
+        return [index.by_id.get(account_id) for account_id in account_ids]
+
+    @staticmethod
+    def _find_iban(index: AccountIndex, iban: str) -> AccountSchema | None:
+        return index.by_iban.get(normalize_iban(iban))
+
+
+class AccountDirectory(_Directory):
+    def __init__(self, load: Loader, **options):
+        super().__init__(**options)
+        self._load = load
+        self._lock = threading.Lock()
+
+    def _current(self, stale: AccountIndex | None = None) -> AccountIndex:
+        index = self._index
+        if index is not None and index is not stale and not self._expired(index):
+            return index
+        with self._lock:
+            # Another caller may have reloaded while we waited.
+            index = self._index
+            if index is not None and index is not stale and not self._expired(index):
+                return index
+            return self._stored(self._load(stale is not None))
+
+    def _lookup(self, find: Callable[[AccountIndex], T], missed) -> T:
+        index = self._current()
+        result = find(index)
+        if missed(result) and self._may_refresh_after_miss(index):
+            result = find(self._current(stale=index))
+        return result
+
+    def accounts(self) -> list[AccountSchema]:
+        return list(self._current().accounts)
+
+    def get(self, account_id: str) -> AccountSchema | None:
+        return self.get_many([account_id])[0]
+
+    def get_many(self, account_ids: Iterable[str]) -> list[AccountSchema | None]:
+        """Accounts in the order of the ids, None for unknown ids."""
+        account_ids = list(account_ids)
+        return self._lookup(
+            lambda index: self._find_many(index, account_ids),
+            lambda found: None in found,
+        )
+
+    def find_by_iban(self, iban: str) -> AccountSchema | None:
+        return self._lookup(
+            lambda index: self._find_iban(index, iban), lambda found: found is None
+        )
+
+    def by_type(self, account_type: AccountType) -> list[AccountSchema]:
+        return list(self._current().by_type.get(AccountType(account_type), ()))
+
+    def by_usage(self, usage: AccountUsage) -> list[AccountSchema]:
+        return list(self._current().by_usage.get(AccountUsage(usage), ()))
+
+
+class AsyncAccountDirectory(_Directory):
+    def __init__(self, load: AsyncLoader, **options):
+        super().__init__(**options)
+        self._load = load
+        self._lock: asyncio.Lock | None = None
+
+    async def _current(self, stale: AccountIndex | None = None) -> AccountIndex:
+        index = self._index
+        if index is not None and index is not stale and not self._expired(index):
+            return index
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            index = self._index
+            if index is not None and index is not stale and not self._expired(index):
+                return index
+            return self._stored(await self._load(stale is not None))
+
+    async def _lookup(self, find: Callable[[AccountIndex], T], missed) -> T:
+        index = await self._current()
+        result = find(index)
+        if missed(result) and self._may_refresh_after_miss(index):
+            result = find(await self._current(stale=index))
+        return result
+
+    async def accounts(self) -> list[AccountSchema]:
+        return list((await self._current()).accounts)
+
+    async def get(self, account_id: str) -> AccountSchema | None:
+        return (await self.get_many([account_id]))[0]
+
+    async def get_many(self, account_ids: Iterable[str]) -> list[AccountSchema | None]:
+        """Accounts in the order of the ids, None for unknown ids."""
+        account_ids = list(account_ids)
+        return await self._lookup(
+            lambda index: self._find_many(index, account_ids),
+            lambda found: None in found,
+        )
+
+    async def find_by_iban(self, iban: str) -> AccountSchema | None:
+        return await self._lookup(
+            lambda index: self._find_iban(index, iban), lambda found: found is None
+        )
+
+    async def by_type(self, account_type: AccountType) -> list[AccountSchema]:
+        return list((await self._current()).by_type.get(AccountType(account_type), ()))
+
+    async def by_usage(self, usage: AccountUsage) -> list[AccountSchema]:
+        return list((await self._current()).by_usage.get(AccountUsage(usage), ()))
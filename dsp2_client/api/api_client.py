@@ -3,79 +3,567 @@ DSP2Client: A client library for interacting with a STET-compliant DSP2 API.
 Handles authentication and requests for identity, accounts, balances, and transactions.
 """
 
-from typing import List
+import contextvars
+import json
+from collections import deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor, wait
+from contextlib import nullcontext
+from datetime import datetime, timezone
+from typing import Callable, Iterable, Iterator, List, TypeVar
 
-from dsp2_client.models.account import AccountSchema
+import httpx
+
+from dsp2_client.models.account import AccountSchema, AccountType, AccountUsage
 from dsp2_client.models.balance import BalanceSchema
+from dsp2_client.models.bulk import (
+    validate_dicts,
+    validate_dicts_json,
+    validate_many,
+    validate_many_json,
+)
 from dsp2_client.models.identity import UserIdentitySchema
+from dsp2_client.models.offload import ProcessValidator
 from dsp2_client.models.transaction import TransactionSchema
 
-from .. import config
+from .. import config, logger
+from .account_directory import AccountDirectory
 from .authenticator import DSP2Authenticator
 from .base_client import BaseAPIClient
+from .deadline import Deadline, current_deadline
+from .errors import DSP2ClientError, DSP2DeadlineExceededError, error_marker
+from .http_config import HTTPConfig
+from .json_stream import loads
+from .response_cache import ResponseCache
+from .scheduler import RequestScheduler
+from .selection import AccountSelection, DateWindow
+from .token_cache import TokenCache, token_cache_key
+from .token_manager import TokenManager
+
+T = TypeVar("T")
 
 
 class DSP2Client:
-    def __init__(self, username: str, password: str, base_url: str | None = None):
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        base_url: str | None = None,
+        max_workers: int | None = None,
+        executor: Executor | None = None,
+        token_cache: TokenCache | None = None,
+        lazy_auth: bool = False,
+        http_config: HTTPConfig | None = None,
+        transport: httpx.BaseTransport | None = None,
+        cache: ResponseCache | None = None,
+        scheduler: RequestScheduler | None = None,
+        validator: ProcessValidator | None = None,
+    ):
+        """
+        With `lazy_auth`, no request is made until the first API call.
+        A `token_cache` shared between clients lets them reuse one token, and a
+        shared `transport` lets them reuse warm connections. A response `cache`
+        keeps GET results for the lifetimes configured per endpoint. Sharing a
+        `scheduler` shares its retry policy, rate limiter and circuit breaker.
+        A `validator` validates the balances and transactions aggregated by
+        get_full_user_data, in worker processes when they are large, with the
+        same result as validating them in-process.
+        Account lookups by id or IBAN are served by `account_directory`.
+        """
+        if max_workers is not None and max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
         self.base_url = base_url or config.API_BASE_URL
-        self.authenticator = DSP2Authenticator(
-            username, password, BaseAPIClient(self.base_url)._client
+        self.max_workers = max_workers
+        self.executor = executor
+        self.validator = validator
+        self.api = BaseAPIClient(
+            base_url=self.base_url,
+            http_config=http_config,
+            transport=transport,
+            cache=cache,
+            cache_namespace=(self.base_url, username),
+            scheduler=scheduler,
+        )
+        self.authenticator = DSP2Authenticator(username, password, self.api._client)
+        self.token_manager = TokenManager(
+            self.authenticator,
+            cache=token_cache,
+            cache_key=token_cache_key(
+                self.base_url, username, self.authenticator.scope
+            ),
         )
+        self.api.token_manager = self.token_manager
+        self.account_directory = AccountDirectory(self._load_account_directory)
 
-        token = self.authenticator.authenticate()
-        self.api = BaseAPIClient(base_url=self.base_url, token=token)
+        if not lazy_auth:
+            try:
+                self.api.set_token(self.token_manager.get_token())
+            except Exception:
+                self.close()
+                raise
+
+    def __enter__(self) -> "DSP2Client":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Release the client's connections. A shared transport stays open.
+        """
+        self.api.close()
 
     def ensure_authenticated(self):
         """
-        Ensure the client is authenticated before making API calls.
+        Ensure the client holds a token that is not about to expire.
         """
-        if not self.authenticator.token:
-            token = self.authenticator.authenticate()
+        if self.token_manager.needs_refresh():
+            token = self.token_manager.get_token()
             self.api.set_token(token)
 
+    def invalidate_account(self, account_id: str):
+        """
+        Drop cached responses of one account, e.g. after a known movement.
+        """
+        if self.api.cache is not None:
+            self.api.cache.invalidate(self.api.cache_namespace, account_id=account_id)
+
+    def invalidate_cache(self):
+        """
+        Drop every cached response of this user.
+        """
+        if self.api.cache is not None:
+            self.api.cache.invalidate(self.api.cache_namespace)
+        self.account_directory.invalidate()
+
     def get_identity(self) -> UserIdentitySchema:
         self.ensure_authenticated()
         data = self.api.get(config.IDENTITY)
         return UserIdentitySchema(**data)
 
-    def get_accounts(self) -> List[AccountSchema]:
+    def get_accounts(self, validate: bool = True) -> List[AccountSchema] | List[dict]:
+        """With validate=False the decoded JSON dicts are returned as they are."""
         self.ensure_authenticated()
         data = self.api.get(config.ACCOUNTS)
-        return [AccountSchema(**item) for item in data]
+        if not validate:
+            return data
+        return validate_many(AccountSchema, data)
 
     def get_account(self, account_id: str) -> AccountSchema:
+        """
+        Served by the account directory; ids it does not know are requested
+        from the account endpoint.
+        """
+        account = self.account_directory.get(account_id)
+        if account is not None:
+            return account
         self.ensure_authenticated()
-        data = self.api.get(config.ACCOUNT.format(account_id=account_id))
+        data = self.api.get(config.ACCOUNT, path_params={"account_id": account_id})
         return AccountSchema(**data)
 
-    def get_balances(self, account_id: str) -> List[BalanceSchema]:
+    def get_accounts_by_ids(self, account_ids: Iterable[str]) -> List[AccountSchema]:
+        """
+        Accounts in the order of the ids, with at most one get_accounts
+        request. Raises DSP2ClientError (404) when an id is unknown.
+        """
+        account_ids = list(account_ids)
+        accounts = self.account_directory.get_many(account_ids)
+        unknown = [i for i, account in zip(account_ids, accounts) if account is None]
+        if unknown:
+            raise DSP2ClientError(f"Unknown accounts: {', '.join(unknown)}", 404)
+        return accounts
+
+    def find_by_iban(self, iban: str) -> AccountSchema | None:
+        """The account with this IBAN (spaces and case ignored), if any."""
+        return self.account_directory.find_by_iban(iban)
+
+    def _load_account_directory(self, after_miss: bool) -> List[AccountSchema]:
+        if after_miss and self.api.cache is not None:
+            self.api.cache.invalidate(self.api.cache_namespace, url=config.ACCOUNTS)
+        return self.get_accounts()
+
+    def get_balances(
+        self, account_id: str, validate: bool = True
+    ) -> List[BalanceSchema] | List[dict]:
+        """
+        Balances are validated straight from the response body. With
+        validate=False the decoded JSON dicts are returned as they are.
+        """
         self.ensure_authenticated()
-        data = self.api.get(config.BALANCE.format(account_id=account_id))
-        return [BalanceSchema(**item) for item in data]
+        raw = self.api.get_bytes(config.BALANCE, path_params={"account_id": account_id})
+        if not validate:
+            return json.loads(raw)
+        return validate_many_json(BalanceSchema, raw)
 
     def get_transactions(
-        self, account_id: str, page: int = 1, count: int = 10
-    ) -> List[TransactionSchema]:
+        self, account_id: str, page: int = 1, count: int = 10, validate: bool = True
+    ) -> List[TransactionSchema] | List[dict]:
+        """
+        Transactions are validated straight from the response body. With
+        validate=False the decoded JSON dicts are returned as they are.
+        """
         self.ensure_authenticated()
+        raw = self._get_transactions_page(account_id, page, count)
+        if not validate:
+            return json.loads(raw)
+        return validate_many_json(TransactionSchema, raw)
+
+    def stream_transactions(
+        self,
+        account_id: str,
+        page: int = 1,
+        count: int = 10,
+        validate: bool = True,
+    ) -> Iterator[TransactionSchema] | Iterator[dict]:
+        """
+        Yield the transactions of one page as they are received, validating
+        each one from its raw JSON (or only decoding it, with validate=False).
+        Memory stays bounded by one transaction however large `count` is, and
+        processing overlaps with the download.
+        """
+        self.ensure_authenticated()
+        items = self.api.iter_array(
+            config.TRANSACTIONS,
+            params={"page": page, "count": count},
+            path_params={"account_id": account_id},
+        )
+        for item in items:
+            if validate:
+                yield TransactionSchema.model_validate_json(item)
+            else:
+                yield loads(item)
+
+    def _get_transactions_page(self, account_id: str, page: int, count: int) -> bytes:
         params = {"page": page, "count": count}
-        data = self.api.get(
-            config.TRANSACTIONS.format(account_id=account_id), params=params
+        return self.api.get_bytes(
+            config.TRANSACTIONS, params=params, path_params={"account_id": account_id}
         )
-        return [TransactionSchema(**item) for item in data]
 
-    def get_full_user_data(self, transactions_per_account: int = 10) -> dict:
+    def _get_section(self, model, raw: bytes, validate: bool) -> list[dict]:
+        """
+        Turn a list payload into dicts, validating it in bulk on the way.
+        """
+        if not validate:
+            return json.loads(raw)
+        if self.validator is not None:
+            return self.validator.validate_dicts(model, raw)
+        return validate_dicts_json(model, raw)
+
+    def _get_account_sections(
+        self,
+        account_id: str,
+        transactions_per_account: int,
+        validate: bool,
+        include_balances: bool = True,
+        include_transactions: bool = True,
+        window: DateWindow | None = None,
+        partial: bool = False,
+    ) -> dict:
+        fetchers = {}
+        if include_balances:
+            fetchers["balances"] = lambda: self._get_section(
+                BalanceSchema,
+                self.api.get_bytes(
+                    config.BALANCE, path_params={"account_id": account_id}
+                ),
+                validate,
+            )
+        if include_transactions:
+            if window:
+                fetchers["transactions"] = lambda: self._get_window_transactions(
+                    account_id, transactions_per_account, validate, window
+                )
+            else:
+                fetchers["transactions"] = lambda: self._get_section(
+                    TransactionSchema,
+                    self._get_transactions_page(
+                        account_id, 1, transactions_per_account
+                    ),
+                    validate,
+                )
+
+        sections = {}
+        errors = {} if partial else None
+        for name, fetch in fetchers.items():
+            data = _collect(errors, name, fetch)
+            if data is not None:
+                sections[name] = data
+        if errors:
+            sections["errors"] = errors
+        return sections
+
+    def _get_window_transactions(
+        self, account_id: str, page_size: int, validate: bool, window: DateWindow
+    ) -> list[dict]:
+        """
+        Walk pages, most recent first, until one reaches past the start of
+        the window, keeping the transactions inside it.
+        """
+        selected = []
+        page = 1
+        while True:
+            raw = self._get_transactions_page(account_id, page, page_size)
+            items = self._get_section(TransactionSchema, raw, validate)
+            selected.extend(
+                item for item in items if window.contains(item["date_operation"])
+            )
+            if len(items) < page_size or any(
+                window.is_before(item["date_operation"]) for item in items
+            ):
+                return selected
+            page += 1
+
+    def iter_transactions(
+        self,
+        account_id: str,
+        page_size: int = 50,
+        since: datetime | None = None,
+        prefetch: int = 2,
+    ) -> Iterator[TransactionSchema]:
+        """
+        Lazily yield every transaction of an account across all pages.
+
+        Iteration stops on the first short or empty page. While a page is being
+        consumed, up to `prefetch` following pages are fetched in the background;
+        only those pages are held in memory. When `since` is given, transactions
+        operated before it are skipped (naive datetimes are taken as UTC), and
+        as pages come most recent first, no page is requested after one
+        reaching past it.
+        """
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+        if prefetch < 0:
+            raise ValueError("prefetch must not be negative")
+        since = _as_utc(since) if since else None
+
+        executor = (
+            ThreadPoolExecutor(
+                max_workers=prefetch, thread_name_prefix="dsp2client-prefetch"
+            )
+            if prefetch
+            else None
+        )
+        window: deque = deque()
+        next_page = 1
+
+        def schedule():
+            nonlocal next_page
+            if executor is None:
+                window.append(next_page)
+            else:
+                window.append(
+                    executor.submit(
+                        self.get_transactions, account_id, next_page, page_size
+                    )
+                )
+            next_page += 1
+
+        try:
+            for _ in range(prefetch + 1):
+                schedule()
+            while window:
+                pending = window.popleft()
+                if executor is None:
+                    transactions = self.get_transactions(account_id, pending, page_size)
+                else:
+                    transactions = pending.result()
+                if len(transactions) < page_size or (
+                    since is not None
+                    and any(_as_utc(t.date_operation) < since for t in transactions)
+                ):
+                    if executor is not None:
+                        for future in window:
+                            future.cancel()
+                    window.clear()
+                else:
+                    schedule()
+                for transaction in transactions:
+                    if since is None or _as_utc(transaction.date_operation) >= since:
+                        yield transaction
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def _executor(self):
+        """
+        Return a context manager yielding the executor used for per-account
+        requests, or None when requests should run sequentially.
+        An injected executor is shared and left running on exit.
+        """
+        if self.executor is not None:
+            return nullcontext(self.executor)
+        if self.max_workers and self.max_workers > 1:
+            return ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="dsp2client"
+            )
+        return nullcontext(None)
+
+    def get_full_user_data(
+        self,
+        transactions_per_account: int = 10,
+        validate: bool = True,
+        account_ids: Iterable[str] | None = None,
+        account_types: AccountType | Iterable[AccountType] | None = None,
+        account_usages: AccountUsage | Iterable[AccountUsage] | None = None,
+        include_identity: bool = True,
+        include_balances: bool = True,
+        include_transactions: bool = True,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        deadline: float | None = None,
+        partial: bool = False,
+    ) -> dict:
+        """
+        Aggregate identity, accounts, and each account's balances and first
+        page of transactions. Payloads are validated in bulk straight into
+        dicts; with validate=False they are returned as decoded JSON.
+
+        Only the selected accounts (by id, type and usage) and the included
+        sections are fetched; excluded sections are left out of the result.
+        With `since` or `until`, every transaction with since <= date_operation
+        < until is returned, walking pages of `transactions_per_account` until
+        one reaches before `since` (or the end of the history).
+
+        `deadline` bounds the whole aggregation, in seconds: every request's
+        timeout is capped to the time left, and DSP2DeadlineExceededError is
+        raised once it passes. With `partial`, failures and timeouts are
+        recorded instead of raised: a failed identity, balances or transactions
+        section is left out and described under "errors" (of the result, or of
+        its account), a failed account list leaves "accounts" empty, and
+        "complete" tells whether anything is missing.
+        """
+        selection = AccountSelection.build(account_ids, account_types, account_usages)
+        window = DateWindow(since, until)
+        with Deadline(deadline) if deadline is not None else nullcontext():
+            return self._aggregate(
+                selection,
+                window,
+                transactions_per_account,
+                validate,
+                include_identity,
+                include_balances,
+                include_transactions,
+                partial,
+            )
+
+    def _aggregate(
+        self,
+        selection: AccountSelection,
+        window: DateWindow,
+        transactions_per_account: int,
+        validate: bool,
+        include_identity: bool,
+        include_balances: bool,
+        include_transactions: bool,
+        partial: bool,
+    ) -> dict:
         self.ensure_authenticated()
-        identity = self.get_identity()
-        accounts = self.get_accounts()
-
-        full_data = {"identity": identity.model_dump(), "accounts": []}
-        for account in accounts:
-            account_data = account.model_dump()
-            balances = self.get_balances(account.id)
-            transactions = self.get_transactions(
-                account.id, count=transactions_per_account
+        errors = {} if partial else None
+
+        def get_identity():
+            identity = self.api.get(config.IDENTITY)
+            if validate:
+                identity = UserIdentitySchema.model_validate(identity).model_dump()
+            return identity
+
+        def get_accounts():
+            accounts = self.api.get(config.ACCOUNTS)
+            if validate:
+                accounts = validate_dicts(AccountSchema, accounts)
+            return accounts
+
+        full_data = {}
+        if include_identity:
+            identity = _collect(errors, "identity", get_identity)
+            if errors is None or "identity" not in errors:
+                full_data["identity"] = identity
+        accounts = selection.select(_collect(errors, "accounts", get_accounts) or [])
+
+        sections = [
+            name
+            for name, included in (
+                ("balances", include_balances),
+                ("transactions", include_transactions),
+            )
+            if included
+        ]
+        if sections:
+            options = (
+                transactions_per_account,
+                validate,
+                include_balances,
+                include_transactions,
+                window,
+                partial,
+            )
+            with self._executor() as executor:
+                if executor is None:
+                    results = [
+                        self._get_account_sections(account["id"], *options)
+                        for account in accounts
+                    ]
+                else:
+                    futures = [
+                        executor.submit(
+                            # Runs under the caller's deadline.
+                            contextvars.copy_context().run,
+                            self._get_account_sections,
+                            account["id"],
+                            *options,
+                        )
+                        for account in accounts
+                    ]
+                    results = _results_by_deadline(futures, sections, partial)
+        else:
+            results = [{} for _ in accounts]
+
+        full_data["accounts"] = [
+            {**account, **result} for account, result in zip(accounts, results)
+        ]
+        if partial:
+            full_data["errors"] = errors
+            full_data["complete"] = not errors and not any(
+                "errors" in account for account in full_data["accounts"]
             )
-            account_data["balances"] = [balance.model_dump() for balance in balances]
-            account_data["transactions"] = [txn.model_dump() for txn in transactions]
-            full_data["accounts"].append(account_data)
         return full_data
+
+
+def _collect(errors: dict | None, section: str, fetch: Callable[[], T]) -> T | None:
+    """
+    Run `fetch`. In partial mode (`errors` given), a failure is recorded under
+    the section name and None returned instead of raising.
+    """
+    if errors is None:
+        return fetch()
+    try:
+        return fetch()
+    except Exception as e:
+        logger.logger.warning("Partial result: %s failed: %s", section, e)
+        errors[section] = error_marker(e)
+        return None
+
+
+def _results_by_deadline(
+    futures: list[Future], sections: list[str], partial: bool
+) -> list[dict]:
+    """
+    Results of per-account futures, waiting no longer than the active deadline.
+    Accounts still pending then are cancelled, and marked in partial mode.
+    """
+    deadline = current_deadline()
+    wait(futures, timeout=deadline.remaining() if deadline is not None else None)
+    results = []
+    for future in futures:
+        if future.done():
+            results.append(future.result())
+            continue
+        future.cancel()
+        error = DSP2DeadlineExceededError(f"Deadline of {deadline.timeout:g}s exceeded")
+        if not partial:
+            raise error
+        results.append({"errors": {name: error_marker(error) for name in sections}})
+    return results
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
@@ -0,0 +1,304 @@
+"""
+AsyncDSP2Client: an asyncio counterpart of DSP2Client.
+Per-account requests in get_full_user_data are issued concurrently, bounded by
+a configurable concurrency cap. Unless partial results are requested, the first
+failure cancels the requests still in flight.
+"""
+
+import asyncio
+from contextlib import nullcontext
+from datetime import datetime
+from typing import Awaitable, Iterable, List, TypeVar
+
+import httpx
+
+from dsp2_client.models.account import AccountSchema, AccountType, AccountUsage
+from dsp2_client.models.balance import BalanceSchema
+from dsp2_client.models.bulk import dump_many, validate_many
+from dsp2_client.models.identity import UserIdentitySchema
+from dsp2_client.models.transaction import TransactionSchema
+
+from .. import config, logger
+from .account_directory import AsyncAccountDirectory
+from .async_authenticator import AsyncDSP2Authenticator
+from .async_base_client import AsyncBaseAPIClient
+from .deadline import Deadline
+from .errors import DSP2ClientError, error_marker
+from .http_config import HTTPConfig
+from .scheduler import RequestScheduler
+from .selection import AccountSelection, DateWindow
+from .token_cache import TokenCache, token_cache_key
+from .token_manager import AsyncTokenManager
+
+DEFAULT_MAX_CONCURRENCY = 10
+
+T = TypeVar("T")
+
+
+class AsyncDSP2Client:
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        base_url: str | None = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        token_cache: TokenCache | None = None,
+        http_config: HTTPConfig | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        scheduler: RequestScheduler | None = None,
+    ):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.base_url = base_url or config.API_BASE_URL
+        self.api = AsyncBaseAPIClient(
+            base_url=self.base_url,
+            http_config=http_config,
+            transport=transport,
+            scheduler=scheduler,
+            max_concurrency=max_concurrency,
+        )
+        self.authenticator = AsyncDSP2Authenticator(
+            username, password, self.api._client
+        )
+        self.token_manager = AsyncTokenManager(
+            self.authenticator,
+            cache=token_cache,
+            cache_key=token_cache_key(
+                self.base_url, username, self.authenticator.scope
+            ),
+        )
+        self.api.token_manager = self.token_manager
+        self.account_directory = AsyncAccountDirectory(
+            lambda after_miss: self.get_accounts()
+        )
+
+    async def __aenter__(self) -> "AsyncDSP2Client":
+        await self.ensure_authenticated()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        """
+        Release the client's connections. A shared transport stays open.
+        """
+        await self.api.aclose()
+
+    async def ensure_authenticated(self):
+        """
+        Ensure the client holds a token that is not about to expire.
+        Concurrent callers wait on a single authentication request.
+        """
+        if self.token_manager.needs_refresh():
+            token = await self.token_manager.get_token()
+            self.api.set_token(token)
+
+    async def _get(
+        self,
+        endpoint: str,
+        params: dict | None = None,
+        path_params: dict | None = None,
+    ):
+        await self.ensure_authenticated()
+        return await self.api.get(endpoint, params=params, path_params=path_params)
+
+    async def get_identity(self) -> UserIdentitySchema:
+        data = await self._get(config.IDENTITY)
+        return UserIdentitySchema(**data)
+
+    async def get_accounts(self) -> List[AccountSchema]:
+        data = await self._get(config.ACCOUNTS)
+        return validate_many(AccountSchema, data)
+
+    async def get_account(self, account_id: str) -> AccountSchema:
+        account = await self.account_directory.get(account_id)
+        if account is not None:
+            return account
+        data = await self._get(config.ACCOUNT, path_params={"account_id": account_id})
+        return AccountSchema(**data)
+
+    async def get_accounts_by_ids(
+        self, account_ids: Iterable[str]
+    ) -> List[AccountSchema]:
+        account_ids = list(account_ids)
+        accounts = await self.account_directory.get_many(account_ids)
+        unknown = [i for i, account in zip(account_ids, accounts) if account is None]
+        if unknown:
+            raise DSP2ClientError(f"Unknown accounts: {', '.join(unknown)}", 404)
+        return accounts
+
+    async def find_by_iban(self, iban: str) -> AccountSchema | None:
+        return await self.account_directory.find_by_iban(iban)
+
+    async def get_balances(self, account_id: str) -> List[BalanceSchema]:
+        data = await self._get(config.BALANCE, path_params={"account_id": account_id})
+        return validate_many(BalanceSchema, data)
+
+    async def get_transactions(
+        self, account_id: str, page: int = 1, count: int = 10
+    ) -> List[TransactionSchema]:
+        params = {"page": page, "count": count}
+        data = await self._get(
+            config.TRANSACTIONS, params=params, path_params={"account_id": account_id}
+        )
+        return validate_many(TransactionSchema, data)
+
+    async def _get_window_transactions(
+        self, account_id: str, page_size: int, window: DateWindow
+    ) -> List[TransactionSchema]:
+        selected = []
+        page = 1
+        while True:
+            items = await self.get_transactions(account_id, page, page_size)
+            selected.extend(
+                item for item in items if window.contains(item.date_operation)
+            )
+            if len(items) < page_size or any(
+                window.is_before(item.date_operation) for item in items
+            ):
+                return selected
+            page += 1
+
+    async def _get_account_data(
+        self,
+        account: dict,
+        transactions_per_account: int,
+        include_balances: bool = True,
+        include_transactions: bool = True,
+        window: DateWindow | None = None,
+        partial: bool = False,
+    ) -> dict:
+        sections = {}
+        if include_balances:
+            sections["balances"] = self.get_balances(account["id"])
+        if include_transactions:
+            if window:
+                sections["transactions"] = self._get_window_transactions(
+                    account["id"], transactions_per_account, window
+                )
+            else:
+                sections["transactions"] = self.get_transactions(
+                    account["id"], count=transactions_per_account
+                )
+        results = await _gather(*sections.values(), partial=partial)
+        account_data = dict(account)
+        errors = {}
+        for name, items in zip(sections, results):
+            if isinstance(items, Exception):
+                errors[name] = error_marker(items)
+            elif isinstance(items, BaseException):
+                raise items
+            else:
+                account_data[name] = [item.model_dump() for item in items]
+        if errors:
+            account_data["errors"] = errors
+        return account_data
+
+    async def _get_accounts_data(
+        self,
+        transactions_per_account: int,
+        selection: AccountSelection | None = None,
+        include_balances: bool = True,
+        include_transactions: bool = True,
+        window: DateWindow | None = None,
+        errors: dict | None = None,
+    ) -> list:
+        accounts = await _collect(errors, "accounts", self.get_accounts())
+        accounts = dump_many(AccountSchema, accounts or [])
+        if selection is not None:
+            accounts = selection.select(accounts)
+        return list(
+            await _gather(
+                *(
+                    self._get_account_data(
+                        account,
+                        transactions_per_account,
+                        include_balances,
+                        include_transactions,
+                        window,
+                        errors is not None,
+                    )
+                    for account in accounts
+                )
+            )
+        )
+
+    async def get_full_user_data(
+        self,
+        transactions_per_account: int = 10,
+        account_ids: Iterable[str] | None = None,
+        account_types: AccountType | Iterable[AccountType] | None = None,
+        account_usages: AccountUsage | Iterable[AccountUsage] | None = None,
+        include_identity: bool = True,
+        include_balances: bool = True,
+        include_transactions: bool = True,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        deadline: float | None = None,
+        partial: bool = False,
+    ) -> dict:
+        """
+        Same selection, deadline and partial-result options as
+        DSP2Client.get_full_user_data: requests for unselected accounts and
+        excluded sections are never sent, and with `partial` a failed section
+        is left out of the result.
+        """
+        selection = AccountSelection.build(account_ids, account_types, account_usages)
+        window = DateWindow(since, until)
+        errors = {} if partial else None
+        with Deadline(deadline) if deadline is not None else nullcontext():
+            await self.ensure_authenticated()
+            accounts = self._get_accounts_data(
+                transactions_per_account,
+                selection,
+                include_balances,
+                include_transactions,
+                window,
+                errors,
+            )
+            if include_identity:
+                identity, accounts = await _gather(
+                    _collect(errors, "identity", self.get_identity()), accounts
+                )
+                full_data = {"accounts": accounts}
+                if identity is not None:
+                    full_data = {"identity": identity.model_dump(), **full_data}
+            else:
+                full_data = {"accounts": await accounts}
+        if partial:
+            full_data["errors"] = errors
+            full_data["complete"] = not errors and not any(
+                "errors" in account for account in full_data["accounts"]
+            )
+        return full_data
+
+
+async def _gather(*fetches: Awaitable, partial: bool = False) -> list:
+    """
+    Await `fetches` concurrently. In partial mode failures are returned in
+    place of their results; otherwise the first failure cancels the other
+    fetches before it is raised.
+    """
+    if partial:
+        return await asyncio.gather(*fetches, return_exceptions=True)
+    tasks = [asyncio.ensure_future(fetch) for fetch in fetches]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+async def _collect(errors: dict | None, section: str, fetch: Awaitable[T]) -> T | None:
+    """Await `fetch`, recording a failure in partial mode (`errors` given)."""
+    if errors is None:
+        return await fetch
+    try:
+        return await fetch
+    except Exception as e:
+        logger.logger.warning("Partial result: %s failed: %s", section, e)
+        errors[section] = error_marker(e)
+        return None
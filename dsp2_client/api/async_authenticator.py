@@ -0,0 +1,73 @@
+import httpx
+
+from .. import config, logger
+from .authenticator import DSP2Authenticator
+from .deadline import request_options
+from .errors import DSP2AuthenticationError
+
+
+class AsyncDSP2Authenticator(DSP2Authenticator):
+    """
+    Handles DSP2 authentication over an asyncio HTTP client.
+    """
+
+    def __init__(self, username: str, password: str, client: httpx.AsyncClient):
+        super().__init__(username, password, client)
+
+    async def authenticate(self) -> str:
+        """
+        Authenticate with DSP2 API and store the token.
+        """
+        payload = {
+            "grant_type": "password",
+            "username": self.username,
+            "password": self.password,
+            "scope": self.scope,
+        }
+        return await self._request_token(payload)
+
+    async def refresh(self) -> str:
+        """
+        Renew the token with the refresh_token grant, falling back to the
+        password grant when no refresh token is held or it is rejected.
+        """
+        if not self.refresh_token:
+            return await self.authenticate()
+        payload = {
+            "grant_type": "refresh_token",
+            "refresh_token": self.refresh_token,
+            "scope": self.scope,
+        }
+        try:
+            return await self._request_token(payload)
+        except DSP2AuthenticationError:
+            logger.logger.warning("Token refresh failed, using password grant")
+            self.refresh_token = None
+            return await self.authenticate()
+
+    async def _request_token(self, payload: dict) -> str:
+        token_url = config.TOKEN_ENDPOINT
+        headers = {"Content-Type": "application/x-www-form-urlencoded"}
+        options = request_options(self.client)
+
+        try:
+            response = await self.client.post(
+                token_url, data=payload, headers=headers, **options
+            )
+            response.raise_for_status()
+
+            token_data = response.json()
+            self.token = token_data.get("access_token")
+
+            if not self.token:
+                raise DSP2AuthenticationError("Failed to obtain access token")
+
+            self._store_token_data(token_data)
+            logger.logger.info("Authentication successful")
+            return self.token
+        except httpx.HTTPStatusError as e:
+            logger.logger.error("HTTP error during authentication: %s", e.response.text)
+            raise DSP2AuthenticationError("Authentication failed") from e
+        except Exception as e:
+            logger.logger.error("Unexpected error during authentication: %s", e)
+            raise DSP2AuthenticationError("Authentication failed") from e
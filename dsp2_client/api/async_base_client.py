@@ -0,0 +1,134 @@
+import asyncio
+from contextlib import nullcontext
+from time import perf_counter
+
+import httpx
+
+from .. import instrumentation, logger
+from .base_client import _params_key
+from .deadline import current_deadline, request_options
+from .errors import DSP2Error, DSP2HTTPError, error_for_response
+from .http_config import HTTPConfig
+from .scheduler import RequestScheduler, circuit_breaker_for
+from .single_flight import AsyncSingleFlight
+from .token_manager import AsyncTokenManager
+
+
+class AsyncBaseAPIClient:
+    """
+    An asyncio HTTP client for GET requests with error handling.
+    When a token manager is given, every request carries a valid token and a
+    401 response triggers one re-authentication and replay. Requests run
+    through a scheduler that retries transient failures. Identical GETs made
+    concurrently with the same token and deadline share one request, and
+    only that request counts against `max_concurrency`.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        token: str | None = None,
+        token_manager: AsyncTokenManager | None = None,
+        http_config: HTTPConfig | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        scheduler: RequestScheduler | None = None,
+        single_flight: AsyncSingleFlight | None = None,
+        max_concurrency: int | None = None,
+    ):
+        http_config = http_config or HTTPConfig()
+        self._client = httpx.AsyncClient(
+            base_url=str(base_url),
+            transport=transport,
+            **http_config.client_options(),
+        )
+        self.token_manager = token_manager
+        self.scheduler = scheduler or RequestScheduler(
+            circuit_breaker=circuit_breaker_for(base_url)
+        )
+        self.single_flight = single_flight or AsyncSingleFlight()
+        self._semaphore = (
+            asyncio.Semaphore(max_concurrency) if max_concurrency else nullcontext()
+        )
+        self._token: str | None = None
+        if token:
+            self.set_token(token)
+
+    async def __aenter__(self) -> "AsyncBaseAPIClient":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        """Close the underlying connection pool."""
+        await self._client.aclose()
+
+    def set_token(self, token: str):
+        """Update the Authorization header with a new token."""
+        self._token = token
+        self._client.headers.update({"Authorization": f"Bearer {token}"})
+
+    async def _authorize(self) -> str | None:
+        if self.token_manager is not None:
+            token = await self.token_manager.get_token()
+            if token != self._token:
+                self.set_token(token)
+        return self._token
+
+    async def get(
+        self,
+        endpoint: str,
+        params: dict | None = None,
+        path_params: dict | None = None,
+    ) -> dict:
+        url = endpoint.format(**path_params) if path_params else endpoint
+        key = (self._token, url, _params_key(params), current_deadline())
+        return await self.single_flight.do(
+            key, lambda: self._fetch(endpoint, url, params)
+        )
+
+    async def _fetch(self, endpoint: str, url: str, params: dict | None) -> dict:
+        hooks = instrumentation.get_instrumentation()
+
+        async def send() -> httpx.Response:
+            token = await self._authorize()
+            options = {"params": params, **request_options(self._client)}
+            response = await self._client.get(url, **options)
+            if response.status_code == 401 and self.token_manager is not None:
+                self.set_token(await self.token_manager.invalidate(token))
+                response = await self._client.get(url, **options)
+            return response
+
+        async def attempt():
+            start = perf_counter()
+            try:
+                response = await send()
+            except httpx.TransportError:
+                hooks.on_request(endpoint, None, perf_counter() - start, 0)
+                raise
+            hooks.on_request(
+                endpoint,
+                response.status_code,
+                perf_counter() - start,
+                len(response.content),
+            )
+            try:
+                response.raise_for_status()
+            except httpx.HTTPStatusError as e:
+                raise error_for_response(e.response, f"Failed GET {url}") from e
+            return response
+
+        try:
+            logger.logger.debug("GET %s with params=%s", url, params)
+            async with self._semaphore:
+                response = await self.scheduler.arun(attempt, f"GET {url}", endpoint)
+            return response.json()
+        except DSP2HTTPError as e:
+            logger.logger.error("HTTP error on GET %s: %s", url, e.response_text)
+            raise
+        except DSP2Error as e:
+            logger.logger.error("Error on GET %s: %s", url, e)
+            raise
+        except Exception as e:
+            logger.logger.error("Unexpected error on GET %s: %s", url, e)
+            raise DSP2Error(f"Failed GET {url}") from e
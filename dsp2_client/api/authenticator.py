@@ -1,6 +1,10 @@
+import time
+
 import httpx
 
 from .. import config, logger
+from .deadline import request_options
+from .errors import DSP2AuthenticationError
 
 
 class DSP2Authenticator:
@@ -8,6 +12,8 @@ class DSP2Authenticator:
     Handles DSP2 authentication, token retrieval, and storage.
     """
 
+    scope = "stet"
+
     def __init__(self, username: str, password: str, client: httpx.Client):
         if not username or not password:
             raise ValueError("Username and password must be provided")
@@ -15,35 +21,75 @@ class DSP2Authenticator:
         self.password = password
         self.client = client
         self.token: str | None = None
+        self.refresh_token: str | None = None
+        self.expires_in: float | None = None
+        self.expires_at: float | None = None
 
     def authenticate(self) -> str:
         """
         Authenticate with DSP2 API and store the token.
         """
-        token_url = config.TOKEN_ENDPOINT
         payload = {
             "grant_type": "password",
             "username": self.username,
             "password": self.password,
-            "scope": "stet",
+            "scope": self.scope,
+        }
+        return self._request_token(payload)
+
+    def refresh(self) -> str:
+        """
+        Renew the token with the refresh_token grant, falling back to the
+        password grant when no refresh token is held or it is rejected.
+        """
+        if not self.refresh_token:
+            return self.authenticate()
+        payload = {
+            "grant_type": "refresh_token",
+            "refresh_token": self.refresh_token,
+            "scope": self.scope,
         }
+        try:
+            return self._request_token(payload)
+        except DSP2AuthenticationError:
+            logger.logger.warning("Token refresh failed, using password grant")
+            self.refresh_token = None
+            return self.authenticate()
+
+    def _request_token(self, payload: dict) -> str:
+        token_url = config.TOKEN_ENDPOINT
         headers = {"Content-Type": "application/x-www-form-urlencoded"}
+        options = request_options(self.client)
 
         try:
-            response = self.client.post(token_url, data=payload, headers=headers)
+            response = self.client.post(
+                token_url, data=payload, headers=headers, **options
+            )
             response.raise_for_status()
 
             token_data = response.json()
             self.token = token_data.get("access_token")
 
             if not self.token:
-                raise RuntimeError("Failed to obtain access token")
+                raise DSP2AuthenticationError("Failed to obtain access token")
 
+            self._store_token_data(token_data)
             logger.logger.info("Authentication successful")
             return self.token
         except httpx.HTTPStatusError as e:
-            logger.logger.error(f"HTTP error during authentication: {e.response.text}")
-            raise RuntimeError("Authentication failed") from e
+            logger.logger.error("HTTP error during authentication: %s", e.response.text)
+            raise DSP2AuthenticationError("Authentication failed") from e
         except Exception as e:
-            logger.logger.error(f"Unexpected error during authentication: {e}")
-            raise RuntimeError("Authentication failed") from e
+            logger.logger.error("Unexpected error during authentication: %s", e)
+            raise DSP2AuthenticationError("Authentication failed") from e
+
+    def _store_token_data(self, token_data: dict):
+        """Record refresh token and expiry from a token endpoint response."""
+        self.refresh_token = token_data.get("refresh_token") or self.refresh_token
+        expires_in = token_data.get("expires_in")
+        if isinstance(expires_in, (int, float)) and expires_in > 0:
+            self.expires_in = float(expires_in)
+            self.expires_at = time.time() + expires_in
+        else:
+            self.expires_in = None
+            self.expires_at = None
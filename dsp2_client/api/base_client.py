@@ -1,31 +1,296 @@
+from time import perf_counter
+from typing import Callable, Hashable, Iterator
+
 import httpx
 
-from .. import logger
+from .. import instrumentation, logger
+from .deadline import current_deadline, request_options
+from .errors import (
+    DSP2Error,
+    DSP2HTTPError,
+    DSP2TransportError,
+    error_for_response,
+)
+from .http_config import HTTPConfig
+from .json_stream import iter_array_items
+from .response_cache import ResponseCache
+from .scheduler import RequestScheduler, circuit_breaker_for
+from .single_flight import SingleFlight
+from .token_manager import TokenManager
 
 
 class BaseAPIClient:
     """
     A base HTTP client for GET and POST requests with error handling.
+    When a token manager is given, every request carries a valid token and a
+    401 response triggers one re-authentication and replay. GET responses are
+    served from an optional response cache, partitioned by cache_namespace.
+    Requests run through a scheduler that retries transient failures; by
+    default it shares the circuit breaker of the base URL. Identical GETs made
+    concurrently with the same token and deadline share one request.
     """
 
-    def __init__(self, base_url: str, token: str | None = None):
-        self._client = httpx.Client(base_url=str(base_url))
+    def __init__(
+        self,
+        base_url: str,
+        token: str | None = None,
+        token_manager: TokenManager | None = None,
+        http_config: HTTPConfig | None = None,
+        transport: httpx.BaseTransport | None = None,
+        cache: ResponseCache | None = None,
+        cache_namespace: Hashable = None,
+        scheduler: RequestScheduler | None = None,
+        single_flight: SingleFlight | None = None,
+    ):
+        http_config = http_config or HTTPConfig()
+        self._client = httpx.Client(
+            base_url=str(base_url),
+            transport=transport,
+            **http_config.client_options(),
+        )
+        self.token_manager = token_manager
+        self.cache = cache
+        self.cache_namespace = cache_namespace
+        self.scheduler = scheduler or RequestScheduler(
+            circuit_breaker=circuit_breaker_for(base_url)
+        )
+        self.single_flight = single_flight or SingleFlight()
+        self._token: str | None = None
         if token:
-            self._client.headers.update({"Authorization": f"Bearer {token}"})
+            self.set_token(token)
+
+    def __enter__(self) -> "BaseAPIClient":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Close the underlying connection pool."""
+        self._client.close()
 
     def set_token(self, token: str):
         """Update the Authorization header with a new token."""
+        self._token = token
         self._client.headers.update({"Authorization": f"Bearer {token}"})
 
-    def get(self, endpoint: str, params: dict | None = None) -> dict:
+    def _authorize(self) -> str | None:
+        if self.token_manager is not None:
+            token = self.token_manager.get_token()
+            if token != self._token:
+                self.set_token(token)
+        return self._token
+
+    def _send(self, url: str, params: dict | None, headers: dict | None):
+        token = self._authorize()
+        options = {"params": params, **request_options(self._client)}
+        if headers:
+            options["headers"] = headers
+        response = self._client.get(url, **options)
+        if response.status_code == 401 and self.token_manager is not None:
+            self.set_token(self.token_manager.invalidate(token))
+            response = self._client.get(url, **options)
+        return response
+
+    def get(
+        self,
+        endpoint: str,
+        params: dict | None = None,
+        path_params: dict | None = None,
+    ) -> dict:
+        """
+        GET an endpoint and decode its JSON body. The endpoint may be a
+        template such as "/stet/account/{account_id}" filled from path_params;
+        the template selects the cache lifetime of the response.
+        """
+        return self._get(endpoint, params, path_params, raw=False)
+
+    def get_bytes(
+        self,
+        endpoint: str,
+        params: dict | None = None,
+        path_params: dict | None = None,
+    ) -> bytes:
+        """
+        GET an endpoint and return its raw body, for callers that validate
+        JSON straight from bytes.
+        """
+        return self._get(endpoint, params, path_params, raw=True)
+
+    def iter_array(
+        self,
+        endpoint: str,
+        params: dict | None = None,
+        path_params: dict | None = None,
+    ) -> Iterator[bytes]:
+        """
+        GET an endpoint returning a JSON array and yield the raw JSON of each
+        element as soon as it is received. Only the element being received is
+        buffered. The response cache is bypassed, and a failed request is
+        retried only until the body starts streaming.
+        """
+        url = endpoint.format(**path_params) if path_params else endpoint
+        logger.logger.debug("GET %s with params=%s (streamed)", url, params)
+        start = perf_counter()
+        try:
+            response = self.scheduler.run(
+                lambda: self._open_stream(endpoint, url, params),
+                f"GET {url}",
+                endpoint,
+            )
+        except DSP2HTTPError as e:
+            logger.logger.error("HTTP error on GET %s: %s", url, e.response_text)
+            raise
+        except DSP2Error as e:
+            logger.logger.error("Error on GET %s: %s", url, e)
+            raise
+
         try:
-            logger.logger.debug(f"GET {endpoint} with params={params}")
-            response = self._client.get(endpoint, params=params)
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            logger.logger.error(f"HTTP error on GET {endpoint}: {e.response.text}")
-            raise RuntimeError(f"Failed GET {endpoint}") from e
+            yield from iter_array_items(response.iter_bytes())
+        except httpx.TransportError as e:
+            logger.logger.error("Stream interrupted on GET %s: %s", url, e)
+            raise DSP2TransportError(f"Failed GET {url}") from e
+        except ValueError as e:
+            logger.logger.error("Invalid JSON array on GET %s: %s", url, e)
+            raise DSP2Error(f"Failed GET {url}") from e
+        finally:
+            response.close()
+            instrumentation.get_instrumentation().on_request(
+                endpoint,
+                response.status_code,
+                perf_counter() - start,
+                response.num_bytes_downloaded,
+            )
+
+    def _open_stream(
+        self, endpoint: str, url: str, params: dict | None
+    ) -> httpx.Response:
+        def send():
+            request = self._client.build_request(
+                "GET", url, params=params, **request_options(self._client)
+            )
+            return self._client.send(request, stream=True)
+
+        start = perf_counter()
+        token = self._authorize()
+        response = send()
+        if response.status_code == 401 and self.token_manager is not None:
+            response.close()
+            self.set_token(self.token_manager.invalidate(token))
+            response = send()
+        if response.is_error:
+            # Failed attempts are measured here, successful ones once streamed.
+            response.read()
+            response.close()
+            instrumentation.get_instrumentation().on_request(
+                endpoint,
+                response.status_code,
+                perf_counter() - start,
+                response.num_bytes_downloaded,
+            )
+            raise error_for_response(response, f"Failed GET {url}")
+        return response
+
+    def _measured(
+        self, endpoint: str, send: Callable[[], httpx.Response]
+    ) -> httpx.Response:
+        """Run one HTTP attempt and report it to the instrumentation."""
+        hooks = instrumentation.get_instrumentation()
+        start = perf_counter()
+        try:
+            response = send()
+        except httpx.TransportError:
+            hooks.on_request(endpoint, None, perf_counter() - start, 0)
+            raise
+        hooks.on_request(
+            endpoint,
+            response.status_code,
+            perf_counter() - start,
+            len(response.content),
+        )
+        return response
+
+    def _get(
+        self,
+        endpoint: str,
+        params: dict | None,
+        path_params: dict | None,
+        raw: bool,
+    ):
+        url = endpoint.format(**path_params) if path_params else endpoint
+        # Callers only share a request made under their own deadline, so
+        # none fails with another caller's DSP2DeadlineExceededError.
+        key = (self._token, url, _params_key(params), raw, current_deadline())
+        return self.single_flight.do(
+            key, lambda: self._fetch(endpoint, url, params, path_params, raw)
+        )
+
+    def _fetch(
+        self,
+        endpoint: str,
+        url: str,
+        params: dict | None,
+        path_params: dict | None,
+        raw: bool,
+    ):
+        hooks = instrumentation.get_instrumentation()
+        try:
+            logger.logger.debug("GET %s with params=%s", url, params)
+            cache_key = entry = None
+            if self.cache is not None:
+                cache_key = self.cache.key(
+                    self.cache_namespace, url, params, "raw" if raw else "json"
+                )
+                entry = self.cache.lookup(cache_key)
+                if entry is not None and entry.is_fresh():
+                    self.cache.record_hit()
+                    hooks.on_cache(endpoint, "hit")
+                    return entry.data
+
+            headers = entry.conditional_headers() if entry else None
+
+            def attempt():
+                response = self._measured(
+                    endpoint, lambda: self._send(url, params, headers)
+                )
+                if response.status_code == 304 and entry is not None:
+                    return response
+                try:
+                    response.raise_for_status()
+                except httpx.HTTPStatusError as e:
+                    raise error_for_response(e.response, f"Failed GET {url}") from e
+                return response
+
+            response = self.scheduler.run(attempt, f"GET {url}", endpoint)
+            if response.status_code == 304 and entry is not None:
+                self.cache.record_revalidation()
+                hooks.on_cache(endpoint, "revalidated")
+                self.cache.refresh(cache_key, self.cache.ttl_for(endpoint))
+                return entry.data
+            data = response.content if raw else response.json()
+
+            if self.cache is not None:
+                self.cache.record_miss()
+                hooks.on_cache(endpoint, "miss")
+                self.cache.store(
+                    cache_key,
+                    data,
+                    self.cache.ttl_for(endpoint),
+                    etag=response.headers.get("ETag"),
+                    last_modified=response.headers.get("Last-Modified"),
+                    account_id=(path_params or {}).get("account_id"),
+                )
+            return data
+        except DSP2HTTPError as e:
+            logger.logger.error("HTTP error on GET %s: %s", url, e.response_text)
+            raise
+        except DSP2Error as e:
+            logger.logger.error("Error on GET %s: %s", url, e)
+            raise
         except Exception as e:
-            logger.logger.error(f"Unexpected error on GET {endpoint}: {e}")
-            raise RuntimeError(f"Failed GET {endpoint}") from e
+            logger.logger.error("Unexpected error on GET %s: %s", url, e)
+            raise DSP2Error(f"Failed GET {url}") from e
+
+
+def _params_key(params: dict | None) -> tuple:
+    return tuple(sorted((params or {}).items()))
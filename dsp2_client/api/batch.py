@@ -0,0 +1,164 @@
+"""
+Batch aggregation of get_full_user_data over many users.
+Each user runs on a worker thread; a failure for one user is recorded on its
+result and never aborts the rest of the batch.
+"""
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Iterable, Iterator
+
+from .. import logger
+from ..models.offload import ProcessValidator
+from .api_client import DSP2Client
+from .http_config import HTTPConfig, SharedTransport
+from .scheduler import RequestScheduler
+from .token_cache import TokenCache
+
+DEFAULT_BATCH_WORKERS = 8
+
+
+@dataclass
+class UserDataResult:
+    """
+    Outcome of one user's aggregation: either data or the raised error.
+    """
+
+    index: int
+    username: str
+    data: dict | None = None
+    error: Exception | None = None
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _fetch_user(
+    index: int,
+    username: str,
+    password: str,
+    base_url: str | None,
+    transactions_per_account: int,
+    per_user_workers: int | None,
+    token_cache: TokenCache | None,
+    http_config: HTTPConfig | None,
+    scheduler: RequestScheduler | None,
+    validator: ProcessValidator | None,
+    transport: SharedTransport,
+) -> UserDataResult:
+    start = perf_counter()
+    try:
+        with DSP2Client(
+            username,
+            password,
+            base_url=base_url,
+            max_workers=per_user_workers,
+            token_cache=token_cache,
+            http_config=http_config,
+            scheduler=scheduler,
+            validator=validator,
+            transport=transport,
+        ) as client:
+            data = client.get_full_user_data(transactions_per_account)
+        return UserDataResult(index, username, data, elapsed=perf_counter() - start)
+    except Exception as e:
+        logger.logger.error("Aggregation failed for user %s: %s", username, e)
+        return UserDataResult(index, username, error=e, elapsed=perf_counter() - start)
+
+
+def iter_full_user_data(
+    credentials: Iterable[tuple[str, str]],
+    max_workers: int = DEFAULT_BATCH_WORKERS,
+    base_url: str | None = None,
+    transactions_per_account: int = 10,
+    per_user_workers: int | None = None,
+    token_cache: TokenCache | None = None,
+    http_config: HTTPConfig | None = None,
+    scheduler: RequestScheduler | None = None,
+    validator: ProcessValidator | None = None,
+) -> Iterator[UserDataResult]:
+    """
+    Aggregate many users with at most max_workers users in flight, yielding
+    results in completion order. Credentials are consumed lazily, so only
+    max_workers results are held in memory at any time. All users share one
+    connection pool, and the scheduler and validator when given.
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+
+    transport = SharedTransport(http_config)
+    pending: set[Future] = set()
+    credentials = enumerate(credentials)
+
+    def submit_next(executor: ThreadPoolExecutor) -> bool:
+        for index, (username, password) in credentials:
+            pending.add(
+                executor.submit(
+                    _fetch_user,
+                    index,
+                    username,
+                    password,
+                    base_url,
+                    transactions_per_account,
+                    per_user_workers,
+                    token_cache,
+                    http_config,
+                    scheduler,
+                    validator,
+                    transport,
+                )
+            )
+            return True
+        return False
+
+    try:
+        with ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="dsp2client-batch"
+        ) as executor:
+            try:
+                while len(pending) < max_workers and submit_next(executor):
+                    pass
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        pending.discard(future)
+                        submit_next(executor)
+                        yield future.result()
+            finally:
+                for future in pending:
+                    future.cancel()
+    finally:
+        transport.shutdown()
+
+
+def get_full_user_data_batch(
+    credentials: Iterable[tuple[str, str]],
+    max_workers: int = DEFAULT_BATCH_WORKERS,
+    base_url: str | None = None,
+    transactions_per_account: int = 10,
+    per_user_workers: int | None = None,
+    token_cache: TokenCache | None = None,
+    http_config: HTTPConfig | None = None,
+    scheduler: RequestScheduler | None = None,
+    validator: ProcessValidator | None = None,
+) -> list[UserDataResult]:
+    """
+    Aggregate many users concurrently and return results in input order.
+    """
+    results = list(
+        iter_full_user_data(
+            credentials,
+            max_workers=max_workers,
+            base_url=base_url,
+            transactions_per_account=transactions_per_account,
+            per_user_workers=per_user_workers,
+            token_cache=token_cache,
+            http_config=http_config,
+            scheduler=scheduler,
+            validator=validator,
+        )
+    )
+    return sorted(results, key=lambda result: result.index)
@@ -0,0 +1,311 @@
+"""
+A pool of per-user DSP2Client sessions for multi-tenant services.
+
+Sessions are keyed by username and kept authenticated between requests. All
+clients share one connection pool and one token cache, so a session evicted
+and later recreated reuses both warm connections and its unexpired token.
+Cached tokens are bound to the password they were issued for: a wrong password
+never reuses another session's token.
+Sessions are evicted least recently used first once the pool holds max_size
+of them, and after idle_ttl seconds without use; a session in use is only
+closed when its last lease is released.
+"""
+
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Iterator
+
+from .. import logger
+from .api_client import DSP2Client
+from .http_config import HTTPConfig, SharedTransport
+from .response_cache import ResponseCache
+from .scheduler import RequestScheduler
+from .token_cache import CachedToken, InMemoryTokenCache, TokenCache, TokenCacheKey
+
+DEFAULT_POOL_SIZE = 1000
+DEFAULT_IDLE_TTL = 900.0
+
+
+@dataclass
+class _Session:
+    client: DSP2Client
+    digest: bytes
+    last_used: float
+    leases: int = 0
+    evicted: bool = False
+
+
+class _CredentialTokenCache(TokenCache):
+    """The pool's token cache, with keys extended by a password digest."""
+
+    def __init__(self, cache: TokenCache, digest: bytes):
+        self.cache = cache
+        self.credential = digest.hex()
+
+    def get(self, key: TokenCacheKey) -> CachedToken | None:
+        return self.cache.get((*key, self.credential))
+
+    def set(self, key: TokenCacheKey, token: CachedToken):
+        self.cache.set((*key, self.credential), token)
+
+    def delete(self, key: TokenCacheKey):
+        self.cache.delete((*key, self.credential))
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    size: int
+    max_size: int
+    in_use: int
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+
+    @property
+    def occupancy(self) -> float:
+        return self.size / self.max_size
+
+    @property
+    def hit_rate(self) -> float | None:
+        total = self.hits + self.misses
+        return self.hits / total if total else None
+
+
+class DSP2ClientPool:
+    """
+    Hands out one DSP2Client per user:
+
+        with pool.session(username, password) as client:
+            client.get_accounts()
+
+    A different password for a pooled username replaces its session.
+    """
+
+    def __init__(
+        self,
+        base_url: str | None = None,
+        max_size: int = DEFAULT_POOL_SIZE,
+        idle_ttl: float | None = DEFAULT_IDLE_TTL,
+        http_config: HTTPConfig | None = None,
+        transport: SharedTransport | None = None,
+        token_cache: TokenCache | None = None,
+        cache: ResponseCache | None = None,
+        scheduler: RequestScheduler | None = None,
+        max_workers: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        A `transport` passed in is left open on close(); otherwise the pool
+        owns its connection pool. The default token cache holds tokens of up to
+        twice max_size users, so they outlive the sessions evicted first.
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        if idle_ttl is not None and idle_ttl <= 0:
+            raise ValueError("idle_ttl must be positive")
+        self.base_url = base_url
+        self.max_size = max_size
+        self.idle_ttl = idle_ttl
+        self.http_config = http_config
+        self._owns_transport = transport is None
+        self.transport = transport or SharedTransport(http_config)
+        self.token_cache = token_cache or InMemoryTokenCache(maxsize=2 * max_size)
+        self.cache = cache
+        self.scheduler = scheduler
+        self.max_workers = max_workers
+        self.clock = clock
+        self._sessions: OrderedDict[str, _Session] = OrderedDict()
+        self._secret = secrets.token_bytes(32)
+        self._lock = threading.Lock()
+        self._closed = False
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, username: str) -> bool:
+        return username in self._sessions
+
+    def __enter__(self) -> "DSP2ClientPool":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @contextmanager
+    def session(self, username: str, password: str) -> Iterator[DSP2Client]:
+        """
+        Lease the user's client, creating and authenticating it on a miss.
+        The client must not be used after the block.
+        """
+        session = self._checkout(username, password)
+        try:
+            yield session.client
+        finally:
+            self._checkin(session)
+
+    def evict(self, username: str) -> bool:
+        """Close a user's session, e.g. on logout."""
+        with self._lock:
+            found = username in self._sessions
+            closing = self._discard(username)
+        self._close([closing] if closing else [])
+        return found
+
+    def evict_idle(self) -> int:
+        """Close sessions idle for idle_ttl seconds; returns how many."""
+        with self._lock:
+            closing = self._expire()
+        self._close(closing)
+        return len(closing)
+
+    def stats(self) -> PoolStats:
+        with self._lock:
+            return PoolStats(
+                size=len(self._sessions),
+                max_size=self.max_size,
+                in_use=sum(1 for s in self._sessions.values() if s.leases),
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                expirations=self._expirations,
+            )
+
+    def close(self):
+        """Close every session and, when the pool owns it, the transport."""
+        with self._lock:
+            self._closed = True
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        self._close(sessions)
+        if self._owns_transport:
+            self.transport.shutdown()
+
+    def _digest(self, password: str) -> bytes:
+        return hmac.new(self._secret, password.encode(), hashlib.sha256).digest()
+
+    def _checkout(self, username: str, password: str) -> _Session:
+        digest = self._digest(password)
+        closing = []
+        try:
+            with self._lock:
+                if self._closed:
+                    raise RuntimeError("DSP2ClientPool is closed")
+                closing.extend(self._expire())
+                session = self._lease(username, digest)
+                if session is not None:
+                    self._hits += 1
+                    return session
+                self._misses += 1
+        finally:
+            self._close(closing)
+
+        # Authenticating takes a round trip: do it outside the lock.
+        client = self._create(username, password, digest)
+        closing = []
+        with self._lock:
+            session = None if self._closed else self._lease(username, digest)
+            if session is None and not self._closed:
+                stale = self._discard(username)
+                if stale is not None:
+                    closing.append(stale)
+                session = _Session(client, digest, self.clock(), leases=1)
+                self._sessions[username] = session
+                closing.extend(self._shrink())
+            else:
+                # The pool was closed, or another thread created the same
+                # session meanwhile.
+                closing.append(_Session(client, digest, 0.0, evicted=True))
+        self._close(closing)
+        if session is None:
+            raise RuntimeError("DSP2ClientPool is closed")
+        return session
+
+    def _checkin(self, session: _Session):
+        with self._lock:
+            session.leases -= 1
+            session.last_used = self.clock()
+            username = session.client.authenticator.username
+            if not session.evicted:
+                self._sessions.move_to_end(username)
+            closing = session.evicted and not session.leases
+        if closing:
+            self._close([session])
+
+    def _create(self, username: str, password: str, digest: bytes) -> DSP2Client:
+        return DSP2Client(
+            username,
+            password,
+            base_url=self.base_url,
+            max_workers=self.max_workers,
+            token_cache=_CredentialTokenCache(self.token_cache, digest),
+            http_config=self.http_config,
+            transport=self.transport,
+            cache=self.cache,
+            scheduler=self.scheduler,
+        )
+
+    def _lease(self, username: str, digest: bytes) -> _Session | None:
+        session = self._sessions.get(username)
+        if session is None or not hmac.compare_digest(session.digest, digest):
+            return None
+        session.leases += 1
+        session.last_used = self.clock()
+        self._sessions.move_to_end(username)
+        return session
+
+    def _discard(self, username: str, expired: bool = False) -> _Session | None:
+        """Remove a session; returns it when it can be closed right away."""
+        session = self._sessions.pop(username, None)
+        if session is None:
+            return None
+        session.evicted = True
+        if expired:
+            self._expirations += 1
+        else:
+            self._evictions += 1
+        return None if session.leases else session
+
+    def _shrink(self) -> list[_Session]:
+        closing = []
+        while len(self._sessions) > self.max_size:
+            username = next(iter(self._sessions))
+            session = self._discard(username)
+            if session is not None:
+                closing.append(session)
+        return closing
+
+    def _expire(self) -> list[_Session]:
+        if self.idle_ttl is None:
+            return []
+        deadline = self.clock() - self.idle_ttl
+        expired = []
+        # Sessions are ordered by last use, so the sweep stops at the first
+        # recent one; sessions still leased are skipped.
+        for username, session in self._sessions.items():
+            if session.last_used > deadline:
+                break
+            if not session.leases:
+                expired.append(username)
+        return [self._discard(username, expired=True) for username in expired]
+
+    def _close(self, sessions: list[_Session]):
+        for session in sessions:
+            try:
+                session.client.close()
+            except Exception as e:
+                logger.logger.warning(
+                    "Closing pooled session %s failed: %s",
+                    session.client.authenticator.username,
+                    e,
+                )
@@ -0,0 +1,79 @@
+"""
+Deadlines bounding every request of an operation.
+
+Inside `with Deadline(seconds):` each request caps its timeouts to the time
+left, and no attempt or retry starts once the deadline has passed. The active
+deadline lives in a context variable: asyncio tasks inherit it, threads run
+tasks under it through contextvars.copy_context().
+"""
+
+import time
+from contextvars import ContextVar, Token
+from typing import Callable
+
+import httpx
+
+from .errors import DSP2DeadlineExceededError
+
+_current: ContextVar["Deadline | None"] = ContextVar("dsp2_deadline", default=None)
+
+
+class Deadline:
+    def __init__(self, timeout: float, clock: Callable[[], float] = time.monotonic):
+        if timeout <= 0:
+            raise ValueError("timeout must be positive")
+        self.timeout = timeout
+        self.clock = clock
+        self.expires_at = clock() + timeout
+        self._tokens: list[Token] = []
+
+    def __enter__(self) -> "Deadline":
+        self._tokens.append(_current.set(self))
+        return self
+
+    def __exit__(self, *exc_info):
+        _current.reset(self._tokens.pop())
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - self.clock())
+
+    @property
+    def expired(self) -> bool:
+        return self.clock() >= self.expires_at
+
+    def check(self, name: str = ""):
+        if self.expired:
+            raise DSP2DeadlineExceededError(
+                f"Deadline of {self.timeout:g}s exceeded"
+                + (f" before {name}" if name else "")
+            )
+
+    def cap(self, timeout: httpx.Timeout) -> httpx.Timeout:
+        """Timeouts no longer than the time left."""
+        left = self.remaining()
+
+        def capped(value: float | None) -> float:
+            return left if value is None else min(value, left)
+
+        return httpx.Timeout(
+            connect=capped(timeout.connect),
+            read=capped(timeout.read),
+            write=capped(timeout.write),
+            pool=capped(timeout.pool),
+        )
+
+
+def current_deadline() -> Deadline | None:
+    return _current.get()
+
+
+def request_options(client: httpx.Client | httpx.AsyncClient) -> dict:
+    """
+    Extra httpx request options under the active deadline: a capped timeout.
+    Raises DSP2DeadlineExceededError once it has passed.
+    """
+    deadline = _current.get()
+    if deadline is None:
+        return {}
+    deadline.check()
+    return {"timeout": deadline.cap(client.timeout)}
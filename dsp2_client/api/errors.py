@@ -0,0 +1,120 @@
+"""
+Typed errors raised by the DSP2 clients.
+
+Every error derives from RuntimeError, so callers catching RuntimeError keep
+working. `retryable` tells transient failures (rate limiting, unavailable
+upstream, network errors) from fatal ones.
+"""
+
+import time
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+
+import httpx
+
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+class DSP2Error(RuntimeError):
+    """Base class of DSP2 client errors."""
+
+    retryable = False
+
+
+class DSP2AuthenticationError(DSP2Error):
+    """The token endpoint refused the credentials or could not be reached."""
+
+
+class DSP2HTTPError(DSP2Error):
+    """The API answered with an error status."""
+
+    def __init__(self, message: str, status_code: int, response_text: str = ""):
+        super().__init__(message)
+        self.status_code = status_code
+        self.response_text = response_text
+
+
+class DSP2ClientError(DSP2HTTPError):
+    """A 4xx answer: the request itself is wrong and retrying will not help."""
+
+
+class DSP2ServerError(DSP2HTTPError):
+    """A 5xx answer. 500 and 502-504 answers are retryable."""
+
+    def __init__(self, message: str, status_code: int, response_text: str = ""):
+        super().__init__(message, status_code, response_text)
+        self.retryable = status_code in RETRYABLE_STATUS_CODES
+
+
+class DSP2RateLimitError(DSP2ClientError):
+    """A 429 answer, retryable once retry_after seconds have passed."""
+
+    retryable = True
+
+    def __init__(
+        self,
+        message: str,
+        status_code: int = 429,
+        response_text: str = "",
+        retry_after: float | None = None,
+    ):
+        super().__init__(message, status_code, response_text)
+        self.retry_after = retry_after
+
+
+class DSP2TransportError(DSP2Error):
+    """The request did not complete: connection, timeout or protocol error."""
+
+    retryable = True
+
+
+class DSP2CircuitOpenError(DSP2Error):
+    """Requests are short-circuited after repeated upstream failures."""
+
+
+class DSP2DeadlineExceededError(DSP2Error):
+    """The operation's deadline passed before the request could complete."""
+
+
+def error_marker(error: Exception) -> dict:
+    """How a failure is reported in a partial result."""
+    return {
+        "error": type(error).__name__,
+        "message": str(error),
+        "timed_out": isinstance(error, DSP2DeadlineExceededError),
+    }
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    Seconds to wait from a Retry-After header, given in seconds or as an
+    HTTP date.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, when.timestamp() - time.time())
+
+
+def error_for_response(response: httpx.Response, message: str) -> DSP2HTTPError:
+    status_code = response.status_code
+    text = response.text
+    if status_code == 429:
+        return DSP2RateLimitError(
+            message,
+            status_code,
+            text,
+            retry_after=parse_retry_after(response.headers.get("Retry-After")),
+        )
+    if status_code >= 500:
+        return DSP2ServerError(message, status_code, text)
+    return DSP2ClientError(message, status_code, text)
@@ -0,0 +1,105 @@
+"""
+Connection pool settings and transports shared between clients.
+"""
+
+from dataclasses import dataclass, field
+
+import httpx
+
+from .. import config
+
+
+@dataclass(frozen=True)
+class HTTPConfig:
+    """
+    Pool limits, keep-alive expiry, HTTP/2 and timeouts of a client.
+    Defaults come from the HTTP_* settings in config. HTTP/2 requires the
+    `h2` package (`pip install httpx[http2]`).
+    """
+
+    timeout: float | None = field(default_factory=lambda: config.HTTP_TIMEOUT)
+    connect_timeout: float | None = None
+    max_connections: int | None = field(
+        default_factory=lambda: config.HTTP_MAX_CONNECTIONS
+    )
+    max_keepalive_connections: int | None = field(
+        default_factory=lambda: config.HTTP_MAX_KEEPALIVE_CONNECTIONS
+    )
+    keepalive_expiry: float | None = field(
+        default_factory=lambda: config.HTTP_KEEPALIVE_EXPIRY
+    )
+    http2: bool = field(default_factory=lambda: config.HTTP_HTTP2)
+
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    def timeouts(self) -> httpx.Timeout:
+        connect = self.timeout if self.connect_timeout is None else self.connect_timeout
+        return httpx.Timeout(self.timeout, connect=connect)
+
+    def client_options(self) -> dict:
+        return {
+            "timeout": self.timeouts(),
+            "limits": self.limits(),
+            "http2": self.http2,
+        }
+
+
+class SharedTransport(httpx.BaseTransport):
+    """
+    A connection pool shared by many clients. Closing a client leaves the
+    pool open; call shutdown() once the process no longer needs it. An
+    existing transport can be wrapped instead of creating a new pool.
+    """
+
+    def __init__(
+        self,
+        http_config: HTTPConfig | None = None,
+        transport: httpx.BaseTransport | None = None,
+    ):
+        if transport is None:
+            http_config = http_config or HTTPConfig()
+            transport = httpx.HTTPTransport(
+                limits=http_config.limits(), http2=http_config.http2
+            )
+        self._transport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        return self._transport.handle_request(request)
+
+    def close(self):
+        pass
+
+    def shutdown(self):
+        self._transport.close()
+
+
+class AsyncSharedTransport(httpx.AsyncBaseTransport):
+    """
+    asyncio counterpart of SharedTransport.
+    """
+
+    def __init__(
+        self,
+        http_config: HTTPConfig | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        if transport is None:
+            http_config = http_config or HTTPConfig()
+            transport = httpx.AsyncHTTPTransport(
+                limits=http_config.limits(), http2=http_config.http2
+            )
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._transport.handle_async_request(request)
+
+    async def aclose(self):
+        pass
+
+    async def shutdown(self):
+        await self._transport.aclose()
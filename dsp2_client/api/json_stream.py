@@ -0,0 +1,127 @@
+"""
+Incremental parsing of JSON arrays from a byte stream.
+
+JSONArrayParser splits a top-level array into the raw bytes of its elements
+as soon as each one is complete, so only the element being received is held
+in memory. Elements are decoded with orjson when it is installed.
+"""
+
+import json
+import re
+from typing import Any, Iterable, Iterator
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised by forcing orjson to None
+    orjson = None
+
+_STRUCTURAL = re.compile(rb'["\[\]{},]')
+_STRING_END = re.compile(rb'["\\]')
+_WHITESPACE = b" \t\r\n"
+
+
+def loads(data: bytes | str) -> Any:
+    """Decode JSON with the fastest available backend."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class JSONArrayParser:
+    """
+    Push parser: feed() it chunks and get back the elements completed by
+    each chunk, then call close() to check that the array was complete.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._pos = 0
+        self._start: int | None = None
+        self._depth = 0
+        self._in_string = False
+        self._finished = False
+
+    def feed(self, chunk: bytes) -> list[bytes]:
+        if self._finished:
+            if chunk.strip(_WHITESPACE):
+                raise ValueError("Unexpected data after the JSON array")
+            return []
+        buffer = self._buffer
+        buffer += chunk
+        items = []
+        pos = self._pos
+
+        while pos < len(buffer):
+            if self._in_string:
+                match = _STRING_END.search(buffer, pos)
+                if match is None:
+                    pos = len(buffer)
+                elif buffer[match.start()] == 0x5C:  # backslash
+                    if match.start() + 1 >= len(buffer):
+                        # Wait for the escaped character.
+                        pos = match.start()
+                        break
+                    pos = match.start() + 2
+                else:
+                    self._in_string = False
+                    pos = match.start() + 1
+                continue
+
+            match = _STRUCTURAL.search(buffer, pos)
+            if match is None:
+                pos = len(buffer)
+                break
+            pos = match.start()
+            char = buffer[pos]
+
+            if self._depth == 0:
+                if buffer[self._pos : pos].strip(_WHITESPACE) or char != 0x5B:
+                    raise ValueError("Expected a JSON array")
+                self._depth = 1
+                self._start = pos + 1
+            elif char == 0x22:  # "
+                self._in_string = True
+            elif char in b"[{":
+                self._depth += 1
+            elif char in b"]}":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._emit(buffer, pos, items)
+                    self._finished = True
+                    rest = bytes(buffer[pos + 1 :])
+                    self._buffer = bytearray()
+                    self._pos = 0
+                    self.feed(rest)
+                    return items
+            elif self._depth == 1:  # ,
+                self._emit(buffer, pos, items)
+                self._start = pos + 1
+            pos += 1
+            self._pos = pos
+
+        # Keep only the element being received.
+        keep = self._start if self._start is not None else pos
+        del buffer[:keep]
+        self._pos = pos - keep
+        if self._start is not None:
+            self._start = 0
+        return items
+
+    def _emit(self, buffer: bytearray, end: int, items: list[bytes]):
+        item = bytes(buffer[self._start : end]).strip(_WHITESPACE)
+        if item:
+            items.append(item)
+
+    def close(self):
+        if not self._finished:
+            raise ValueError("Incomplete JSON array")
+
+
+def iter_array_items(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    Yield the raw JSON of each element of an array received in chunks.
+    """
+    parser = JSONArrayParser()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    parser.close()
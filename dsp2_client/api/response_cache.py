@@ -0,0 +1,171 @@
+"""
+An LRU cache of GET responses with per-endpoint lifetimes.
+
+Entries are keyed by namespace (one per user), URL, query parameters and the
+form the body was kept in.
+Expired entries that carry an ETag or Last-Modified validator are kept so the
+next request can be made conditional and answered with a 304.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Hashable
+
+from .. import config
+
+CacheKey = tuple
+
+
+@dataclass
+class CacheEntry:
+    data: Any
+    expires_at: float
+    etag: str | None = None
+    last_modified: str | None = None
+    account_id: str | None = None
+
+    def is_fresh(self, now: float | None = None) -> bool:
+        return (now or time.monotonic()) < self.expires_at
+
+    def conditional_headers(self) -> dict:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    revalidations: int
+    size: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.revalidations + self.misses
+        return (self.hits + self.revalidations) / total if total else 0.0
+
+
+class ResponseCache:
+    """
+    Thread-safe response cache shared by one or many clients.
+    """
+
+    def __init__(
+        self,
+        ttls: dict[str, float] | None = None,
+        default_ttl: float = 0.0,
+        maxsize: int = 1024,
+    ):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.ttls = dict(config.CACHE_TTLS if ttls is None else ttls)
+        self.default_ttl = default_ttl
+        self.maxsize = maxsize
+        self._entries: OrderedDict[CacheKey, CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._revalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def ttl_for(self, template: str) -> float:
+        return self.ttls.get(template, self.default_ttl)
+
+    @staticmethod
+    def key(
+        namespace: Hashable, url: str, params: dict | None, variant: Hashable = None
+    ) -> CacheKey:
+        return (namespace, url, tuple(sorted((params or {}).items())), variant)
+
+    def lookup(self, key: CacheKey) -> CacheEntry | None:
+        """
+        Return the entry for key, fresh or not, marking it recently used.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def store(
+        self,
+        key: CacheKey,
+        data: Any,
+        ttl: float,
+        etag: str | None = None,
+        last_modified: str | None = None,
+        account_id: str | None = None,
+    ):
+        """
+        Cache a response. Responses with no lifetime and no validator are
+        not worth keeping and are ignored.
+        """
+        if ttl <= 0 and not (etag or last_modified):
+            return
+        entry = CacheEntry(
+            data, time.monotonic() + ttl, etag, last_modified, account_id
+        )
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def refresh(self, key: CacheKey, ttl: float) -> CacheEntry | None:
+        """
+        Extend the lifetime of an entry the server confirmed as unchanged.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.expires_at = time.monotonic() + ttl
+            return entry
+
+    def record_hit(self):
+        with self._lock:
+            self._hits += 1
+
+    def record_miss(self):
+        with self._lock:
+            self._misses += 1
+
+    def record_revalidation(self):
+        with self._lock:
+            self._revalidations += 1
+
+    def invalidate(
+        self,
+        namespace: Hashable | None = None,
+        account_id: str | None = None,
+        url: str | None = None,
+    ):
+        """
+        Drop entries of a namespace, optionally only those of one account or
+        one URL. With no arguments the whole cache is cleared.
+        """
+        with self._lock:
+            for key in list(self._entries):
+                if namespace is not None and key[0] != namespace:
+                    continue
+                if url is not None and key[1] != url:
+                    continue
+                if (
+                    account_id is not None
+                    and self._entries[key].account_id != account_id
+                ):
+                    continue
+                del self._entries[key]
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                self._hits, self._misses, self._revalidations, len(self._entries)
+            )
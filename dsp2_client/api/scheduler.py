@@ -0,0 +1,352 @@
+"""
+Request scheduling: retries with exponential backoff and jitter, Retry-After
+handling, a token-bucket rate limiter and a per-base-URL circuit breaker.
+
+A RateLimiter or RequestScheduler can be shared by any number of clients and
+threads to keep their combined traffic under the bank's quota.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, TypeVar
+
+import httpx
+
+from .. import instrumentation, logger
+from .deadline import Deadline, current_deadline
+from .errors import (
+    DSP2CircuitOpenError,
+    DSP2DeadlineExceededError,
+    DSP2Error,
+    DSP2RateLimitError,
+    DSP2ServerError,
+    DSP2TransportError,
+)
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Retry transient failures up to max_attempts times in total. Waits grow
+    exponentially from backoff_base up to backoff_max, with full jitter; a
+    Retry-After from the server takes precedence, capped at max_retry_after.
+    """
+
+    max_attempts: int = 3
+    backoff_base: float = 0.2
+    backoff_max: float = 10.0
+    jitter: bool = True
+    max_retry_after: float = 60.0
+
+    def delay(self, attempt: int, retry_after: float | None = None) -> float:
+        """Seconds to wait after the given (1-based) failed attempt."""
+        if retry_after is not None:
+            return min(retry_after, self.max_retry_after)
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+        return random.uniform(0, delay) if self.jitter else delay
+
+
+NO_RETRY = RetryPolicy(max_attempts=1)
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket: `rate` requests per second on average, with
+    bursts of up to `capacity` requests. A wait that would outlast the
+    current deadline gives its token back and raises instead.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Take one token and return how long the caller must wait before
+        sending. Reservations are first come, first served.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self, name: str = ""):
+        delay = self._reserve_within_deadline(name)
+        if delay:
+            time.sleep(delay)
+
+    async def acquire_async(self, name: str = ""):
+        delay = self._reserve_within_deadline(name)
+        if delay:
+            await asyncio.sleep(delay)
+
+    def _reserve_within_deadline(self, name: str) -> float:
+        delay = self.reserve()
+        deadline = current_deadline()
+        if delay and deadline is not None and delay >= deadline.remaining():
+            with self._lock:
+                self._tokens += 1
+            raise DSP2DeadlineExceededError(
+                f"Deadline of {deadline.timeout:g}s leaves no time to send {name}"
+            )
+        return delay
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive upstream failures and rejects
+    requests for `recovery_timeout` seconds. Then a single trial request is
+    let through: success closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at >= self.recovery_timeout:
+                return "half-open"
+            return "open"
+
+    def before_request(self, name: str = ""):
+        with self._lock:
+            if self._opened_at is None:
+                return
+            if (
+                time.monotonic() - self._opened_at < self.recovery_timeout
+                or self._trial_in_flight
+            ):
+                raise DSP2CircuitOpenError(f"Circuit open for {name or 'upstream'}")
+            self._trial_in_flight = True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+    def release(self):
+        """End an attempt that says nothing about the upstream's health."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def reset(self):
+        self.record_success()
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def circuit_breaker_for(base_url: str) -> CircuitBreaker:
+    """The process-wide circuit breaker of a base URL."""
+    key = str(base_url).rstrip("/")
+    with _breakers_lock:
+        breaker = _breakers.get(key)
+        if breaker is None:
+            breaker = _breakers[key] = CircuitBreaker()
+        return breaker
+
+
+def reset_circuit_breakers():
+    with _breakers_lock:
+        _breakers.clear()
+
+
+class RequestScheduler:
+    """
+    Runs request attempts under a retry policy, an optional rate limiter
+    and an optional circuit breaker. `name` labels log lines; `endpoint`, the
+    endpoint template, labels retry metrics. Under an active Deadline, no
+    attempt starts after it and no retry waits past it.
+    """
+
+    def __init__(
+        self,
+        retry_policy: RetryPolicy | None = None,
+        rate_limiter: RateLimiter | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+    ):
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.rate_limiter = rate_limiter
+        self.circuit_breaker = circuit_breaker
+
+    def run(
+        self, attempt: Callable[[], T], name: str = "", endpoint: str | None = None
+    ) -> T:
+        deadline = current_deadline()
+        attempt_number = 1
+        while True:
+            if deadline is not None:
+                deadline.check(name)
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.before_request(name)
+            try:
+                result = self._settle(attempt, name)
+            except DSP2Error as e:
+                delay = self._retry_delay(e, attempt_number, name, endpoint, deadline)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                attempt_number += 1
+                continue
+            return result
+
+    async def arun(
+        self,
+        attempt: Callable[[], Awaitable[T]],
+        name: str = "",
+        endpoint: str | None = None,
+    ) -> T:
+        deadline = current_deadline()
+        attempt_number = 1
+        while True:
+            if deadline is not None:
+                deadline.check(name)
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.before_request(name)
+            try:
+                result = await self._asettle(attempt, name)
+            except DSP2Error as e:
+                delay = self._retry_delay(e, attempt_number, name, endpoint, deadline)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt_number += 1
+                continue
+            return result
+
+    def _settle(self, attempt: Callable[[], T], name: str) -> T:
+        try:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(name)
+            try:
+                result = attempt()
+            except httpx.TransportError as e:
+                self._check_deadline(e, name)
+                raise DSP2TransportError(f"Failed {name}: {e}") from e
+        except DSP2Error as e:
+            self._record(e)
+            raise
+        except Exception:
+            # The upstream answered; the failure is on our side.
+            self._record(None)
+            raise
+        except BaseException:
+            # Cancelled or interrupted: nothing was learned about the upstream.
+            self._release()
+            raise
+        self._record(None)
+        return result
+
+    async def _asettle(self, attempt: Callable[[], Awaitable[T]], name: str) -> T:
+        try:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async(name)
+            try:
+                result = await attempt()
+            except httpx.TransportError as e:
+                self._check_deadline(e, name)
+                raise DSP2TransportError(f"Failed {name}: {e}") from e
+        except DSP2Error as e:
+            self._record(e)
+            raise
+        except Exception:
+            # The upstream answered; the failure is on our side.
+            self._record(None)
+            raise
+        except BaseException:
+            # Cancelled or interrupted: nothing was learned about the upstream.
+            self._release()
+            raise
+        self._record(None)
+        return result
+
+    @staticmethod
+    def _check_deadline(error: httpx.TransportError, name: str):
+        deadline = current_deadline()
+        if deadline is not None and deadline.expired:
+            # A timeout capped by the deadline, not a sign of upstream failure.
+            raise DSP2DeadlineExceededError(
+                f"Deadline of {deadline.timeout:g}s exceeded during {name}"
+            ) from error
+
+    def _release(self):
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.release()
+
+    def _record(self, error: DSP2Error | None):
+        if self.circuit_breaker is None:
+            return
+        if isinstance(error, DSP2DeadlineExceededError):
+            self._release()
+        elif isinstance(error, (DSP2ServerError, DSP2TransportError)):
+            self.circuit_breaker.record_failure()
+        else:
+            self.circuit_breaker.record_success()
+
+    def _retry_delay(
+        self,
+        error: DSP2Error,
+        attempt: int,
+        name: str,
+        endpoint: str | None,
+        deadline: Deadline | None = None,
+    ) -> float | None:
+        if isinstance(error, DSP2DeadlineExceededError):
+            return None
+        if deadline is not None and deadline.expired:
+            # Usually a timeout capped by the deadline.
+            raise DSP2DeadlineExceededError(
+                f"Deadline of {deadline.timeout:g}s exceeded during {name}"
+            ) from error
+        if not error.retryable or attempt >= self.retry_policy.max_attempts:
+            return None
+        retry_after = (
+            error.retry_after if isinstance(error, DSP2RateLimitError) else None
+        )
+        delay = self.retry_policy.delay(attempt, retry_after)
+        if deadline is not None and delay >= deadline.remaining():
+            raise DSP2DeadlineExceededError(
+                f"Deadline of {deadline.timeout:g}s leaves no time to retry {name}"
+            ) from error
+        logger.logger.warning(
+            "Retrying %s after %s (attempt %d, waiting %.2fs)",
+            name,
+            type(error).__name__,
+            attempt,
+            delay,
+        )
+        instrumentation.get_instrumentation().on_retry(
+            endpoint or name, type(error).__name__, attempt, delay
+        )
+        return delay
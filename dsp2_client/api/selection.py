@@ -0,0 +1,94 @@
+"""
+Account and date-window selection for partial aggregations.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Iterable
+
+from dsp2_client.models.account import AccountType, AccountUsage
+
+
+def _members(enum: type[Enum], values) -> frozenset | None:
+    if values is None:
+        return None
+    if isinstance(values, (str, Enum)):
+        values = [values]
+    return frozenset(enum(value) for value in values)
+
+
+@dataclass(frozen=True)
+class AccountSelection:
+    """
+    Accounts to aggregate: every criterion given must match.
+    """
+
+    account_ids: frozenset[str] | None = None
+    types: frozenset[AccountType] | None = None
+    usages: frozenset[AccountUsage] | None = None
+
+    @classmethod
+    def build(
+        cls,
+        account_ids: Iterable[str] | None = None,
+        account_types: AccountType | Iterable[AccountType] | None = None,
+        account_usages: AccountUsage | Iterable[AccountUsage] | None = None,
+    ) -> "AccountSelection":
+        if isinstance(account_ids, str):
+            account_ids = [account_ids]
+        return cls(
+            frozenset(account_ids) if account_ids is not None else None,
+            _members(AccountType, account_types),
+            _members(AccountUsage, account_usages),
+        )
+
+    def matches(self, account: dict) -> bool:
+        return (
+            (self.account_ids is None or account["id"] in self.account_ids)
+            and (self.types is None or account["type"] in self.types)
+            and (self.usages is None or account["usage"] in self.usages)
+        )
+
+    def select(self, accounts: list[dict]) -> list[dict]:
+        return [account for account in accounts if self.matches(account)]
+
+
+@dataclass(frozen=True)
+class DateWindow:
+    """
+    Half-open window on date_operation: since <= date < until. Naive
+    datetimes are taken as UTC.
+    """
+
+    since: datetime | None = None
+    until: datetime | None = None
+
+    def __post_init__(self):
+        object.__setattr__(self, "since", _as_utc(self.since))
+        object.__setattr__(self, "until", _as_utc(self.until))
+        if self.since and self.until and self.since >= self.until:
+            raise ValueError("since must be earlier than until")
+
+    def __bool__(self) -> bool:
+        return self.since is not None or self.until is not None
+
+    def contains(self, value: datetime | str) -> bool:
+        value = _as_utc(_parse(value))
+        return (self.since is None or value >= self.since) and (
+            self.until is None or value < self.until
+        )
+
+    def is_before(self, value: datetime | str) -> bool:
+        """True when `value` is older than the window."""
+        return self.since is not None and _as_utc(_parse(value)) < self.since
+
+
+def _parse(value: datetime | str) -> datetime:
+    return datetime.fromisoformat(value) if isinstance(value, str) else value
+
+
+def _as_utc(value: datetime | None) -> datetime | None:
+    if value is None or value.tzinfo:
+        return value
+    return value.replace(tzinfo=timezone.utc)
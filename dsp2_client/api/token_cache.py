@@ -0,0 +1,237 @@
+"""
+Token caches shared across DSP2Client instances, keyed by
+(base_url, username, scope).
+
+InMemoryTokenCache serves clients within one process. FileTokenCache shares
+tokens between processes: the file is guarded by an exclusive lock, rewritten
+atomically with owner-only permissions, and every entry is encrypted with
+AES-GCM (from the cryptography package) under a key derived from a
+caller-provided secret. Expired entries are dropped whenever it is written.
+"""
+
+import base64
+import hmac
+import json
+import os
+import secrets
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+# (base_url, username, scope), optionally followed by further qualifiers.
+TokenCacheKey = tuple[str, ...]
+
+TOKEN_CACHE_KEY_ENV = "DSP2CLIENT_TOKEN_CACHE_KEY"
+
+
+@dataclass(frozen=True)
+class CachedToken:
+    access_token: str
+    refresh_token: str | None = None
+    expires_at: float | None = None
+    expires_in: float | None = None
+
+    def is_expired(self, now: float | None = None) -> bool:
+        if self.expires_at is None:
+            return False
+        return (now or time.time()) >= self.expires_at
+
+
+class TokenCache(ABC):
+    """
+    Interface of a token cache. Implementations must be thread-safe.
+    """
+
+    @abstractmethod
+    def get(self, key: TokenCacheKey) -> CachedToken | None: ...
+
+    @abstractmethod
+    def set(self, key: TokenCacheKey, token: CachedToken): ...
+
+    @abstractmethod
+    def delete(self, key: TokenCacheKey): ...
+
+
+class InMemoryTokenCache(TokenCache):
+    """
+    Process-local LRU cache. Entries expire with their token or after `ttl`
+    seconds, whichever comes first.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float | None = None):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[TokenCacheKey, tuple[float, CachedToken]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: TokenCacheKey) -> CachedToken | None:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, token = entry
+            if token.is_expired(now) or (
+                self.ttl is not None and now - stored_at >= self.ttl
+            ):
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return token
+
+    def set(self, key: TokenCacheKey, token: CachedToken):
+        with self._lock:
+            self._entries[key] = (time.time(), token)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: TokenCacheKey):
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class FileTokenCache(TokenCache):
+    """
+    Cross-process cache stored in a single file. Needs the cryptography
+    package: pip install dsp2client[encryption].
+
+    The secret is read from DSP2CLIENT_TOKEN_CACHE_KEY when not given. Entry
+    names are keyed hashes, so usernames do not appear in the file either;
+    each entry is authenticated together with its name.
+    """
+
+    def __init__(self, path: str | os.PathLike, secret: str | bytes | None = None):
+        try:
+            from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+            from cryptography.hazmat.primitives.hashes import SHA256
+            from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+        except ImportError as e:
+            raise ImportError(
+                "FileTokenCache needs cryptography: "
+                "pip install dsp2client[encryption]"
+            ) from e
+        secret = secret or os.getenv(TOKEN_CACHE_KEY_ENV)
+        if not secret:
+            raise ValueError(
+                f"FileTokenCache needs a secret or {TOKEN_CACHE_KEY_ENV} to be set"
+            )
+        if isinstance(secret, str):
+            secret = secret.encode()
+        self.path = Path(path)
+        enc_key = HKDF(
+            SHA256(), length=32, salt=None, info=b"dsp2client-token-cache:enc"
+        ).derive(secret)
+        self._aead = AESGCM(enc_key)
+        self._name_key = hmac.digest(secret, b"dsp2client-token-cache:name", "sha256")
+        self._thread_lock = threading.Lock()
+
+    def get(self, key: TokenCacheKey) -> CachedToken | None:
+        name = self._entry_name(key)
+        with self._locked():
+            entry = self._read().get(name)
+        if not isinstance(entry, dict):
+            return None
+        token = self._decrypt(name, entry.get("token"))
+        if token is None or token.is_expired():
+            return None
+        return token
+
+    def set(self, key: TokenCacheKey, token: CachedToken):
+        name = self._entry_name(key)
+        # The expiry stays readable so that any writer can drop the entry.
+        entry = {"expires_at": token.expires_at, "token": self._encrypt(name, token)}
+        with self._locked():
+            entries = self._read()
+            entries[name] = entry
+            self._write(entries)
+
+    def delete(self, key: TokenCacheKey):
+        name = self._entry_name(key)
+        with self._locked():
+            entries = self._read()
+            if entries.pop(name, None) is not None:
+                self._write(entries)
+
+    def _entry_name(self, key: TokenCacheKey) -> str:
+        return hmac.new(self._name_key, "\0".join(key).encode(), "sha256").hexdigest()
+
+    @contextmanager
+    def _locked(self):
+        with self._thread_lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            lock_path = self.path.with_name(self.path.name + ".lock")
+            with open(lock_path, "a") as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _write(self, entries: dict):
+        now = time.time()
+        entries = {
+            name: entry
+            for name, entry in entries.items()
+            if isinstance(entry, dict)
+            and (entry.get("expires_at") is None or entry["expires_at"] > now)
+        }
+        # mkstemp creates the file readable and writable by its owner only.
+        fd, tmp_path = tempfile.mkstemp(
+            dir=self.path.parent, prefix=self.path.name, suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entries, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def _encrypt(self, name: str, token: CachedToken) -> str:
+        plaintext = json.dumps(asdict(token)).encode()
+        nonce = secrets.token_bytes(12)
+        ciphertext = self._aead.encrypt(nonce, plaintext, name.encode())
+        return base64.b64encode(nonce + ciphertext).decode()
+
+    def _decrypt(self, name: str, blob: str | None) -> CachedToken | None:
+        from cryptography.exceptions import InvalidTag
+
+        try:
+            raw = base64.b64decode(blob)
+            plaintext = self._aead.decrypt(raw[:12], raw[12:], name.encode())
+        except (TypeError, ValueError, InvalidTag):
+            return None
+        return CachedToken(**json.loads(plaintext))
+
+
+def token_cache_key(base_url: str, username: str, scope: str) -> TokenCacheKey:
+    return (str(base_url).rstrip("/"), username, scope)
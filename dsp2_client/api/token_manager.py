@@ -0,0 +1,177 @@
+"""
+Access token lifecycle: expiry tracking, pre-emptive refresh and recovery
+from rejected tokens. A single refresh is in flight at any time; concurrent
+callers wait for it and share its result. An optional token cache lets
+several clients, or processes, reuse the same token.
+"""
+
+import asyncio
+import threading
+import time
+
+from .. import instrumentation, logger
+from .async_authenticator import AsyncDSP2Authenticator
+from .authenticator import DSP2Authenticator
+from .token_cache import CachedToken, TokenCache, TokenCacheKey
+
+REFRESH_MARGIN_SECONDS = 60.0
+
+
+class TokenManager:
+    """
+    Hands out a valid access token, refreshing it shortly before it expires.
+    """
+
+    def __init__(
+        self,
+        authenticator: DSP2Authenticator,
+        refresh_margin: float = REFRESH_MARGIN_SECONDS,
+        cache: TokenCache | None = None,
+        cache_key: TokenCacheKey | None = None,
+    ):
+        if cache is not None and cache_key is None:
+            raise ValueError("cache_key is required when a token cache is used")
+        self.authenticator = authenticator
+        self.refresh_margin = refresh_margin
+        self.cache = cache
+        self.cache_key = cache_key
+        self._lock = threading.Lock()
+
+    @property
+    def token(self) -> str | None:
+        return self.authenticator.token
+
+    def needs_refresh(self) -> bool:
+        """
+        True when no token is held or it expires within the refresh margin.
+        The margin is capped at half the token lifetime for short-lived tokens.
+        """
+        auth = self.authenticator
+        if not auth.token:
+            return True
+        if auth.expires_at is None:
+            return False
+        margin = min(self.refresh_margin, (auth.expires_in or 0) / 2)
+        return time.time() >= auth.expires_at - margin
+
+    def get_token(self) -> str:
+        """
+        Return a valid access token, authenticating or refreshing if needed.
+        """
+        if not self.needs_refresh():
+            return self.authenticator.token
+        with self._lock:
+            if self.needs_refresh() and not self._load_cached():
+                self._renew(self._renewal_reason())
+                self._store_cached()
+            return self.authenticator.token
+
+    def invalidate(self, rejected_token: str | None) -> str:
+        """
+        Replace a token the API rejected. If another caller has already
+        replaced it, the new token is returned without a further request.
+        """
+        with self._lock:
+            if self.authenticator.token and self.authenticator.token != rejected_token:
+                return self.authenticator.token
+            logger.logger.info("Access token rejected, re-authenticating")
+            self._discard_cached(rejected_token)
+            self._renew("rejected")
+            self._store_cached()
+            return self.authenticator.token
+
+    def _renew(self, reason: str):
+        # refresh() uses the password grant when no refresh token is held.
+        start = time.perf_counter()
+        self.authenticator.refresh()
+        instrumentation.get_instrumentation().on_token_refresh(
+            reason, time.perf_counter() - start
+        )
+
+    def _renewal_reason(self) -> str:
+        return "expired" if self.authenticator.token else "initial"
+
+    def _load_cached(self) -> bool:
+        """
+        Adopt a cached token if one exists and is not about to expire.
+        """
+        if self.cache is None:
+            return False
+        cached = self.cache.get(self.cache_key)
+        if cached is None:
+            return False
+        auth = self.authenticator
+        previous = (auth.token, auth.expires_at, auth.expires_in)
+        auth.token = cached.access_token
+        auth.expires_at = cached.expires_at
+        auth.expires_in = cached.expires_in
+        auth.refresh_token = cached.refresh_token or auth.refresh_token
+        if self.needs_refresh():
+            # Keep only the refresh token, which is still the cheapest way to renew.
+            auth.token, auth.expires_at, auth.expires_in = previous
+            return False
+        logger.logger.debug("Using cached access token")
+        return True
+
+    def _store_cached(self):
+        if self.cache is None or not self.authenticator.token:
+            return
+        auth = self.authenticator
+        self.cache.set(
+            self.cache_key,
+            CachedToken(
+                access_token=auth.token,
+                refresh_token=auth.refresh_token,
+                expires_at=auth.expires_at,
+                expires_in=auth.expires_in,
+            ),
+        )
+
+    def _discard_cached(self, rejected_token: str | None):
+        if self.cache is None:
+            return
+        cached = self.cache.get(self.cache_key)
+        if cached is not None and cached.access_token == rejected_token:
+            self.cache.delete(self.cache_key)
+
+
+class AsyncTokenManager(TokenManager):
+    """
+    asyncio counterpart of TokenManager.
+    """
+
+    def __init__(
+        self,
+        authenticator: AsyncDSP2Authenticator,
+        refresh_margin: float = REFRESH_MARGIN_SECONDS,
+        cache: TokenCache | None = None,
+        cache_key: TokenCacheKey | None = None,
+    ):
+        super().__init__(authenticator, refresh_margin, cache, cache_key)
+        self._lock = asyncio.Lock()
+
+    async def get_token(self) -> str:
+        if not self.needs_refresh():
+            return self.authenticator.token
+        async with self._lock:
+            if self.needs_refresh() and not self._load_cached():
+                await self._renew(self._renewal_reason())
+                self._store_cached()
+            return self.authenticator.token
+
+    async def invalidate(self, rejected_token: str | None) -> str:
+        async with self._lock:
+            if self.authenticator.token and self.authenticator.token != rejected_token:
+                return self.authenticator.token
+            logger.logger.info("Access token rejected, re-authenticating")
+            self._discard_cached(rejected_token)
+            await self._renew("rejected")
+            self._store_cached()
+            return self.authenticator.token
+
+    async def _renew(self, reason: str):
+        start = time.perf_counter()
+        await self.authenticator.refresh()
+        instrumentation.get_instrumentation().on_token_refresh(
+            reason, time.perf_counter() - start
+        )
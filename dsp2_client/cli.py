@@ -0,0 +1,222 @@
+"""
+dsp2client command line: export get_full_user_data for many users.
+
+    dsp2client export users.csv -o export.ndjson --workers 16
+
+Credentials are read from a CSV file with `username` and `password` columns,
+or from a JSON array of {"username": ..., "password": ...} objects. Results
+are written one user at a time as they complete. Exported users are recorded
+in a checkpoint file next to the output, and a rerun skips them.
+"""
+
+import argparse
+import csv
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Iterator, TextIO
+
+from . import logger
+from .api.batch import DEFAULT_BATCH_WORKERS, UserDataResult, iter_full_user_data
+from .api.http_config import HTTPConfig
+from .export import FORMATS, Checkpoint, open_writer
+from .models.offload import ProcessValidator
+
+SLOWEST_USERS = 5
+
+
+def read_credentials(path: str | Path) -> Iterator[tuple[str, str]]:
+    path = Path(path)
+    if path.suffix.lower() == ".json":
+        with open(path, encoding="utf-8") as f:
+            for entry in json.load(f):
+                yield entry["username"], entry["password"]
+        return
+    with open(path, encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            yield row["username"], row["password"]
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="dsp2client", description="DSP2 client command line tools."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export", help="Export the full data of many users.")
+    export.add_argument("credentials", help="CSV or JSON credentials file.")
+    export.add_argument("-o", "--output", required=True, help="Output path.")
+    export.add_argument(
+        "-f",
+        "--format",
+        choices=FORMATS,
+        help="Output format (default: from the output extension, else ndjson).",
+    )
+    export.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=DEFAULT_BATCH_WORKERS,
+        help="Users aggregated concurrently.",
+    )
+    export.add_argument(
+        "--per-user-workers",
+        type=int,
+        default=None,
+        help="Concurrent account requests per user.",
+    )
+    export.add_argument(
+        "--transactions",
+        type=int,
+        default=10,
+        help="Transactions fetched per account.",
+    )
+    export.add_argument(
+        "--validation-processes",
+        type=int,
+        default=0,
+        help="Worker processes validating large payloads (default: in-process).",
+    )
+    export.add_argument("--base-url", default=None, help="API base URL.")
+    export.add_argument(
+        "--max-connections", type=int, default=None, help="Connection pool size."
+    )
+    export.add_argument(
+        "--checkpoint",
+        default=None,
+        help="Checkpoint file (default: <output>.checkpoint).",
+    )
+    export.add_argument(
+        "--restart",
+        action="store_true",
+        help="Ignore the checkpoint and overwrite the output.",
+    )
+    export.add_argument(
+        "--timings", default=None, help="Write per-user timings to this CSV file."
+    )
+    return parser
+
+
+def export(args: argparse.Namespace, report: TextIO = sys.stderr) -> int:
+    if args.workers < 1:
+        raise SystemExit("--workers must be at least 1")
+    output = Path(args.output)
+    checkpoint_path = Path(args.checkpoint or f"{output}.checkpoint")
+    if args.restart and checkpoint_path.exists():
+        checkpoint_path.unlink()
+    checkpoint = Checkpoint(checkpoint_path)
+    resuming = bool(checkpoint.done)
+
+    skipped = 0
+
+    def pending_credentials():
+        nonlocal skipped
+        for username, password in read_credentials(args.credentials):
+            if username in checkpoint:
+                skipped += 1
+                continue
+            yield username, password
+
+    http_config = None
+    if args.max_connections:
+        http_config = HTTPConfig(max_connections=args.max_connections)
+
+    if resuming:
+        logger.logger.info(
+            "Resuming export: %d users already exported", len(checkpoint.done)
+        )
+    validator = None
+    if args.validation_processes > 0:
+        validator = ProcessValidator(max_workers=args.validation_processes)
+
+    writer = open_writer(output, args.format, append=resuming)
+    results: list[UserDataResult] = []
+    start = time.perf_counter()
+    try:
+        for result in iter_full_user_data(
+            pending_credentials(),
+            max_workers=args.workers,
+            base_url=args.base_url,
+            transactions_per_account=args.transactions,
+            per_user_workers=args.per_user_workers,
+            http_config=http_config,
+            validator=validator,
+        ):
+            # Keep timings only: the data itself is released once written.
+            if result.ok:
+                checkpoint.mark(writer.write(result))
+            results.append(
+                UserDataResult(
+                    result.index,
+                    result.username,
+                    error=result.error,
+                    elapsed=result.elapsed,
+                )
+            )
+    finally:
+        checkpoint.mark(writer.close())
+        checkpoint.close()
+        if validator is not None:
+            validator.close()
+    wall_time = time.perf_counter() - start
+
+    if args.timings:
+        write_timings(args.timings, results)
+    print_report(results, skipped, wall_time, report)
+    return 0 if all(result.ok for result in results) else 1
+
+
+def write_timings(path: str | Path, results: list[UserDataResult]):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["username", "ok", "elapsed", "error"])
+        for result in sorted(results, key=lambda result: result.index):
+            writer.writerow(
+                [
+                    result.username,
+                    result.ok,
+                    f"{result.elapsed:.6f}",
+                    "" if result.ok else str(result.error),
+                ]
+            )
+
+
+def print_report(
+    results: list[UserDataResult], skipped: int, wall_time: float, out: TextIO
+):
+    failed = [result for result in results if not result.ok]
+    print(
+        f"Exported {len(results) - len(failed)} users, {len(failed)} failed, "
+        f"{skipped} skipped (already exported) in {wall_time:.2f}s",
+        file=out,
+    )
+    if not results:
+        return
+    elapsed = sorted(result.elapsed for result in results)
+    p95 = elapsed[min(len(elapsed) - 1, int(0.95 * len(elapsed)))]
+    print(
+        f"Throughput: {len(results) / wall_time if wall_time else 0:.2f} users/s; "
+        f"per user: mean {statistics.fmean(elapsed):.3f}s, "
+        f"p50 {statistics.median(elapsed):.3f}s, p95 {p95:.3f}s, "
+        f"max {elapsed[-1]:.3f}s",
+        file=out,
+    )
+    slowest = sorted(results, key=lambda result: result.elapsed, reverse=True)
+    print("Slowest users:", file=out)
+    for result in slowest[:SLOWEST_USERS]:
+        print(f"  {result.username}: {result.elapsed:.3f}s", file=out)
+    for result in failed:
+        print(f"Failed: {result.username}: {result.error}", file=out)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.command == "export":
+        return export(args)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,15 @@
 """
-Loads DSP2 API configuration from environment variables defined in a .env
+DSP2 API configuration, read from environment variables.
+
+Settings are resolved on first use and cached; module attributes such as
+config.API_BASE_URL read from them. A .env file is only loaded on request:
+call load_dotenv(), or set DSP2CLIENT_LOAD_DOTENV=1 before first use.
 """
 
 import os
+from dataclasses import dataclass, field, fields, replace
 
-from dotenv import load_dotenv
-
-load_dotenv()
+LOAD_DOTENV_ENV = "DSP2CLIENT_LOAD_DOTENV"
 
 
 def get_env(key: str, default: str) -> str:
@@ -14,10 +17,123 @@ def get_env(key: str, default: str) -> str:
     return value if value else default
 
 
-API_BASE_URL = get_env("API_BASE_URL", "https://dsp2-technical-test.iliad78.net")
-TOKEN_ENDPOINT = get_env("TOKEN_ENDPOINT", "/oauth/token")
-IDENTITY = os.getenv("IDENTITY", "/stet/identity")
-ACCOUNTS = os.getenv("ACCOUNTS", "/stet/account")
-BALANCE = os.getenv("BALANCE", "/stet/account/{account_id}/balance")
-TRANSACTIONS = os.getenv("TRANSACTIONS", "/stet/account/{account_id}/transaction")
-ACCOUNT = os.getenv("ACCOUNT", "/stet/account/{account_id}")
+def _flag(value: str) -> bool:
+    return value.lower() in ("1", "true", "yes")
+
+
+@dataclass(frozen=True)
+class Settings:
+    api_base_url: str = "https://dsp2-technical-test.iliad78.net"
+    token_endpoint: str = "/oauth/token"
+    identity: str = "/stet/identity"
+    accounts: str = "/stet/account"
+    balance: str = "/stet/account/{account_id}/balance"
+    transactions: str = "/stet/account/{account_id}/transaction"
+    account: str = "/stet/account/{account_id}"
+
+    http_timeout: float = 5.0
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry: float = 5.0
+    http_http2: bool = False
+
+    # Response cache lifetimes in seconds, per endpoint template. A lifetime
+    # of 0 still lets a response be revalidated when the server sent an ETag
+    # or Last-Modified header.
+    cache_ttl_identity: float = 3600.0
+    cache_ttl_accounts: float = 300.0
+    cache_ttl_balance: float = 10.0
+    cache_ttl_transactions: float = 0.0
+    cache_ttls: dict = field(init=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(
+            self,
+            "cache_ttls",
+            {
+                self.identity: self.cache_ttl_identity,
+                self.accounts: self.cache_ttl_accounts,
+                self.account: self.cache_ttl_accounts,
+                self.balance: self.cache_ttl_balance,
+                self.transactions: self.cache_ttl_transactions,
+            },
+        )
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        defaults = cls()
+        return cls(
+            api_base_url=get_env("API_BASE_URL", defaults.api_base_url),
+            token_endpoint=get_env("TOKEN_ENDPOINT", defaults.token_endpoint),
+            identity=os.getenv("IDENTITY", defaults.identity),
+            accounts=os.getenv("ACCOUNTS", defaults.accounts),
+            balance=os.getenv("BALANCE", defaults.balance),
+            transactions=os.getenv("TRANSACTIONS", defaults.transactions),
+            account=os.getenv("ACCOUNT", defaults.account),
+            http_timeout=float(get_env("HTTP_TIMEOUT", "5.0")),
+            http_max_connections=int(get_env("HTTP_MAX_CONNECTIONS", "100")),
+            http_max_keepalive_connections=int(
+                get_env("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20")
+            ),
+            http_keepalive_expiry=float(get_env("HTTP_KEEPALIVE_EXPIRY", "5.0")),
+            http_http2=_flag(get_env("HTTP_HTTP2", "false")),
+            cache_ttl_identity=float(get_env("CACHE_TTL_IDENTITY", "3600")),
+            cache_ttl_accounts=float(get_env("CACHE_TTL_ACCOUNTS", "300")),
+            cache_ttl_balance=float(get_env("CACHE_TTL_BALANCE", "10")),
+            cache_ttl_transactions=float(get_env("CACHE_TTL_TRANSACTIONS", "0")),
+        )
+
+
+_settings: Settings | None = None
+
+
+def get_settings() -> Settings:
+    """The active settings, read from the environment on first use."""
+    global _settings
+    if _settings is None:
+        if _flag(os.getenv(LOAD_DOTENV_ENV, "")):
+            load_dotenv()
+        _settings = Settings.from_env()
+    return _settings
+
+
+def configure(settings: Settings | None = None, **overrides) -> Settings:
+    """
+    Install settings explicitly, or override some fields of the current
+    ones, e.g. configure(api_base_url="https://bank.example").
+    """
+    global _settings
+    _settings = replace(settings or get_settings(), **overrides)
+    return _settings
+
+
+def reset():
+    """Forget the resolved settings; the environment is read again on next use."""
+    global _settings
+    _settings = None
+
+
+def load_dotenv(path: str | os.PathLike | None = None) -> bool:
+    """
+    Load variables from a .env file (searched for when no path is given) and
+    re-read the settings. Needs python-dotenv.
+    """
+    from dotenv import load_dotenv as _load_dotenv
+
+    loaded = _load_dotenv(path)
+    reset()
+    return loaded
+
+
+_ATTRIBUTES = {f.name.upper(): f.name for f in fields(Settings)}
+
+
+def __getattr__(name: str):
+    attribute = _ATTRIBUTES.get(name)
+    if attribute is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(get_settings(), attribute)
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_ATTRIBUTES))
@@ -0,0 +1,236 @@
+"""
+Export of aggregated user data, one user at a time.
+
+Writers append each finished user to the output and report which users are
+durably written, so a Checkpoint can record them. NDJSON holds one full user
+per line. CSV and Parquet hold one row per account, with the account's
+balances and transactions encoded as JSON columns. Parquet needs pyarrow and
+writes a directory of part files, so a resumed run only adds new parts.
+"""
+
+import csv
+import json
+import os
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Iterable
+
+from pydantic_core import to_jsonable_python
+
+from .api.batch import UserDataResult
+
+FORMATS = ("ndjson", "csv", "parquet")
+
+ACCOUNT_COLUMNS = (
+    "username",
+    "user_id",
+    "first_name",
+    "last_name",
+    "account_id",
+    "type",
+    "usage",
+    "iban",
+    "name",
+    "currency",
+    "balances",
+    "transactions",
+)
+
+
+def infer_format(path: str | os.PathLike) -> str:
+    suffix = Path(path).suffix.lower().lstrip(".")
+    if suffix in ("csv", "parquet"):
+        return suffix
+    return "ndjson"
+
+
+def _dumps(value) -> str:
+    return json.dumps(to_jsonable_python(value), ensure_ascii=False)
+
+
+def _sync(file):
+    """Flush `file` to disk, so the users written to it can be checkpointed."""
+    file.flush()
+    os.fsync(file.fileno())
+
+
+def account_rows(result: UserDataResult) -> Iterable[dict]:
+    """Flatten one user's aggregated data into one row per account."""
+    identity = result.data["identity"]
+    for account in result.data["accounts"]:
+        yield {
+            "username": result.username,
+            "user_id": identity.get("id"),
+            "first_name": identity.get("first_name"),
+            "last_name": identity.get("last_name"),
+            "account_id": account.get("id"),
+            "type": to_jsonable_python(account.get("type")),
+            "usage": to_jsonable_python(account.get("usage")),
+            "iban": account.get("iban"),
+            "name": account.get("name"),
+            "currency": account.get("currency"),
+            "balances": _dumps(account.get("balances", [])),
+            "transactions": _dumps(account.get("transactions", [])),
+        }
+
+
+class Checkpoint:
+    """
+    Append-only list of the users already exported, one username per line.
+    """
+
+    def __init__(self, path: str | os.PathLike):
+        self.path = Path(path)
+        self.done: set[str] = set()
+        if self.path.exists():
+            with open(self.path, encoding="utf-8") as f:
+                self.done = {line.rstrip("\n") for line in f if line.strip()}
+        self._file = None
+
+    def __contains__(self, username: str) -> bool:
+        return username in self.done
+
+    def mark(self, usernames: Iterable[str]):
+        usernames = list(usernames)
+        if not usernames:
+            return
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write("".join(f"{username}\n" for username in usernames))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.done.update(usernames)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class ExportWriter(ABC):
+    """
+    Base writer. write() and close() return the usernames whose data has
+    been flushed to disk since the previous call.
+    """
+
+    def __init__(self, path: str | os.PathLike, append: bool = False):
+        self.path = Path(path)
+        self.append = append
+
+    @abstractmethod
+    def write(self, result: UserDataResult) -> list[str]: ...
+
+    def close(self) -> list[str]:
+        return []
+
+
+class NDJSONWriter(ExportWriter):
+    def __init__(self, path: str | os.PathLike, append: bool = False):
+        super().__init__(path, append)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a" if append else "w", encoding="utf-8")
+
+    def write(self, result: UserDataResult) -> list[str]:
+        record = {"username": result.username, **result.data}
+        self._file.write(_dumps(record) + "\n")
+        _sync(self._file)
+        return [result.username]
+
+    def close(self) -> list[str]:
+        self._file.close()
+        return []
+
+
+class CSVWriter(ExportWriter):
+    def __init__(self, path: str | os.PathLike, append: bool = False):
+        super().__init__(path, append)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        write_header = not (append and self.path.exists() and self.path.stat().st_size)
+        self._file = open(
+            self.path, "a" if append else "w", encoding="utf-8", newline=""
+        )
+        self._writer = csv.DictWriter(self._file, fieldnames=ACCOUNT_COLUMNS)
+        if write_header:
+            self._writer.writeheader()
+
+    def write(self, result: UserDataResult) -> list[str]:
+        self._writer.writerows(account_rows(result))
+        _sync(self._file)
+        return [result.username]
+
+    def close(self) -> list[str]:
+        self._file.close()
+        return []
+
+
+class ParquetWriter(ExportWriter):
+    """
+    Buffers rows and writes them as a new part file every `users_per_part`
+    users, so part files have reasonably sized row groups and a finished
+    part is never rewritten.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        append: bool = False,
+        users_per_part: int = 1000,
+    ):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as e:
+            raise ImportError(
+                "Parquet export needs pyarrow: pip install dsp2client[parquet]"
+            ) from e
+        super().__init__(path, append)
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        self.users_per_part = users_per_part
+        self.path.mkdir(parents=True, exist_ok=True)
+        if not append:
+            for part in self.path.glob("part-*.parquet"):
+                part.unlink()
+        self._next_part = len(list(self.path.glob("part-*.parquet")))
+        self._rows: list[dict] = []
+        self._users: list[str] = []
+
+    def write(self, result: UserDataResult) -> list[str]:
+        self._rows.extend(account_rows(result))
+        self._users.append(result.username)
+        if len(self._users) >= self.users_per_part:
+            return self._flush()
+        return []
+
+    def close(self) -> list[str]:
+        return self._flush()
+
+    def _flush(self) -> list[str]:
+        if not self._users:
+            return []
+        schema = self._pa.schema(
+            [(name, self._pa.string()) for name in ACCOUNT_COLUMNS]
+        )
+        table = self._pa.Table.from_pylist(self._rows, schema=schema)
+        part = self.path / f"part-{self._next_part:05d}.parquet"
+        tmp = part.with_suffix(".tmp")
+        self._pq.write_table(table, tmp)
+        with open(tmp, "rb") as f:
+            os.fsync(f.fileno())
+        os.replace(tmp, part)
+        self._next_part += 1
+        users, self._rows, self._users = self._users, [], []
+        return users
+
+
+WRITERS = {"ndjson": NDJSONWriter, "csv": CSVWriter, "parquet": ParquetWriter}
+
+
+def open_writer(
+    path: str | os.PathLike, format: str | None = None, append: bool = False
+) -> ExportWriter:
+    format = format or infer_format(path)
+    if format not in WRITERS:
+        raise ValueError(f"Unknown export format {format!r}")
+    return WRITERS[format](path, append=append)
@@ -0,0 +1,159 @@
+"""
+Instrumentation hooks for the client's hot paths.
+
+The active Instrumentation receives one call per HTTP attempt, retry, token
+renewal, bulk validation and response cache lookup. Endpoints are reported
+as templates such as "/stet/account/{account_id}/balance", never as formatted
+URLs, so metric cardinality stays bounded. The default does nothing; subclass
+Instrumentation to forward events to Prometheus, OpenTelemetry or statsd, and
+install it with set_instrumentation(). Hooks run inline on request paths and
+must be cheap and never raise.
+"""
+
+import bisect
+import threading
+from collections import defaultdict
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Instrumentation:
+    """
+    No-op hooks. Override the ones you need.
+    """
+
+    def on_request(
+        self,
+        endpoint: str,
+        status_code: int | None,
+        elapsed: float,
+        bytes_received: int,
+    ):
+        """One HTTP attempt. status_code is None when no response came back."""
+
+    def on_retry(self, endpoint: str, reason: str, attempt: int, delay: float):
+        """A failed attempt is about to be retried after `delay` seconds."""
+
+    def on_token_refresh(self, reason: str, elapsed: float):
+        """An access token was obtained: "initial", "expired" or "rejected"."""
+
+    def on_validation(self, model: str, count: int, elapsed: float):
+        """`count` items were validated into `model`."""
+
+    def on_cache(self, endpoint: str, outcome: str):
+        """A response cache lookup: "hit", "miss" or "revalidated"."""
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram, as exposed by Prometheus.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self) -> dict:
+        cumulative, total = {}, 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            cumulative[bound] = total
+        return {"count": self.count, "sum": self.sum, "buckets": cumulative}
+
+
+class InMemoryInstrumentation(Instrumentation):
+    """
+    Thread-safe in-process metrics, for debugging, tests and benchmarks, or
+    as a source to export periodically.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self._buckets = buckets
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.latency: dict[str, Histogram] = defaultdict(
+                lambda: Histogram(self._buckets)
+            )
+            self.statuses: dict[tuple[str, int | None], int] = defaultdict(int)
+            self.bytes_received: dict[str, int] = defaultdict(int)
+            self.retries: dict[tuple[str, str], int] = defaultdict(int)
+            self.token_refreshes: dict[str, int] = defaultdict(int)
+            self.token_refresh_time = 0.0
+            self.validation: dict[str, Histogram] = defaultdict(
+                lambda: Histogram(self._buckets)
+            )
+            self.validated_items: dict[str, int] = defaultdict(int)
+            self.cache: dict[tuple[str, str], int] = defaultdict(int)
+
+    def on_request(self, endpoint, status_code, elapsed, bytes_received):
+        with self._lock:
+            self.latency[endpoint].observe(elapsed)
+            self.statuses[(endpoint, status_code)] += 1
+            self.bytes_received[endpoint] += bytes_received
+
+    def on_retry(self, endpoint, reason, attempt, delay):
+        with self._lock:
+            self.retries[(endpoint, reason)] += 1
+
+    def on_token_refresh(self, reason, elapsed):
+        with self._lock:
+            self.token_refreshes[reason] += 1
+            self.token_refresh_time += elapsed
+
+    def on_validation(self, model, count, elapsed):
+        with self._lock:
+            self.validation[model].observe(elapsed)
+            self.validated_items[model] += count
+
+    def on_cache(self, endpoint, outcome):
+        with self._lock:
+            self.cache[(endpoint, outcome)] += 1
+
+    def cache_hit_rate(self, endpoint: str | None = None) -> float:
+        with self._lock:
+            counts = [
+                (outcome, count)
+                for (name, outcome), count in self.cache.items()
+                if endpoint is None or name == endpoint
+            ]
+        lookups = sum(count for _, count in counts)
+        # A revalidated entry was served without downloading the body again.
+        served = sum(count for outcome, count in counts if outcome != "miss")
+        return served / lookups if lookups else 0.0
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "latency": {k: h.snapshot() for k, h in self.latency.items()},
+                "statuses": dict(self.statuses),
+                "bytes_received": dict(self.bytes_received),
+                "retries": dict(self.retries),
+                "token_refreshes": dict(self.token_refreshes),
+                "token_refresh_time": self.token_refresh_time,
+                "validation": {k: h.snapshot() for k, h in self.validation.items()},
+                "validated_items": dict(self.validated_items),
+                "cache": dict(self.cache),
+            }
+
+
+_instrumentation = Instrumentation()
+
+
+def get_instrumentation() -> Instrumentation:
+    return _instrumentation
+
+
+def set_instrumentation(instrumentation: Instrumentation | None):
+    """Install process-wide hooks; None restores the no-op default."""
+    global _instrumentation
+    _instrumentation = instrumentation or Instrumentation()
@@ -1,3 +1,8 @@
+"""
+Package logger. The handler is installed on first access of `logger`, not at
+import time.
+"""
+
 import logging
 import os
 
@@ -24,4 +29,9 @@ def get_logger(name: str = "dsp2client") -> logging.Logger:
     return logger
 
 
-logger = get_logger()
+def __getattr__(name: str):
+    if name == "logger":
+        # Cached as a module global, so this runs once.
+        globals()["logger"] = get_logger()
+        return globals()["logger"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,125 @@
+"""
+Bulk validation helpers.
+
+Whole response arrays are validated in one call through a cached
+TypeAdapter(list[Model]) instead of one model constructor per item, and can
+be validated straight from the raw JSON body. Validation time is reported to
+the active instrumentation. construct_many builds models
+without validation for data that has already been validated once, such as
+model_dump() output read back from a local store. validate_dicts and
+validate_dicts_json skip models altogether: they validate into the dicts
+model_dump() would return, through a TypedDict mirroring the model's fields.
+"""
+
+from functools import lru_cache
+from time import perf_counter
+from typing import Annotated, Any, Iterable, TypedDict, TypeVar
+
+from pydantic import (
+    AfterValidator,
+    BaseModel,
+    BeforeValidator,
+    PlainValidator,
+    TypeAdapter,
+    WrapValidator,
+)
+
+from dsp2_client.instrumentation import get_instrumentation
+
+Model = TypeVar("Model", bound=BaseModel)
+
+
+@lru_cache(maxsize=None)
+def list_adapter(model: type[Model]) -> TypeAdapter:
+    return TypeAdapter(list[model])
+
+
+_FIELD_VALIDATORS = {
+    "after": AfterValidator,
+    "before": BeforeValidator,
+    "plain": PlainValidator,
+    "wrap": WrapValidator,
+}
+
+
+@lru_cache(maxsize=None)
+def dict_list_adapter(model: type[Model], trusted: bool = False) -> TypeAdapter:
+    """
+    TypeAdapter validating an array into dicts of the values `model` would
+    hold, applying its field constraints and field validators. With
+    trusted=True they are skipped and only JSON types are converted, for data
+    validated once already. Models with defaults, aliases or model validators
+    are not supported.
+    """
+    decorators = model.__pydantic_decorators__
+    if decorators.model_validators or any(
+        field.alias or not field.is_required() for field in model.model_fields.values()
+    ):
+        raise TypeError(f"{model.__name__} cannot be validated to dicts")
+    fields = {}
+    for name, field in model.model_fields.items():
+        metadata = []
+        if not trusted:
+            metadata.extend(field.metadata)
+            metadata.extend(
+                _FIELD_VALIDATORS[decorator.info.mode](decorator.func)
+                for decorator in decorators.field_validators.values()
+                if name in decorator.info.fields or "*" in decorator.info.fields
+            )
+        fields[name] = (
+            Annotated[(field.annotation, *metadata)] if metadata else field.annotation
+        )
+    return TypeAdapter(list[TypedDict(f"{model.__name__}Dict", fields)])
+
+
+def validate_many(model: type[Model], data: Any) -> list[Model]:
+    """Validate a decoded JSON array into models."""
+    start = perf_counter()
+    items = list_adapter(model).validate_python(data)
+    get_instrumentation().on_validation(
+        model.__name__, len(items), perf_counter() - start
+    )
+    return items
+
+
+def validate_many_json(model: type[Model], raw: bytes | str) -> list[Model]:
+    """Validate a raw JSON array into models without decoding it first."""
+    start = perf_counter()
+    items = list_adapter(model).validate_json(raw)
+    get_instrumentation().on_validation(
+        model.__name__, len(items), perf_counter() - start
+    )
+    return items
+
+
+def validate_dicts(model: type[Model], data: Any) -> list[dict]:
+    """Validate a decoded JSON array into dicts, as dump_many would return."""
+    start = perf_counter()
+    items = dict_list_adapter(model).validate_python(data)
+    get_instrumentation().on_validation(
+        model.__name__, len(items), perf_counter() - start
+    )
+    return items
+
+
+def validate_dicts_json(model: type[Model], raw: bytes | str) -> list[dict]:
+    """Validate a raw JSON array into dicts, as dump_many would return."""
+    start = perf_counter()
+    items = dict_list_adapter(model).validate_json(raw)
+    get_instrumentation().on_validation(
+        model.__name__, len(items), perf_counter() - start
+    )
+    return items
+
+
+def construct_many(model: type[Model], items: Iterable[dict]) -> list[Model]:
+    """
+    Build models from trusted, already-normalized field values. No
+    validation or coercion happens: values must already have the field types.
+    """
+    return [model.model_construct(**item) for item in items]
+
+
+def dump_many(model: type[Model], items: list[Model]) -> list[dict]:
+    """Dump a list of models to dicts in one call."""
+    return list_adapter(model).dump_python(items)
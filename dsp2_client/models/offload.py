@@ -0,0 +1,108 @@
+"""
+Validation of large payloads in worker processes.
+
+ProcessValidator ships raw JSON bodies of at least `threshold` bytes to a
+ProcessPoolExecutor, so parsing, pattern checks, datetime parsing and field
+validators run outside the process doing network I/O. Workers send back the
+validated items re-serialized as normalized JSON: a single bytes object that
+crosses the process boundary without per-object pickling. The parent decodes
+it into the dicts validate_dicts_json would return (datetimes, enum members),
+converting types without re-running constraints or validators. Smaller bodies
+are validated in-process, with the same result.
+"""
+
+import multiprocessing
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from time import perf_counter
+
+from dsp2_client.instrumentation import get_instrumentation
+from dsp2_client.models.bulk import Model, dict_list_adapter
+
+DEFAULT_OFFLOAD_THRESHOLD = 256 * 1024
+
+
+def normalize(model: type[Model], raw: bytes | str) -> bytes:
+    """Validate a raw JSON array and serialize it back. Runs in workers."""
+    adapter = dict_list_adapter(model)
+    return adapter.dump_json(adapter.validate_json(raw))
+
+
+def _mp_context():
+    # Clients run thread pools: forking the process could copy a held lock.
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+class ProcessValidator:
+    """
+    Validates large JSON arrays in worker processes. One validator can serve
+    many clients; the pool is started on first offload and stopped by
+    close(). An injected executor is left running.
+    """
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        threshold: int = DEFAULT_OFFLOAD_THRESHOLD,
+        executor: Executor | None = None,
+    ):
+        if threshold < 0:
+            raise ValueError("threshold must not be negative")
+        self.max_workers = max_workers
+        self.threshold = threshold
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "ProcessValidator":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            executor, self._executor = self._executor, None
+        if executor is not None and self._owns_executor:
+            executor.shutdown()
+
+    def offloads(self, raw: bytes | str) -> bool:
+        return len(raw) >= self.threshold
+
+    def submit(self, model: type[Model], raw: bytes | str) -> Future:
+        """Normalize in a worker; the future holds the normalized JSON."""
+        return self._pool().submit(normalize, model, raw)
+
+    def validate_dicts(self, model: type[Model], raw: bytes | str) -> list[dict]:
+        """
+        Validate a raw JSON array into dicts, as validate_dicts_json(model, raw)
+        would return them.
+        """
+        start = perf_counter()
+        if self.offloads(raw):
+            normalized = self.submit(model, raw).result()
+        else:
+            normalized = normalize(model, raw)
+        return self._decode(model, normalized, start)
+
+    def _pool(self) -> Executor:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("ProcessValidator is closed")
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=_mp_context()
+                )
+            return self._executor
+
+    def _decode(self, model: type[Model], normalized: bytes, start: float) -> list:
+        items = dict_list_adapter(model, trusted=True).validate_json(normalized)
+        # Includes the round trip to the worker.
+        get_instrumentation().on_validation(
+            model.__name__, len(items), perf_counter() - start
+        )
+        return items
@@ -0,0 +1,314 @@
+"""
+Columnar container for large transaction histories.
+
+Each field is held in a typed array (ids and labels in plain lists), which
+costs a few dozen bytes per row instead of a pydantic object per row.
+Timestamps are stored as microseconds since the epoch (UTC). When NumPy is
+installed the aggregation helpers run vectorized over zero-copy views of the
+arrays; otherwise they fall back to plain Python.
+"""
+
+from array import array
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterable, Iterator
+
+from dsp2_client.models.bulk import validate_many, validate_many_json
+from dsp2_client.models.transaction import (
+    TransactionCreditDebitIndicator,
+    TransactionSchema,
+    TransactionStatus,
+)
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised by forcing np to None
+    np = None
+
+STATUSES = tuple(TransactionStatus)
+STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+CREDIT, DEBIT = 1, -1
+NULL_TIMESTAMP = -(2**63)
+NO_CURRENCY = 0
+
+NUMERIC_COLUMNS = (
+    "amounts",
+    "indicators",
+    "statuses",
+    "currencies",
+    "operated_at",
+    "processed_at",
+)
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+MICROS_PER_DAY = 86_400_000_000
+
+
+def _to_micros(value: datetime | None) -> int:
+    if value is None:
+        return NULL_TIMESTAMP
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - EPOCH) // timedelta(microseconds=1)
+
+
+def _from_micros(value: int) -> datetime | None:
+    if value == NULL_TIMESTAMP:
+        return None
+    return EPOCH + timedelta(microseconds=value)
+
+
+class TransactionBatch:
+    """
+    Transactions stored column by column.
+
+    Rows are appended from models or validated API pages. Indexing a batch
+    returns a TransactionSchema view built on demand.
+    """
+
+    def __init__(self):
+        self.ids: list[str] = []
+        self.labels: list[str] = []
+        self.amounts = array("q")
+        self.indicators = array("b")
+        self.statuses = array("B")
+        # Currency codes are interned: 0 stands for no currency.
+        self.currencies = array("H")
+        self.currency_codes: list[str | None] = [None]
+        self._currency_index: dict[str | None, int] = {None: NO_CURRENCY}
+        self.operated_at = array("q")
+        self.processed_at = array("q")
+
+    def __len__(self) -> int:
+        return len(self.amounts)
+
+    def __getitem__(self, index: int) -> TransactionSchema:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("TransactionBatch index out of range")
+        return TransactionSchema.model_construct(
+            id=self.ids[index],
+            label=self.labels[index],
+            amount=self.amounts[index],
+            crdt_dbit_indicator=(
+                TransactionCreditDebitIndicator.CRDT
+                if self.indicators[index] == CREDIT
+                else TransactionCreditDebitIndicator.DBIT
+            ),
+            status=STATUSES[self.statuses[index]],
+            currency=self.currency_codes[self.currencies[index]],
+            date_operation=_from_micros(self.operated_at[index]),
+            date_processed=_from_micros(self.processed_at[index]),
+        )
+
+    def __iter__(self) -> Iterator[TransactionSchema]:
+        for index in range(len(self)):
+            yield self[index]
+
+    @classmethod
+    def from_models(
+        cls, transactions: Iterable[TransactionSchema]
+    ) -> "TransactionBatch":
+        """
+        Build a batch from models, e.g. DSP2Client.iter_transactions(), which
+        keeps memory flat while a full history is loaded.
+        """
+        batch = cls()
+        batch.extend(transactions)
+        return batch
+
+    @classmethod
+    def from_pages(cls, pages: Iterable[bytes | str | list]) -> "TransactionBatch":
+        """
+        Build a batch from API transaction pages, given as raw JSON bodies or
+        decoded lists. Each page is validated in one call.
+        """
+        batch = cls()
+        for page in pages:
+            batch.extend_page(page)
+        return batch
+
+    def append(self, transaction: TransactionSchema):
+        currency_code = self._currency_index.get(transaction.currency)
+        if currency_code is None:
+            currency_code = len(self.currency_codes)
+            self.currency_codes.append(transaction.currency)
+            self._currency_index[transaction.currency] = currency_code
+
+        self.ids.append(transaction.id)
+        self.labels.append(transaction.label)
+        self.amounts.append(transaction.amount)
+        self.indicators.append(
+            CREDIT
+            if transaction.crdt_dbit_indicator == TransactionCreditDebitIndicator.CRDT
+            else DEBIT
+        )
+        self.statuses.append(STATUS_CODES[TransactionStatus(transaction.status)])
+        self.currencies.append(currency_code)
+        self.operated_at.append(_to_micros(transaction.date_operation))
+        self.processed_at.append(_to_micros(transaction.date_processed))
+
+    def extend(self, transactions: Iterable[TransactionSchema]):
+        for transaction in transactions:
+            self.append(transaction)
+
+    def extend_page(self, page: bytes | str | list):
+        if isinstance(page, (bytes, str)):
+            self.extend(validate_many_json(TransactionSchema, page))
+        else:
+            self.extend(validate_many(TransactionSchema, page))
+
+    def to_numpy(self) -> dict:
+        """
+        Zero-copy NumPy views of the numeric columns.
+        """
+        if np is None:
+            raise ImportError("NumPy is required for TransactionBatch.to_numpy()")
+        return {
+            name: np.frombuffer(getattr(self, name), dtype=getattr(self, name).typecode)
+            for name in NUMERIC_COLUMNS
+        }
+
+    def signed_amounts(self):
+        """
+        Amounts with debits negated, as a NumPy array when available.
+        """
+        if np is not None:
+            columns = self.to_numpy()
+            return columns["amounts"] * columns["indicators"]
+        return array("q", (a * i for a, i in zip(self.amounts, self.indicators)))
+
+    def signed_sum(self) -> int:
+        """Net movement of the batch: credits minus debits."""
+        signed = self.signed_amounts()
+        return int(signed.sum()) if np is not None else sum(signed)
+
+    def filter(
+        self,
+        status: TransactionStatus | Iterable[TransactionStatus] | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        currency: str | None = None,
+        indicator: TransactionCreditDebitIndicator | None = None,
+    ) -> "TransactionBatch":
+        """
+        Rows matching every given criterion, as a new batch. The date range
+        applies to date_operation and is half-open: start <= date < end.
+        """
+        if status is None:
+            status_codes = None
+        elif isinstance(status, (str, TransactionStatus)):
+            status_codes = {STATUS_CODES[TransactionStatus(status)]}
+        else:
+            status_codes = {STATUS_CODES[TransactionStatus(s)] for s in status}
+        currency_code = (
+            self._currency_index.get(currency, -1) if currency is not None else None
+        )
+        indicator_code = None
+        if indicator is not None:
+            indicator_code = (
+                CREDIT
+                if TransactionCreditDebitIndicator(indicator)
+                == TransactionCreditDebitIndicator.CRDT
+                else DEBIT
+            )
+        start_us = _to_micros(start) if start is not None else None
+        end_us = _to_micros(end) if end is not None else None
+
+        if np is not None:
+            columns = self.to_numpy()
+            mask = np.ones(len(self), dtype=bool)
+            if status_codes is not None:
+                mask &= np.isin(columns["statuses"], list(status_codes))
+            if currency_code is not None:
+                mask &= columns["currencies"] == currency_code
+            if indicator_code is not None:
+                mask &= columns["indicators"] == indicator_code
+            if start_us is not None:
+                mask &= columns["operated_at"] >= start_us
+            if end_us is not None:
+                mask &= columns["operated_at"] < end_us
+            rows = np.flatnonzero(mask)
+        else:
+            rows = [
+                row
+                for row in range(len(self))
+                if (status_codes is None or self.statuses[row] in status_codes)
+                and (currency_code is None or self.currencies[row] == currency_code)
+                and (indicator_code is None or self.indicators[row] == indicator_code)
+                and (start_us is None or self.operated_at[row] >= start_us)
+                and (end_us is None or self.operated_at[row] < end_us)
+            ]
+        return self.take(rows)
+
+    def take(self, rows: Iterable[int]) -> "TransactionBatch":
+        """
+        A new batch made of the given row positions. With NumPy, numeric
+        columns are gathered by fancy indexing of their views.
+        """
+        if np is not None:
+            rows = np.asarray(
+                rows if isinstance(rows, np.ndarray) else list(rows), dtype=np.intp
+            )
+            positions = rows.tolist()
+        else:
+            rows = positions = list(rows)
+        batch = TransactionBatch()
+        batch.currency_codes = list(self.currency_codes)
+        batch._currency_index = dict(self._currency_index)
+        batch.ids = [self.ids[row] for row in positions]
+        batch.labels = [self.labels[row] for row in positions]
+        columns = self.to_numpy() if np is not None else None
+        for name in NUMERIC_COLUMNS:
+            column = array(getattr(self, name).typecode)
+            if columns is not None:
+                column.frombytes(columns[name][rows].tobytes())
+            else:
+                source = getattr(self, name)
+                column.extend(source[row] for row in rows)
+            setattr(batch, name, column)
+        return batch
+
+    def group_sum(self, by: str = "currency") -> dict:
+        """
+        Signed amount totals grouped by "currency", "status", "indicator" or
+        "day" (the UTC date of date_operation).
+        """
+        if by == "currency":
+            keys, labels = self.currencies, self.currency_codes
+        elif by == "status":
+            keys, labels = self.statuses, STATUSES
+        elif by == "indicator":
+            keys = self.indicators
+            labels = {
+                CREDIT: TransactionCreditDebitIndicator.CRDT,
+                DEBIT: TransactionCreditDebitIndicator.DBIT,
+            }
+        elif by == "day":
+            keys, labels = None, None
+        else:
+            raise ValueError(f"Cannot group transactions by {by!r}")
+
+        signed = self.signed_amounts()
+        if np is not None:
+            if keys is None:
+                key_values = self.to_numpy()["operated_at"] // MICROS_PER_DAY
+            else:
+                key_values = np.frombuffer(keys, dtype=keys.typecode)
+            unique, inverse = np.unique(key_values, return_inverse=True)
+            totals = np.zeros(len(unique), dtype=np.int64)
+            np.add.at(totals, inverse, signed)
+            groups = dict(zip(unique.tolist(), totals.tolist()))
+        else:
+            if keys is None:
+                keys = [value // MICROS_PER_DAY for value in self.operated_at]
+            groups = {}
+            for key, amount in zip(keys, signed):
+                groups[key] = groups.get(key, 0) + amount
+
+        if labels is None:
+            return {
+                date(1970, 1, 1) + timedelta(days=day): total
+                for day, total in groups.items()
+            }
+        return {labels[key]: total for key, total in groups.items()}
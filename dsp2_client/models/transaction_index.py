@@ -0,0 +1,370 @@
+"""
+In-memory indexes over a TransactionBatch.
+
+TransactionIndex keeps transactions in a columnar batch and maintains, as
+rows are inserted:
+
+- sorted indexes on date_operation and amount, for range queries by binary
+  search. New rows are merged into them on the next query.
+- bitmaps on status, credit/debit indicator and currency, one byte per row
+  so that they are built from the columns with bytes.translate() and
+  combined as Python integers.
+- an inverted index from lower-cased label words to the rows holding them.
+
+A query starts from the most selective indexed criterion, or from the
+intersection of the bitmaps, and checks the other criteria row by row
+against the columns, so its cost follows the size of the smallest candidate
+set rather than the number of rows. A transaction inserted again (same id)
+replaces its previous row.
+"""
+
+import re
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Callable, Iterable
+
+from dsp2_client.models.bulk import validate_many, validate_many_json
+from dsp2_client.models.transaction import (
+    TransactionCreditDebitIndicator,
+    TransactionSchema,
+    TransactionStatus,
+)
+from dsp2_client.models.transaction_batch import (
+    CREDIT,
+    DEBIT,
+    STATUS_CODES,
+    TransactionBatch,
+    _to_micros,
+)
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised by forcing np to None
+    np = None
+
+_WORD = re.compile(r"\w+")
+_SET_BYTE = re.compile(rb"[^\x00]")
+# _MATCH[value]: bytes.translate() table turning `value` into 1, others into 0.
+_MATCH = [bytes(int(byte == value) for byte in range(256)) for value in range(256)]
+
+
+def tokenize(text: str) -> set[str]:
+    """The lower-cased words of a label."""
+    return set(_WORD.findall(text.lower()))
+
+
+def _sort(keys: array, rows: array | range) -> tuple[array, array]:
+    """Keys in ascending order with their rows."""
+    if np is not None:
+        key_values = np.frombuffer(keys, dtype=np.int64)
+        order = np.argsort(key_values)
+        if isinstance(rows, range):
+            row_values = np.arange(rows.start, rows.stop, dtype=np.int64)
+        else:
+            row_values = np.frombuffer(rows, dtype=np.int64)
+        sorted_keys, sorted_rows = array("q"), array("q")
+        sorted_keys.frombytes(key_values[order].tobytes())
+        sorted_rows.frombytes(row_values[order].tobytes())
+        return sorted_keys, sorted_rows
+    order = sorted(range(len(keys)), key=keys.__getitem__)
+    return array("q", [keys[i] for i in order]), array("q", [rows[i] for i in order])
+
+
+class SortedIndex:
+    """
+    Row positions ordered by an integer key. Rows are added in increasing
+    order and merged into the index when it is next read.
+    """
+
+    def __init__(self):
+        self.keys = array("q")
+        self.rows = array("q")
+        self._pending = array("q")
+
+    def extend(self, keys: Iterable[int]):
+        """Keys of the next rows, starting at row len(self)."""
+        self._pending.extend(keys)
+
+    def __len__(self) -> int:
+        return len(self.keys) + len(self._pending)
+
+    def _merge(self):
+        pending = self._pending
+        if not pending:
+            return
+        self._pending = array("q")
+        first = len(self.keys)
+        keys, rows = _sort(pending, range(first, first + len(pending)))
+        if not self.keys or keys[0] >= self.keys[-1]:
+            # New rows all sort last, e.g. a history loaded oldest first.
+            self.keys += keys
+            self.rows += rows
+        elif len(keys) > len(self.keys) // 16:
+            self.keys, self.rows = _sort(self.keys + keys, self.rows + rows)
+        else:
+            merged_keys, merged_rows = array("q"), array("q")
+            previous = 0
+            for key, row in zip(keys, rows):
+                position = bisect_right(self.keys, key, previous)
+                merged_keys += self.keys[previous:position]
+                merged_rows += self.rows[previous:position]
+                merged_keys.append(key)
+                merged_rows.append(row)
+                previous = position
+            self.keys = merged_keys + self.keys[previous:]
+            self.rows = merged_rows + self.rows[previous:]
+
+    def bounds(self, low: int | None, high: int | None) -> slice:
+        """Positions in `rows` of the rows with low <= key < high."""
+        self._merge()
+        start = 0 if low is None else bisect_left(self.keys, low)
+        stop = len(self.keys) if high is None else bisect_left(self.keys, high)
+        return slice(start, max(start, stop))
+
+
+class Bitmap:
+    """The rows holding one value of a column, one byte per row."""
+
+    def __init__(self):
+        self.bytes = bytearray()
+        self.count = 0
+        self._value: int | None = None
+
+    def extend(self, start: int, mask: bytes):
+        """Set the rows from `start` on to `mask`, a 0 or 1 byte per row."""
+        self.bytes.extend(bytes(start - len(self.bytes)))
+        self.bytes.extend(mask)
+        self.count += mask.count(1)
+        self._value = None
+
+    def __int__(self) -> int:
+        if self._value is None:
+            self._value = int.from_bytes(self.bytes, "little")
+        return self._value
+
+
+def _masks(column: array, start: int) -> dict[int, bytes]:
+    """One byte per row from `start`: 1 where the column holds each code."""
+    raw = column[start:].tobytes()
+    size = column.itemsize
+    masks = {}
+    for code in set(column[start:]):
+        value = code.to_bytes(size, sys.byteorder, signed=column.typecode.islower())
+        mask = -1
+        for offset in range(size):
+            part = raw[offset::size].translate(_MATCH[value[offset]])
+            mask &= int.from_bytes(part, "little")
+        masks[code] = mask.to_bytes(len(column) - start, "little")
+    return masks
+
+
+def bitmap_rows(bitmap: int) -> list[int]:
+    """Rows of a one-byte-per-row bitmap, in ascending order."""
+    data = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little")
+    if np is not None:
+        return np.flatnonzero(np.frombuffer(data, dtype=np.uint8)).tolist()
+    return [match.start() for match in _SET_BYTE.finditer(data)]
+
+
+class TransactionIndex:
+    """
+    Transactions queryable by date and amount range, status, indicator,
+    currency and label words. Rows are inserted from models or API pages.
+    """
+
+    def __init__(self, transactions: Iterable[TransactionSchema] = ()):
+        self.batch = TransactionBatch()
+        self.by_date = SortedIndex()
+        self.by_amount = SortedIndex()
+        self.statuses: dict[int, Bitmap] = {}
+        self.indicators: dict[int, Bitmap] = {}
+        self.currencies: dict[int, Bitmap] = {}
+        self.words: dict[str, array] = {}
+        # 1 for the current row of each transaction, 0 for replaced rows.
+        self.current = bytearray()
+        self._rows_by_id: dict[str, int] = {}
+        self.extend(transactions)
+
+    def __len__(self) -> int:
+        return len(self._rows_by_id)
+
+    def __contains__(self, transaction_id: str) -> bool:
+        return transaction_id in self._rows_by_id
+
+    def get(self, transaction_id: str) -> TransactionSchema | None:
+        row = self._rows_by_id.get(transaction_id)
+        return None if row is None else self.batch[row]
+
+    def add(self, transaction: TransactionSchema):
+        self.extend([transaction])
+
+    def extend(self, transactions: Iterable[TransactionSchema]):
+        batch = self.batch
+        start = len(batch)
+        batch.extend(transactions)
+        if len(batch) == start:
+            return
+
+        self.current.extend(bytes([1]) * (len(batch) - start))
+        rows_by_id = self._rows_by_id
+        for row, transaction_id in enumerate(batch.ids[start:], start):
+            previous = rows_by_id.get(transaction_id)
+            if previous is not None:
+                self.current[previous] = 0
+            rows_by_id[transaction_id] = row
+
+        self.by_date.extend(batch.operated_at[start:])
+        self.by_amount.extend(batch.amounts[start:])
+        for bitmaps, column in (
+            (self.statuses, batch.statuses),
+            (self.indicators, batch.indicators),
+            (self.currencies, batch.currencies),
+        ):
+            for code, mask in _masks(column, start).items():
+                bitmaps.setdefault(code, Bitmap()).extend(start, mask)
+
+        words = self.words
+        for row, label in enumerate(batch.labels[start:], start):
+            for word in tokenize(label):
+                postings = words.get(word)
+                if postings is None:
+                    postings = words[word] = array("I")
+                postings.append(row)
+
+    def extend_page(self, page: bytes | str | list):
+        """Insert a page of the API, as a raw JSON body or a decoded list."""
+        if isinstance(page, (bytes, str)):
+            self.extend(validate_many_json(TransactionSchema, page))
+        else:
+            self.extend(validate_many(TransactionSchema, page))
+
+    def query(self, **criteria) -> TransactionBatch:
+        """The matching transactions as a batch; see rows() for criteria."""
+        return self.batch.take(self.rows(**criteria))
+
+    def rows(
+        self,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        status: TransactionStatus | Iterable[TransactionStatus] | None = None,
+        indicator: TransactionCreditDebitIndicator | None = None,
+        currency: str | None = None,
+        min_amount: int | None = None,
+        max_amount: int | None = None,
+        text: str | None = None,
+    ) -> list[int]:
+        """
+        Batch positions of the current transactions matching every given
+        criterion, in insertion order. The date range applies to
+        date_operation and is half-open, start <= date < end; the amount
+        range is inclusive. `text` matches labels holding all of its words,
+        case-insensitively.
+        """
+        batch = self.batch
+        # Candidate sets as (estimated size, rows producer, criteria the rows
+        # satisfy). Bitmap candidates are exact: current rows, in order.
+        candidates: list[tuple[int, Callable[[], Iterable[int]], list]] = []
+        checks: list[Callable[[int], bool]] = []
+
+        bitmap_terms, bitmap_checks = [], []
+        if status is not None:
+            if isinstance(status, (str, TransactionStatus)):
+                status = [status]
+            codes = {STATUS_CODES[TransactionStatus(s)] for s in status}
+            statuses = batch.statuses
+            bitmap_terms.append([self.statuses.get(code) for code in codes])
+            bitmap_checks.append(lambda row: statuses[row] in codes)
+        if indicator is not None:
+            indicator_code = (
+                CREDIT
+                if TransactionCreditDebitIndicator(indicator)
+                == TransactionCreditDebitIndicator.CRDT
+                else DEBIT
+            )
+            indicators = batch.indicators
+            bitmap_terms.append([self.indicators.get(indicator_code)])
+            bitmap_checks.append(lambda row: indicators[row] == indicator_code)
+        if currency is not None:
+            currency_code = batch._currency_index.get(currency, -1)
+            currencies = batch.currencies
+            bitmap_terms.append([self.currencies.get(currency_code)])
+            bitmap_checks.append(lambda row: currencies[row] == currency_code)
+        if bitmap_terms:
+            terms = [[bitmap for bitmap in term if bitmap] for term in bitmap_terms]
+
+            def intersect() -> list[int]:
+                matching = int.from_bytes(self.current, "little")
+                for term in terms:
+                    union = 0
+                    for bitmap in term:
+                        union |= int(bitmap)
+                    matching &= union
+                return bitmap_rows(matching)
+
+            size = min(sum(bitmap.count for bitmap in term) for term in terms)
+            candidates.append((size, intersect, bitmap_checks))
+            checks.extend(bitmap_checks)
+
+        for index, low, high, column in (
+            (
+                self.by_date,
+                None if start is None else _to_micros(start),
+                None if end is None else _to_micros(end),
+                batch.operated_at,
+            ),
+            (
+                self.by_amount,
+                min_amount,
+                None if max_amount is None else max_amount + 1,
+                batch.amounts,
+            ),
+        ):
+            if low is None and high is None:
+                continue
+
+            def in_range(row, column=column, low=low, high=high) -> bool:
+                value = column[row]
+                return (low is None or value >= low) and (high is None or value < high)
+
+            bounds = index.bounds(low, high)
+            candidates.append(
+                (
+                    bounds.stop - bounds.start,
+                    lambda rows=index.rows, bounds=bounds: rows[bounds],
+                    [in_range],
+                )
+            )
+            checks.append(in_range)
+
+        words = tokenize(text) if text is not None else None
+        if words:
+            labels = batch.labels
+            shortest = min(
+                (self.words.get(word, array("I")) for word in words), key=len
+            )
+
+            def has_words(row) -> bool:
+                return words <= tokenize(labels[row])
+
+            # The postings of one word satisfy the criterion for that word only.
+            covered = [has_words] if len(words) == 1 else []
+            candidates.append((len(shortest), lambda: shortest, covered))
+            checks.append(has_words)
+
+        current = self.current
+        if not candidates:
+            return bitmap_rows(int.from_bytes(current, "little"))
+        _, produce, covered = min(candidates, key=lambda candidate: candidate[0])
+        remaining = [check for check in checks if check not in covered]
+        if covered is bitmap_checks:
+            rows = produce()
+            if not remaining:
+                return rows
+            return [row for row in rows if all(check(row) for check in remaining)]
+        return sorted(
+            row
+            for row in produce()
+            if current[row] and all(check(row) for check in remaining)
+        )
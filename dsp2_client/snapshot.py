@@ -0,0 +1,567 @@
+"""
+Compact binary snapshots of get_full_user_data results.
+
+A snapshot holds four tables (identity, accounts, balances, transactions),
+stored column by column with a layout derived from the pydantic models:
+integers and datetimes as int64 (microseconds since the epoch, UTC), dates
+as day ordinals, enums and literals as one-byte codes into the options listed
+in the column header, strings as end offsets plus one UTF-8 blob. Nullable
+columns carry a validity byte per row. Every column records its name, kind
+and options, so a reader matches columns to model fields by name: columns it
+does not know are skipped, and fields missing from an older snapshot take
+their default. The header carries a format version.
+
+Column data is 8-byte aligned and little-endian, so a snapshot opened with
+Snapshot.open() is memory-mapped: numeric columns are read in place and only
+the rows asked for are decoded. Rows load back into models with
+construct_many, without validation.
+"""
+
+import mmap
+import os
+import struct
+import sys
+import traceback
+import types
+from array import array
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from enum import Enum
+from functools import lru_cache
+from itertools import accumulate
+from pathlib import Path
+from typing import Annotated, BinaryIO, Iterator, Literal, Union, get_args, get_origin
+
+from pydantic import BaseModel
+
+from .models.account import AccountSchema
+from .models.balance import BalanceSchema
+from .models.bulk import construct_many
+from .models.identity import UserIdentitySchema
+from .models.transaction import TransactionSchema
+
+MAGIC = b"DSP2SNAP"
+SNAPSHOT_VERSION = 1
+_HEADER = struct.Struct("<8sHH")
+_TABLE_HEADER = struct.Struct("<IH")
+_COLUMN_HEADER = struct.Struct("<BBH")
+
+FLAG_IDENTITY = 1
+
+KIND_INT = 1
+KIND_STR = 2
+KIND_DATETIME = 3
+KIND_DATE = 4
+KIND_ENUM = 5
+_TYPECODES = {KIND_INT: "q", KIND_DATETIME: "q", KIND_DATE: "i", KIND_ENUM: "B"}
+
+# Row index of the owning account, in the balances and transactions tables.
+OWNER_COLUMN = "_account"
+# Which sections an account carried: SECTION_BALANCES | SECTION_TRANSACTIONS.
+SECTIONS_COLUMN = "_sections"
+SECTION_BALANCES = 1
+SECTION_TRANSACTIONS = 2
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+MICROSECOND = timedelta(microseconds=1)
+
+
+class SnapshotError(ValueError):
+    """The data cannot be written to, or read from, a snapshot."""
+
+
+@dataclass(frozen=True)
+class Column:
+    name: str
+    kind: int
+    nullable: bool = False
+    options: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class AccountSnapshot:
+    account: AccountSchema
+    balances: list[BalanceSchema] | None
+    transactions: list[TransactionSchema] | None
+
+
+def _column(name: str, annotation) -> Column:
+    nullable = False
+    if get_origin(annotation) in (Union, types.UnionType):
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        nullable = len(args) < len(get_args(annotation))
+        if len(args) != 1:
+            raise SnapshotError(f"Unsupported union for field {name!r}")
+        annotation = args[0]
+    if get_origin(annotation) is Annotated:
+        annotation = get_args(annotation)[0]
+    if get_origin(annotation) is Literal:
+        return Column(name, KIND_ENUM, nullable, tuple(get_args(annotation)))
+    if isinstance(annotation, type):
+        if issubclass(annotation, Enum):
+            options = tuple(member.value for member in annotation)
+            return Column(name, KIND_ENUM, nullable, options)
+        # datetime derives from date: test it first.
+        for kind, base in (
+            (KIND_DATETIME, datetime),
+            (KIND_DATE, date),
+            (KIND_INT, int),
+            (KIND_STR, str),
+        ):
+            if issubclass(annotation, base):
+                return Column(name, kind, nullable)
+    raise SnapshotError(f"Unsupported type for field {name!r}: {annotation!r}")
+
+
+@lru_cache(maxsize=None)
+def schema(model: type[BaseModel]) -> tuple[Column, ...]:
+    """The snapshot columns of a model, in field order."""
+    return tuple(
+        _column(name, field.annotation) for name, field in model.model_fields.items()
+    )
+
+
+def _micros(value: datetime | str | None) -> int:
+    if value is None:
+        return 0
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - EPOCH) // MICROSECOND
+
+
+def _ordinal(value: date | str | None) -> int:
+    if value is None:
+        return 0
+    if isinstance(value, str):
+        value = date.fromisoformat(value)
+    return value.toordinal()
+
+
+def _little_endian(values: array) -> bytes:
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _align(out: bytearray):
+    out += bytes(-len(out) % 8)
+
+
+def _field(row, name: str):
+    return row.get(name) if isinstance(row, dict) else getattr(row, name, None)
+
+
+def _write_column(out: bytearray, column: Column, values: list):
+    name = column.name.encode()
+    out += bytes([len(name)]) + name
+    out += _COLUMN_HEADER.pack(column.kind, column.nullable, len(column.options))
+    for option in column.options:
+        encoded = option.encode()
+        out += bytes([len(encoded)]) + encoded
+    _align(out)
+    if column.nullable:
+        out += bytes(value is not None for value in values)
+        _align(out)
+    elif None in values:
+        raise SnapshotError(f"Column {column.name!r} is not nullable")
+
+    if column.kind == KIND_STR:
+        blobs = [b"" if value is None else str(value).encode() for value in values]
+        out += _little_endian(array("q", accumulate(map(len, blobs))))
+        out += b"".join(blobs)
+    else:
+        if column.kind == KIND_INT:
+            codes = [0 if value is None else int(value) for value in values]
+        elif column.kind == KIND_DATETIME:
+            codes = [_micros(value) for value in values]
+        elif column.kind == KIND_DATE:
+            codes = [_ordinal(value) for value in values]
+        else:
+            index = {option: code for code, option in enumerate(column.options)}
+            try:
+                codes = [
+                    0 if value is None else index[getattr(value, "value", value)]
+                    for value in values
+                ]
+            except KeyError as e:
+                raise SnapshotError(
+                    f"Unknown value {e.args[0]!r} for column {column.name!r}"
+                ) from None
+        out += _little_endian(array(_TYPECODES[column.kind], codes))
+    _align(out)
+
+
+def _write_table(out: bytearray, model, rows: list, extra: dict | None = None):
+    columns = schema(model)
+    extra = extra or {}
+    out += _TABLE_HEADER.pack(len(rows), len(columns) + len(extra))
+    for column in columns:
+        _write_column(out, column, [_field(row, column.name) for row in rows])
+    for name, values in extra.items():
+        _write_column(out, Column(name, KIND_INT), values)
+
+
+def dumps_snapshot(data: dict) -> bytes:
+    """
+    Encode a get_full_user_data result: dicts as dumped by the client (with
+    or without validation) or models. Partial-mode errors are not kept.
+    """
+    accounts = data.get("accounts") or []
+    balances, balance_owners = [], []
+    transactions, transaction_owners = [], []
+    sections = []
+    for index, account in enumerate(accounts):
+        flags = 0
+        for key, flag, rows, owners in (
+            ("balances", SECTION_BALANCES, balances, balance_owners),
+            ("transactions", SECTION_TRANSACTIONS, transactions, transaction_owners),
+        ):
+            items = _field(account, key)
+            if items is not None:
+                flags |= flag
+                rows.extend(items)
+                owners.extend([index] * len(items))
+        sections.append(flags)
+
+    identity = data.get("identity")
+    out = bytearray(
+        _HEADER.pack(
+            MAGIC, SNAPSHOT_VERSION, FLAG_IDENTITY if "identity" in data else 0
+        )
+    )
+    _align(out)
+    _write_table(out, UserIdentitySchema, [] if identity is None else [identity])
+    _write_table(out, AccountSchema, accounts, {SECTIONS_COLUMN: sections})
+    _write_table(out, BalanceSchema, balances, {OWNER_COLUMN: balance_owners})
+    _write_table(
+        out, TransactionSchema, transactions, {OWNER_COLUMN: transaction_owners}
+    )
+    return bytes(out)
+
+
+def write_snapshot(data: dict, target: str | os.PathLike | BinaryIO):
+    """Write a snapshot to a path, atomically, or to a binary file object."""
+    encoded = dumps_snapshot(data)
+    if hasattr(target, "write"):
+        target.write(encoded)
+        return
+    path = Path(target)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(encoded)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _aligned(offset: int) -> int:
+    return offset + (-offset % 8)
+
+
+def _cast(view: memoryview, typecode: str):
+    if sys.byteorder == "big":
+        values = array(typecode, view.tobytes())
+        values.byteswap()
+        return values
+    return view.cast(typecode)
+
+
+class _StoredColumn:
+    def __init__(self, view: memoryview, offset: int, rows: int):
+        (length,) = view[offset : offset + 1]
+        offset += 1
+        name = str(view[offset : offset + length], "utf-8")
+        offset += length
+        kind, nullable, option_count = _COLUMN_HEADER.unpack_from(view, offset)
+        offset += _COLUMN_HEADER.size
+        options = []
+        for _ in range(option_count):
+            (length,) = view[offset : offset + 1]
+            options.append(str(view[offset + 1 : offset + 1 + length], "utf-8"))
+            offset += 1 + length
+        self.column = Column(name, kind, bool(nullable), tuple(options))
+        offset = _aligned(offset)
+
+        self.valid = None
+        if nullable:
+            self.valid = view[offset : offset + rows]
+            offset = _aligned(offset + rows)
+        if kind == KIND_STR:
+            self.ends = _cast(view[offset : offset + 8 * rows], "q")
+            offset += 8 * rows
+            size = self.ends[-1] if rows else 0
+            self.data = view[offset : offset + size]
+            offset += size
+        elif kind in _TYPECODES:
+            width = struct.calcsize(_TYPECODES[kind])
+            self.data = _cast(view[offset : offset + width * rows], _TYPECODES[kind])
+            offset += width * rows
+        else:
+            raise SnapshotError(f"Unknown kind {kind} of column {name!r}")
+        self.end = _aligned(offset)
+
+    def values(self, start: int, stop: int, decode) -> list:
+        kind = self.column.kind
+        if kind == KIND_STR:
+            values = self._strings(start, stop)
+        elif kind == KIND_DATETIME:
+            values = [EPOCH + MICROSECOND * v for v in self.data[start:stop]]
+        elif kind == KIND_DATE:
+            values = [date.fromordinal(v) if v else None for v in self.data[start:stop]]
+        elif kind == KIND_ENUM:
+            values = [decode[v] for v in self.data[start:stop]]
+        else:
+            values = self.data[start:stop].tolist()
+        if self.valid is not None:
+            values = [
+                value if valid else None
+                for value, valid in zip(values, self.valid[start:stop])
+            ]
+        return values
+
+    def _strings(self, start: int, stop: int) -> list[str]:
+        base = self.ends[start - 1] if start else 0
+        ends = [end - base for end in self.ends[start:stop]]
+        raw = self.data[base : base + (ends[-1] if ends else 0)]
+        starts = [0, *ends[:-1]]
+        text = str(raw, "utf-8")
+        if len(text) == len(raw):
+            # ASCII only: byte offsets are character offsets.
+            return [text[first:end] for first, end in zip(starts, ends)]
+        return [str(raw[first:end], "utf-8") for first, end in zip(starts, ends)]
+
+
+class _Table:
+    def __init__(self, model: type[BaseModel], view: memoryview, offset: int):
+        self.model = model
+        self.rows, count = _TABLE_HEADER.unpack_from(view, offset)
+        offset += _TABLE_HEADER.size
+        self.columns: dict[str, _StoredColumn] = {}
+        for _ in range(count):
+            stored = _StoredColumn(view, offset, self.rows)
+            self.columns[stored.column.name] = stored
+            offset = stored.end
+        self.end = offset
+        self._decoders = {}
+        for name, field in model.model_fields.items():
+            stored = self.columns.get(name)
+            if stored is None:
+                if field.is_required():
+                    raise SnapshotError(
+                        f"Snapshot lacks required field {model.__name__}.{name}"
+                    )
+            elif stored.column.kind == KIND_ENUM:
+                self._decoders[name] = self._enum_decoder(name, stored.column)
+
+    def _enum_decoder(self, name: str, column: Column) -> list:
+        current = next(c for c in schema(self.model) if c.name == name)
+        annotation = self.model.model_fields[name].annotation
+        enum = next(
+            (
+                arg
+                for arg in (annotation, *get_args(annotation))
+                if isinstance(arg, type) and issubclass(arg, Enum)
+            ),
+            None,
+        )
+        unknown = set(column.options) - set(current.options)
+        if unknown:
+            raise SnapshotError(
+                f"Unknown values {sorted(unknown)} for {self.model.__name__}.{name}"
+            )
+        if enum is None:
+            return list(column.options)
+        return [enum(option) for option in column.options]
+
+    def ints(self, name: str):
+        return self.columns[name].data
+
+    def dicts(self, start: int = 0, stop: int | None = None) -> list[dict]:
+        stop = self.rows if stop is None else stop
+        names, columns = [], []
+        for name, field in self.model.model_fields.items():
+            names.append(name)
+            stored = self.columns.get(name)
+            if stored is None:
+                columns.append([field.get_default()] * (stop - start))
+            else:
+                columns.append(stored.values(start, stop, self._decoders.get(name)))
+        return [dict(zip(names, row)) for row in zip(*columns)]
+
+    def models(self, start: int = 0, stop: int | None = None) -> list:
+        return _construct(self.model, self.dicts(start, stop))
+
+
+def _construct(model: type[BaseModel], rows: list[dict]) -> list:
+    """
+    construct_many for rows holding every field: sets the instance state
+    directly, as model_construct does, at a fraction of its per-row cost.
+    """
+    if model.__pydantic_post_init__ or model.__private_attributes__:
+        return construct_many(model, rows)
+    fields = set(model.model_fields)
+    new, setattr_ = model.__new__, object.__setattr__
+    models = []
+    for row in rows:
+        instance = new(model)
+        setattr_(instance, "__dict__", row)
+        setattr_(instance, "__pydantic_fields_set__", set(fields))
+        setattr_(instance, "__pydantic_extra__", None)
+        setattr_(instance, "__pydantic_private__", None)
+        models.append(instance)
+    return models
+
+
+def _owner_ranges(owners, accounts: int) -> list[tuple[int, int]]:
+    """Row range of each account; rows are stored grouped by account."""
+    ranges = []
+    row = 0
+    for account in range(accounts):
+        start = row
+        while row < len(owners) and owners[row] == account:
+            row += 1
+        ranges.append((start, row))
+    return ranges
+
+
+class Snapshot:
+    """
+    Reads a snapshot from bytes or, with Snapshot.open(), a memory-mapped
+    file. Accounts are decoded on access.
+    """
+
+    def __init__(self, buffer: bytes | mmap.mmap):
+        self._buffer = buffer
+        view = memoryview(buffer)
+        if len(view) < _HEADER.size:
+            raise SnapshotError("Truncated snapshot")
+        magic, self.version, flags = _HEADER.unpack_from(view, 0)
+        if magic != MAGIC:
+            raise SnapshotError("Not a dsp2client snapshot")
+        if self.version > SNAPSHOT_VERSION:
+            raise SnapshotError(
+                f"Snapshot version {self.version} is newer than this reader "
+                f"(version {SNAPSHOT_VERSION})"
+            )
+        self._has_identity = bool(flags & FLAG_IDENTITY)
+        try:
+            offset = _aligned(_HEADER.size)
+            tables = []
+            for model in (
+                UserIdentitySchema,
+                AccountSchema,
+                BalanceSchema,
+                TransactionSchema,
+            ):
+                table = _Table(model, view, offset)
+                tables.append(table)
+                offset = table.end
+        except SnapshotError:
+            raise
+        except (struct.error, ValueError, IndexError, TypeError) as e:
+            raise SnapshotError(f"Corrupt snapshot: {e}") from e
+        self._identity, self._accounts, self._balances, self._transactions = tables
+        self._sections = self._accounts.ints(SECTIONS_COLUMN)
+        self._balance_ranges = _owner_ranges(
+            self._balances.ints(OWNER_COLUMN), len(self)
+        )
+        self._transaction_ranges = _owner_ranges(
+            self._transactions.ints(OWNER_COLUMN), len(self)
+        )
+
+    @classmethod
+    def open(cls, path: str | os.PathLike) -> "Snapshot":
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if not size:
+                raise SnapshotError("Truncated snapshot")
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return cls(buffer)
+        except BaseException as e:
+            # The failed frames still hold views of the mapping.
+            error = e
+            while error is not None:
+                traceback.clear_frames(error.__traceback__)
+                error = error.__cause__ or error.__context__
+            buffer.close()
+            raise
+
+    def __enter__(self) -> "Snapshot":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Release the file mapping. Models already loaded stay valid."""
+        buffer = self._buffer
+        self._buffer = None
+        self._identity = self._accounts = self._balances = self._transactions = None
+        self._sections = None
+        if isinstance(buffer, mmap.mmap):
+            buffer.close()
+
+    def __len__(self) -> int:
+        return self._accounts.rows
+
+    @property
+    def identity(self) -> UserIdentitySchema | None:
+        if not self._identity.rows:
+            return None
+        return self._identity.models()[0]
+
+    @property
+    def accounts(self) -> list[AccountSchema]:
+        return self._accounts.models()
+
+    def account(self, index: int) -> AccountSnapshot:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Snapshot account index out of range")
+        return AccountSnapshot(
+            self._accounts.models(index, index + 1)[0],
+            self.balances(index),
+            self.transactions(index),
+        )
+
+    def __iter__(self) -> Iterator[AccountSnapshot]:
+        for index in range(len(self)):
+            yield self.account(index)
+
+    def balances(self, index: int) -> list[BalanceSchema] | None:
+        if not self._sections[index] & SECTION_BALANCES:
+            return None
+        return self._balances.models(*self._balance_ranges[index])
+
+    def transactions(self, index: int) -> list[TransactionSchema] | None:
+        if not self._sections[index] & SECTION_TRANSACTIONS:
+            return None
+        return self._transactions.models(*self._transaction_ranges[index])
+
+    def to_dict(self) -> dict:
+        """The snapshot in the shape get_full_user_data returns, as dicts."""
+        data = {}
+        if self._has_identity:
+            identities = self._identity.dicts()
+            data["identity"] = identities[0] if identities else None
+        accounts = self._accounts.dicts()
+        for index, account in enumerate(accounts):
+            if self._sections[index] & SECTION_BALANCES:
+                account["balances"] = self._balances.dicts(*self._balance_ranges[index])
+            if self._sections[index] & SECTION_TRANSACTIONS:
+                account["transactions"] = self._transactions.dicts(
+                    *self._transaction_ranges[index]
+                )
+        data["accounts"] = accounts
+        return data
+
+
+def read_snapshot(path: str | os.PathLike) -> dict:
+    """Load a snapshot file in the shape get_full_user_data returns."""
+    with Snapshot.open(path) as snapshot:
+        return snapshot.to_dict()
@@ -0,0 +1,97 @@
+"""
+Incremental transaction sync from the DSP2 API into a TransactionStore.
+
+Transaction pages are served most recent first. A sync walks pages until it
+reaches transactions older than the account's high-water mark minus an
+overlap window; the overlap re-reads recent transactions so status changes
+such as PDNG -> BOOK are picked up. Repeated syncs therefore cost a handful
+of requests instead of the whole history.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from .. import logger
+from ..api.api_client import DSP2Client
+from .store import HighWaterMark, TransactionStore
+
+DEFAULT_OVERLAP = timedelta(days=7)
+
+
+@dataclass
+class SyncResult:
+    account_id: str
+    pages: int = 0
+    fetched: int = 0
+    inserted: int = 0
+    updated: int = 0
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+class TransactionSync:
+    """
+    Keeps a local copy of account transactions up to date.
+    """
+
+    def __init__(
+        self,
+        client: DSP2Client,
+        store: TransactionStore,
+        page_size: int = 50,
+        overlap: timedelta = DEFAULT_OVERLAP,
+    ):
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+        self.client = client
+        self.store = store
+        self.page_size = page_size
+        self.overlap = overlap
+
+    def sync_account(self, account_id: str) -> SyncResult:
+        result = SyncResult(account_id)
+        mark = self.store.high_water_mark(account_id)
+        cutoff = _as_utc(mark[0]) - self.overlap if mark else None
+        newest: HighWaterMark | None = (_as_utc(mark[0]), mark[1]) if mark else None
+
+        page = 1
+        while True:
+            transactions = self.client.get_transactions(
+                account_id, page=page, count=self.page_size
+            )
+            result.pages += 1
+            result.fetched += len(transactions)
+            inserted, updated = self.store.upsert(account_id, transactions)
+            result.inserted += inserted
+            result.updated += updated
+
+            for txn in transactions:
+                key = (_as_utc(txn.date_operation), txn.id)
+                if newest is None or key > newest:
+                    newest = key
+
+            if len(transactions) < self.page_size:
+                break
+            # Later pages only hold older transactions than this one's oldest.
+            if cutoff is not None and any(
+                _as_utc(txn.date_operation) < cutoff for txn in transactions
+            ):
+                break
+            page += 1
+
+        if newest is not None:
+            self.store.set_high_water_mark(account_id, newest)
+        logger.logger.info(
+            "Synced account %s: %d new, %d updated in %d pages",
+            account_id,
+            result.inserted,
+            result.updated,
+            result.pages,
+        )
+        return result
+
+    def sync_all(self) -> list[SyncResult]:
+        """Sync every account of the client's user."""
+        return [self.sync_account(account.id) for account in self.client.get_accounts()]
@@ -0,0 +1,219 @@
+"""
+SQLite store of synced transactions and per-account sync state.
+"""
+
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Iterable
+
+from dsp2_client.models.bulk import construct_many
+from dsp2_client.models.transaction import (
+    TransactionCreditDebitIndicator,
+    TransactionSchema,
+    TransactionStatus,
+)
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    id TEXT PRIMARY KEY,
+    account_id TEXT NOT NULL,
+    label TEXT NOT NULL,
+    amount INTEGER NOT NULL,
+    crdt_dbit_indicator TEXT NOT NULL,
+    status TEXT NOT NULL,
+    currency TEXT,
+    date_operation INTEGER NOT NULL,
+    date_processed INTEGER,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS transactions_by_account_date
+    ON transactions (account_id, date_operation DESC, id DESC);
+CREATE INDEX IF NOT EXISTS transactions_by_account_status
+    ON transactions (account_id, status);
+CREATE TABLE IF NOT EXISTS sync_state (
+    account_id TEXT PRIMARY KEY,
+    hwm_date_operation INTEGER NOT NULL,
+    hwm_id TEXT NOT NULL,
+    synced_at REAL NOT NULL
+);
+"""
+
+COLUMNS = (
+    "id",
+    "label",
+    "amount",
+    "crdt_dbit_indicator",
+    "status",
+    "currency",
+    "date_operation",
+    "date_processed",
+)
+COLUMN_LIST = ", ".join(COLUMNS)
+
+HighWaterMark = tuple[datetime, str]
+
+
+def to_micros(value: datetime | None) -> int | None:
+    """Datetimes are stored as UTC microseconds; naive values are UTC."""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - EPOCH) // timedelta(microseconds=1)
+
+
+def from_micros(value: int | None) -> datetime | None:
+    if value is None:
+        return None
+    return EPOCH + timedelta(microseconds=value)
+
+
+class TransactionStore:
+    """
+    Transactions keyed by TransactionID, with the high-water mark of each
+    account: the most recent (date_operation, id) seen by a sync.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "TransactionStore":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._connection.close()
+
+    def upsert(
+        self, account_id: str, transactions: Iterable[TransactionSchema]
+    ) -> tuple[int, int]:
+        """
+        Insert new transactions and update changed ones, e.g. a PDNG
+        transaction that is now BOOK. Returns (inserted, updated) counts.
+        """
+        rows = {}
+        for txn in transactions:
+            rows[txn.id] = (
+                txn.id,
+                txn.label,
+                txn.amount,
+                TransactionCreditDebitIndicator(txn.crdt_dbit_indicator).value,
+                TransactionStatus(txn.status).value,
+                txn.currency,
+                to_micros(txn.date_operation),
+                to_micros(txn.date_processed),
+            )
+        if not rows:
+            return 0, 0
+
+        with self._lock, self._connection:
+            placeholders = ",".join("?" * len(rows))
+            existing = {
+                row[0]: row[1:]
+                for row in self._connection.execute(
+                    f"SELECT {COLUMN_LIST} FROM transactions"
+                    f" WHERE id IN ({placeholders})",
+                    list(rows),
+                )
+            }
+            new_rows = [row for key, row in rows.items() if key not in existing]
+            changed_rows = [
+                row
+                for key, row in rows.items()
+                if key in existing and existing[key] != row[1:]
+            ]
+            now = time.time()
+            self._connection.executemany(
+                f"INSERT INTO transactions (account_id, updated_at, {COLUMN_LIST})"
+                f" VALUES (?, ?, {', '.join('?' * len(COLUMNS))})",
+                [(account_id, now, *row) for row in new_rows],
+            )
+            self._connection.executemany(
+                "UPDATE transactions SET label = ?, amount = ?,"
+                " crdt_dbit_indicator = ?, status = ?, currency = ?,"
+                " date_operation = ?, date_processed = ?, updated_at = ?"
+                " WHERE id = ?",
+                [(*row[1:], now, row[0]) for row in changed_rows],
+            )
+        return len(new_rows), len(changed_rows)
+
+    def high_water_mark(self, account_id: str) -> HighWaterMark | None:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT hwm_date_operation, hwm_id FROM sync_state"
+                " WHERE account_id = ?",
+                (account_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        return from_micros(row[0]), row[1]
+
+    def set_high_water_mark(self, account_id: str, mark: HighWaterMark):
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT INTO sync_state"
+                " (account_id, hwm_date_operation, hwm_id, synced_at)"
+                " VALUES (?, ?, ?, ?)"
+                " ON CONFLICT (account_id) DO UPDATE SET"
+                " hwm_date_operation = excluded.hwm_date_operation,"
+                " hwm_id = excluded.hwm_id, synced_at = excluded.synced_at",
+                (account_id, to_micros(mark[0]), mark[1], time.time()),
+            )
+
+    def transactions(
+        self,
+        account_id: str,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        status: TransactionStatus | None = None,
+        limit: int | None = None,
+    ) -> list[TransactionSchema]:
+        """
+        Stored transactions of an account, most recent first. The date range
+        applies to date_operation and is half-open: start <= date < end.
+        """
+        query = f"SELECT {COLUMN_LIST} FROM transactions WHERE account_id = ?"
+        params: list = [account_id]
+        if start is not None:
+            query += " AND date_operation >= ?"
+            params.append(to_micros(start))
+        if end is not None:
+            query += " AND date_operation < ?"
+            params.append(to_micros(end))
+        if status is not None:
+            query += " AND status = ?"
+            params.append(TransactionStatus(status).value)
+        query += " ORDER BY date_operation DESC, id DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            rows = self._connection.execute(query, params).fetchall()
+        return construct_many(TransactionSchema, (self._to_fields(row) for row in rows))
+
+    def count(self, account_id: str) -> int:
+        with self._lock:
+            return self._connection.execute(
+                "SELECT COUNT(*) FROM transactions WHERE account_id = ?",
+                (account_id,),
+            ).fetchone()[0]
+
+    @staticmethod
+    def _to_fields(row: tuple) -> dict:
+        fields = dict(zip(COLUMNS, row))
+        fields["crdt_dbit_indicator"] = TransactionCreditDebitIndicator(
+            fields["crdt_dbit_indicator"]
+        )
+        fields["status"] = TransactionStatus(fields["status"])
+        fields["date_operation"] = from_micros(fields["date_operation"])
+        fields["date_processed"] = from_micros(fields["date_processed"])
+        return fields
@@ -0,0 +1,274 @@
+"""
+Balance change detection by adaptive polling.
+
+BalanceWatcher polls the balances of many accounts, each on its own
+schedule: an account whose balances changed is polled again after
+min_interval, and every quiet poll stretches its interval by `backoff` up to
+max_interval. Due accounts are fetched together on a thread pool, so the
+number of requests follows account activity rather than account count.
+Results are compared with the previous snapshot by balance id and amount,
+and only the differences are emitted, to callbacks or an async iterator.
+"""
+
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable
+
+from .. import logger
+from ..api.api_client import DSP2Client
+from ..models.balance import BalanceSchema
+
+DEFAULT_MIN_INTERVAL = 15.0
+DEFAULT_MAX_INTERVAL = 600.0
+DEFAULT_BACKOFF = 1.5
+DEFAULT_WATCH_WORKERS = 16
+
+
+@dataclass(frozen=True)
+class BalanceChange:
+    """
+    One balance that appeared, disappeared or changed amount.
+    """
+
+    account_id: str
+    balance_id: str
+    previous_amount: int | None
+    amount: int | None
+    balance: BalanceSchema | None = None
+
+    @property
+    def kind(self) -> str:
+        if self.previous_amount is None:
+            return "added"
+        if self.amount is None:
+            return "removed"
+        return "changed"
+
+    @property
+    def delta(self) -> int:
+        return (self.amount or 0) - (self.previous_amount or 0)
+
+
+@dataclass
+class WatchedAccount:
+    client: DSP2Client
+    account_id: str
+    interval: float
+    next_poll: float
+    snapshot: dict[str, int] | None = None
+    polls: int = 0
+    changes: int = 0
+
+
+def diff_balances(
+    account_id: str,
+    previous: dict[str, int],
+    balances: list[BalanceSchema],
+) -> list[BalanceChange]:
+    """Differences between a snapshot and freshly fetched balances."""
+    changes = []
+    seen = set()
+    for balance in balances:
+        seen.add(balance.id)
+        before = previous.get(balance.id)
+        if before != balance.amount:
+            changes.append(
+                BalanceChange(account_id, balance.id, before, balance.amount, balance)
+            )
+    for balance_id, before in previous.items():
+        if balance_id not in seen:
+            changes.append(BalanceChange(account_id, balance_id, before, None))
+    return changes
+
+
+class BalanceWatcher:
+    """
+    Watches account balances through DSP2Client instances.
+
+    The first poll of an account records its snapshot without emitting
+    anything, unless emit_initial is set. Callbacks run on the polling
+    thread and must not block.
+    """
+
+    def __init__(
+        self,
+        min_interval: float = DEFAULT_MIN_INTERVAL,
+        max_interval: float = DEFAULT_MAX_INTERVAL,
+        backoff: float = DEFAULT_BACKOFF,
+        max_workers: int = DEFAULT_WATCH_WORKERS,
+        executor: Executor | None = None,
+        emit_initial: bool = False,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if not 0 < min_interval <= max_interval:
+            raise ValueError("intervals must satisfy 0 < min_interval <= max_interval")
+        if backoff < 1:
+            raise ValueError("backoff must be at least 1")
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.max_workers = max_workers
+        self.executor = executor
+        self.emit_initial = emit_initial
+        self.clock = clock
+        self._accounts: dict[str, WatchedAccount] = {}
+        self._schedule: list[tuple[float, int, str]] = []
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._change_callbacks: list[Callable[[BalanceChange], None]] = []
+        self._error_callbacks: list[Callable[[str, Exception], None]] = []
+
+    def __len__(self) -> int:
+        return len(self._accounts)
+
+    def watch(self, client: DSP2Client, account_id: str):
+        """Start watching an account; its first poll is due immediately."""
+        with self._lock:
+            if account_id in self._accounts:
+                return
+            now = self.clock()
+            self._accounts[account_id] = WatchedAccount(
+                client, account_id, self.min_interval, now
+            )
+            self._push(now, account_id)
+
+    def watch_all(self, client: DSP2Client) -> list[str]:
+        """Watch every account of the client's user."""
+        account_ids = [account.id for account in client.get_accounts()]
+        for account_id in account_ids:
+            self.watch(client, account_id)
+        return account_ids
+
+    def unwatch(self, account_id: str):
+        with self._lock:
+            self._accounts.pop(account_id, None)
+
+    def interval(self, account_id: str) -> float:
+        return self._accounts[account_id].interval
+
+    def on_change(self, callback: Callable[[BalanceChange], None]):
+        self._change_callbacks.append(callback)
+        return callback
+
+    def on_error(self, callback: Callable[[str, Exception], None]):
+        self._error_callbacks.append(callback)
+        return callback
+
+    def next_poll_in(self) -> float | None:
+        """Seconds until the next account is due, or None when none is watched."""
+        with self._lock:
+            while self._schedule:
+                due, _, account_id = self._schedule[0]
+                account = self._accounts.get(account_id)
+                if account is not None and account.next_poll == due:
+                    return max(0.0, due - self.clock())
+                heapq.heappop(self._schedule)
+            return None
+
+    def poll_once(self) -> list[BalanceChange]:
+        """
+        Fetch the balances of every due account concurrently and return the
+        changes found, after passing each one to the change callbacks.
+        """
+        due = self._pop_due()
+        if not due:
+            return []
+        if self.executor is not None:
+            outcomes = list(self.executor.map(self._fetch, due))
+        elif len(due) == 1 or self.max_workers <= 1:
+            outcomes = [self._fetch(account) for account in due]
+        else:
+            with ThreadPoolExecutor(
+                max_workers=min(self.max_workers, len(due)),
+                thread_name_prefix="dsp2client-watch",
+            ) as executor:
+                outcomes = list(executor.map(self._fetch, due))
+
+        changes = []
+        for account, (balances, error) in zip(due, outcomes):
+            if error is not None:
+                self._reschedule(account, changed=False)
+                for callback in self._error_callbacks:
+                    callback(account.account_id, error)
+                continue
+            account_changes = self._compare(account, balances)
+            self._reschedule(account, changed=bool(account_changes))
+            changes.extend(account_changes)
+
+        for change in changes:
+            for callback in self._change_callbacks:
+                callback(change)
+        return changes
+
+    def run(self, stop: threading.Event | None = None):
+        """Poll until `stop` is set."""
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            self.poll_once()
+            delay = self.next_poll_in()
+            stop.wait(self.min_interval if delay is None else delay)
+
+    async def changes(self) -> AsyncIterator[BalanceChange]:
+        """
+        Yield changes as they are detected. Polls run on a worker thread so
+        the event loop is never blocked.
+        """
+        while True:
+            for change in await asyncio.to_thread(self.poll_once):
+                yield change
+            delay = self.next_poll_in()
+            await asyncio.sleep(self.min_interval if delay is None else delay)
+
+    def _push(self, due: float, account_id: str):
+        heapq.heappush(self._schedule, (due, next(self._sequence), account_id))
+
+    def _pop_due(self) -> list[WatchedAccount]:
+        now = self.clock()
+        due = []
+        with self._lock:
+            while self._schedule and self._schedule[0][0] <= now:
+                when, _, account_id = heapq.heappop(self._schedule)
+                account = self._accounts.get(account_id)
+                # Entries of unwatched or rescheduled accounts are stale.
+                if account is not None and account.next_poll == when:
+                    due.append(account)
+        return due
+
+    def _fetch(
+        self, account: WatchedAccount
+    ) -> tuple[list[BalanceSchema] | None, Exception | None]:
+        try:
+            return account.client.get_balances(account.account_id), None
+        except Exception as e:
+            logger.logger.warning(
+                "Balance poll failed for account %s: %s", account.account_id, e
+            )
+            return None, e
+
+    def _compare(
+        self, account: WatchedAccount, balances: list[BalanceSchema]
+    ) -> list[BalanceChange]:
+        account.polls += 1
+        previous = account.snapshot
+        account.snapshot = {balance.id: balance.amount for balance in balances}
+        if previous is None and not self.emit_initial:
+            return []
+        changes = diff_balances(account.account_id, previous or {}, balances)
+        account.changes += bool(changes)
+        return changes
+
+    def _reschedule(self, account: WatchedAccount, changed: bool):
+        if changed:
+            account.interval = self.min_interval
+        else:
+            account.interval = min(self.max_interval, account.interval * self.backoff)
+        with self._lock:
+            if self._accounts.get(account.account_id) is not account:
+                return
+            account.next_poll = self.clock() + account.interval
+            self._push(account.next_poll, account.account_id)
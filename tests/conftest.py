@@ -1,8 +1,135 @@
+import json
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
 from unittest.mock import MagicMock, patch
+from urllib.parse import parse_qs
 
+import httpx
 import pytest
 
+from dsp2_client.api import scheduler
 from dsp2_client.api.api_client import DSP2Client
+from dsp2_client.api.async_api_client import AsyncDSP2Client
+
+NEWEST = datetime(2024, 1, 31, tzinfo=timezone.utc)
+BASE_URL = "http://api.test"
+
+
+def build_account(index: int, type: str = "CACC", usage: str = "PRIV") -> dict:
+    return {
+        "id": f"acct_{index:024d}",
+        "type": type,
+        "usage": usage,
+        "iban": f"FR76{index:023d}",
+        "name": f"Account {index}",
+        "currency": "EUR",
+    }
+
+
+def build_transaction(index: int, **fields) -> dict:
+    """
+    Transaction `index` as the API returns it, one day older than index - 1.
+    `fields` override the defaults.
+    """
+    return {
+        "id": f"tran_{index:024d}",
+        "label": f"Transaction {index}",
+        "amount": index + 1,
+        "crdt_dbit_indicator": "DBIT",
+        "status": "BOOK",
+        "currency": "EUR",
+        "date_operation": (NEWEST - timedelta(days=index)).isoformat(),
+        "date_processed": None,
+        **fields,
+    }
+
+
+class FakeBank:
+    """
+    MockTransport handler serving the STET API for `accounts`: one balance
+    per account and `transactions` transactions, most recent first. Single
+    accounts are answered from `accounts`, with a 404 for unknown ids.
+
+    Requests are counted by kind, or by (kind, account id) under
+    /stet/account/, where "single" is the kind of single account requests.
+    Paths in `delays` answer late, and time out once the delay exceeds the
+    request's read timeout; paths in `statuses` fail with that status.
+    """
+
+    def __init__(self, accounts: list[dict], transactions: int = 30):
+        self.accounts = list(accounts)
+        self.transactions = transactions
+        self.requests = Counter()
+        self.delays: dict[str, float] = {}
+        self.statuses: dict[str, int] = {}
+        self.timeouts = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        kind = path.rsplit("/", 1)[-1]
+        single = path.count("/") == 3 and path.startswith("/stet/account/")
+        if single:
+            kind = "single"
+        if path.startswith("/stet/account/"):
+            self.requests[(kind, path.split("/")[3])] += 1
+        else:
+            self.requests[kind] += 1
+
+        timeout = request.extensions["timeout"]["read"]
+        self.timeouts.append(timeout)
+        delay = self.delays.get(path, 0)
+        if timeout is not None and delay > timeout:
+            time.sleep(timeout)
+            raise httpx.ReadTimeout("timed out", request=request)
+        time.sleep(delay)
+        if path in self.statuses:
+            return httpx.Response(self.statuses[path], json={"error": "failed"})
+
+        if path == "/oauth/token":
+            return httpx.Response(200, json={"access_token": "token"})
+        if path == "/stet/identity":
+            body = {
+                "id": "user_" + "0" * 24,
+                "prefix": "MIST",
+                "first_name": "Ada",
+                "last_name": "Lovelace",
+                "date_of_birth": "1990-01-01",
+            }
+        elif path == "/stet/account":
+            body = self.accounts
+        elif single:
+            account_id = path.split("/")[3]
+            found = [a for a in self.accounts if a["id"] == account_id]
+            if not found:
+                return httpx.Response(404, json={"error": "not found"})
+            body = found[0]
+        elif kind == "balance":
+            body = [
+                {
+                    "id": "blnc_" + "1" * 24,
+                    "name": "Balance",
+                    "amount": 100,
+                    "currency": "EUR",
+                    "type": "CLBD",
+                }
+            ]
+        else:
+            query = parse_qs(request.url.query.decode())
+            page, count = int(query["page"][0]), int(query["count"][0])
+            start = (page - 1) * count
+            body = [
+                build_transaction(i)
+                for i in range(start, min(start + count, self.transactions))
+            ]
+        return httpx.Response(200, content=json.dumps(body).encode())
+
+    def count(self, kind: str) -> int:
+        return sum(
+            n
+            for key, n in self.requests.items()
+            if key == kind or (isinstance(key, tuple) and key[0] == kind)
+        )
 
 
 @pytest.fixture
@@ -36,3 +163,61 @@ def authenticated_client():
         mock_response.json.return_value = {"access_token": "token123"}
         mock_post.return_value = mock_response
         yield DSP2Client("user", "pass")
+
+
+@pytest.fixture(autouse=True)
+def reset_circuit_breakers():
+    yield
+    scheduler.reset_circuit_breakers()
+
+
+@pytest.fixture
+def make_account():
+    return build_account
+
+
+@pytest.fixture
+def make_transaction():
+    return build_transaction
+
+
+@pytest.fixture
+def newest():
+    """Date of transaction 0, the most recent one FakeBank serves."""
+    return NEWEST
+
+
+@pytest.fixture
+def accounts():
+    return [
+        build_account(1, "CACC", "PRIV"),
+        build_account(2, "CARD", "PRIV"),
+        build_account(3, "CACC", "ORGA"),
+    ]
+
+
+@pytest.fixture
+def bank(accounts):
+    return FakeBank(accounts)
+
+
+@pytest.fixture
+def make_client():
+    """Build a DSP2Client talking to a FakeBank."""
+
+    def make(bank: FakeBank, **options) -> DSP2Client:
+        options.setdefault("transport", httpx.MockTransport(bank))
+        return DSP2Client("user", "pass", base_url=BASE_URL, **options)
+
+    return make
+
+
+@pytest.fixture
+def make_async_client():
+    """Build an AsyncDSP2Client talking to a FakeBank."""
+
+    def make(bank: FakeBank, **options) -> AsyncDSP2Client:
+        options.setdefault("transport", httpx.MockTransport(bank))
+        return AsyncDSP2Client("user", "pass", base_url=BASE_URL, **options)
+
+    return make
@@ -0,0 +1,110 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from dsp2_client.api.account_directory import AccountDirectory
+from dsp2_client.api.errors import DSP2ClientError
+from dsp2_client.api.response_cache import ResponseCache
+from dsp2_client.models.account import AccountSchema, AccountType, AccountUsage
+
+UNKNOWN_ID = "acct_" + "9" * 24
+
+
+def test_lookups_share_one_request(bank, make_client, accounts):
+    client = make_client(bank)
+    ids = [account["id"] for account in reversed(accounts)]
+
+    by_ids = client.get_accounts_by_ids(ids)
+    for account_id in ids:
+        client.get_account(account_id)
+    found = client.find_by_iban("fr76 " + accounts[1]["iban"][4:].lower())
+
+    assert [account.id for account in by_ids] == ids
+    assert found.id == accounts[1]["id"]
+    assert bank.count("account") == 1
+    assert bank.count("single") == 0
+    directory = client.account_directory
+    assert [a.id for a in directory.by_type(AccountType.CARD)] == [accounts[1]["id"]]
+    assert len(directory.by_usage("PRIV")) == 2
+
+
+def test_a_miss_refreshes_once(bank, make_client, make_account, accounts):
+    now = [0.0]
+    new_account = make_account(4, "CARD", "ORGA")
+    client = make_client(bank, cache=ResponseCache())
+    client.account_directory.clock = lambda: now[0]
+    client.get_account(accounts[0]["id"])
+
+    bank.accounts.append(new_account)
+    # Loaded too recently: the miss does not reload yet.
+    assert client.find_by_iban(new_account["iban"]) is None
+    now[0] = 2.0
+    found = client.get_accounts_by_ids([new_account["id"], accounts[0]["id"]])
+    with pytest.raises(DSP2ClientError) as error:
+        client.get_accounts_by_ids([UNKNOWN_ID])
+
+    assert found[0].id == new_account["id"]
+    assert error.value.status_code == 404
+    # The refresh bypassed the cached account list.
+    assert bank.count("account") == 2
+
+
+def test_unknown_account_falls_back_to_the_endpoint(bank, make_client):
+    client = make_client(bank)
+
+    with pytest.raises(DSP2ClientError):
+        client.get_account(UNKNOWN_ID)
+
+    assert bank.count("single") == 1
+
+
+def test_ttl_expiry_and_invalidation(accounts):
+    now = [0.0]
+    loaded = []
+
+    def load(after_miss):
+        loaded.append(after_miss)
+        return [AccountSchema(**account) for account in accounts]
+
+    directory = AccountDirectory(load, ttl=60, clock=lambda: now[0])
+    directory.accounts()
+    now[0] = 59.0
+    directory.get(accounts[0]["id"])
+    now[0] = 60.0
+    directory.get(accounts[0]["id"])
+    directory.invalidate()
+    directory.accounts()
+
+    assert loaded == [False, False, False]
+    assert directory.loads == 3
+
+
+def test_concurrent_lookups_load_once(bank, make_client, accounts):
+    client = make_client(bank)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        found = list(executor.map(client.get_account, [a["id"] for a in accounts] * 10))
+
+    assert len(found) == 30
+    assert client.account_directory.loads == 1
+
+
+def test_async_lookups(bank, make_async_client, accounts):
+    async def run():
+        async with make_async_client(bank) as client:
+            by_ids, account, found = await asyncio.gather(
+                client.get_accounts_by_ids([a["id"] for a in accounts]),
+                client.get_account(accounts[2]["id"]),
+                client.find_by_iban(accounts[1]["iban"]),
+            )
+            by_usage = await client.account_directory.by_usage(AccountUsage.ORGA)
+            return by_ids, account, found, by_usage
+
+    by_ids, account, found, by_usage = asyncio.run(run())
+
+    assert [a.id for a in by_ids] == [a["id"] for a in accounts]
+    assert account.id == accounts[2]["id"]
+    assert found.id == accounts[1]["id"]
+    assert [a.id for a in by_usage] == [accounts[2]["id"]]
+    assert bank.count("account") == 1
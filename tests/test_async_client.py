@@ -0,0 +1,143 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+
+from dsp2_client.api.async_api_client import AsyncDSP2Client
+from dsp2_client.api.errors import DSP2ClientError
+from dsp2_client.models.identity import UserIdentitySchema
+
+
+def make_response(payload):
+    response = MagicMock()
+    response.raise_for_status.return_value = None
+    response.json.return_value = payload
+    return response
+
+
+@pytest.fixture
+def valid_balance():
+    return {
+        "id": "blnc_1234567890abcdefABCDEF12",
+        "name": "Balance1",
+        "amount": 500,
+        "currency": "EUR",
+        "type": "CLBD",
+    }
+
+
+@pytest.fixture
+def mock_post():
+    with patch("httpx.AsyncClient.post", new_callable=AsyncMock) as mock:
+        mock.return_value = make_response({"access_token": "token123"})
+        yield mock
+
+
+def test_authenticates_once_for_concurrent_calls(mock_post, valid_user_identity):
+    async def scenario():
+        client = AsyncDSP2Client("user", "pass")
+        with patch.object(
+            client.api._client, "get", new_callable=AsyncMock
+        ) as mock_get:
+            mock_get.return_value = make_response(valid_user_identity)
+            results = await asyncio.gather(*(client.get_identity() for _ in range(5)))
+        await client.aclose()
+        return client, results
+
+    client, results = asyncio.run(scenario())
+
+    assert mock_post.call_count == 1
+    assert client.api._client.headers["Authorization"] == "Bearer token123"
+    assert all(isinstance(identity, UserIdentitySchema) for identity in results)
+
+
+def test_get_full_user_data_runs_account_requests_concurrently(
+    mock_post, valid_user_identity, valid_account, valid_balance
+):
+    accounts = [{**valid_account, "id": f"acct_{str(i) * 24}"} for i in range(4)]
+    in_flight = 0
+    max_in_flight = 0
+
+    async def fake_get(endpoint, params=None):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if endpoint.endswith("/balance"):
+            return make_response([valid_balance])
+        if endpoint.endswith("/transaction"):
+            return make_response([])
+        if endpoint.endswith("/account"):
+            return make_response(accounts)
+        return make_response(valid_user_identity)
+
+    async def scenario(max_concurrency):
+        async with AsyncDSP2Client(
+            "user", "pass", max_concurrency=max_concurrency
+        ) as client:
+            with patch.object(client.api._client, "get", side_effect=fake_get):
+                return await client.get_full_user_data()
+
+    data = asyncio.run(scenario(max_concurrency=3))
+
+    assert data["identity"]["id"] == valid_user_identity["id"]
+    assert [account["id"] for account in data["accounts"]] == [
+        account["id"] for account in accounts
+    ]
+    assert all(account["balances"][0]["amount"] == 500 for account in data["accounts"])
+    assert max_in_flight == 3
+
+
+def test_async_get_raises_runtime_error_on_http_error(mock_post):
+    async def scenario():
+        async with AsyncDSP2Client("user", "pass") as client:
+            with patch.object(
+                client.api._client, "get", new_callable=AsyncMock
+            ) as mock_get:
+                mock_get.return_value = MagicMock()
+                mock_get.return_value.raise_for_status.side_effect = Exception("boom")
+                await client.get_accounts()
+
+    with pytest.raises(RuntimeError, match="Failed GET"):
+        asyncio.run(scenario())
+
+
+def test_invalid_max_concurrency():
+    with pytest.raises(ValueError):
+        AsyncDSP2Client("user", "pass", max_concurrency=0)
+
+
+def test_identical_requests_take_one_concurrency_slot(bank, make_async_client):
+    async def scenario():
+        async with make_async_client(bank, max_concurrency=1) as client:
+            await asyncio.gather(*(client.get_identity() for _ in range(3)))
+            return client.api.single_flight.shared
+
+    assert asyncio.run(scenario()) == 2
+    assert bank.count("identity") == 1
+
+
+def test_failure_cancels_sibling_requests(bank, make_async_client, accounts):
+    bank.statuses[f"/stet/account/{accounts[1]['id']}/balance"] = 404
+    cancelled = []
+
+    async def handler(request):
+        if request.url.path.endswith("/transaction"):
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled.append(request.url.path)
+                raise
+        return bank(request)
+
+    async def scenario():
+        transport = httpx.MockTransport(handler)
+        async with make_async_client(bank, transport=transport) as client:
+            with pytest.raises(DSP2ClientError):
+                await client.get_full_user_data()
+            await asyncio.sleep(0.05)
+            return len(cancelled)
+
+    assert asyncio.run(scenario()) == len(accounts)
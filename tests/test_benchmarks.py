@@ -0,0 +1,45 @@
+import json
+
+from benchmarks.compare import compare
+from benchmarks.mock_server import MockServerConfig, MockSTETServer
+from benchmarks.run import client_for, run
+from dsp2_client.models.transaction import TransactionSchema
+
+
+def test_mock_server_serves_the_stet_api():
+    config = MockServerConfig(accounts=2, transactions_per_account=25)
+    with MockSTETServer(config) as server:
+        with client_for(server) as client:
+            data = client.get_full_user_data(transactions_per_account=5)
+            account_id = data["accounts"][0]["id"]
+            transactions = list(client.iter_transactions(account_id, page_size=10))
+
+    assert len(data["accounts"]) == 2
+    assert len(data["accounts"][0]["balances"]) == 2
+    assert len(transactions) == 25
+    assert all(isinstance(t, TransactionSchema) for t in transactions)
+    assert transactions[0].date_operation > transactions[-1].date_operation
+
+
+def test_mock_server_injects_errors():
+    config = MockServerConfig(error_rate=1.0)
+    with MockSTETServer(config) as server:
+        status, _ = server.route("GET", "/stet/identity")
+    assert status == 503
+
+
+def test_report_is_json_and_comparable():
+    report = run(["single_call", "validation"], MockServerConfig(), repeat=1)
+
+    report = json.loads(json.dumps(report))
+    assert {result["name"] for result in report["results"]} == {
+        "single_call",
+        "validation",
+    }
+    assert all(result["median"] > 0 for result in report["results"])
+
+    slower = json.loads(json.dumps(report))
+    slower["results"][0]["median"] *= 2
+    rows, regressed = compare(report, slower, threshold=0.5)
+    assert regressed
+    assert len(rows) == len(report["results"])
@@ -0,0 +1,137 @@
+import csv
+import io
+import json
+
+import pytest
+
+from dsp2_client import cli, export
+from dsp2_client.api.batch import UserDataResult
+from dsp2_client.export import Checkpoint, open_writer
+
+
+def make_data(username: str, valid_user_identity, valid_account) -> dict:
+    account = dict(valid_account, balances=[], transactions=[{"amount": 1}])
+    return {"identity": dict(valid_user_identity), "accounts": [account]}
+
+
+@pytest.fixture
+def fake_batch(monkeypatch, valid_user_identity, valid_account):
+    seen = []
+
+    def fake_iter(credentials, **options):
+        for index, (username, _) in enumerate(credentials):
+            seen.append(username)
+            if username == "broken":
+                yield UserDataResult(index, username, error=RuntimeError("boom"))
+            else:
+                data = make_data(username, valid_user_identity, valid_account)
+                yield UserDataResult(index, username, data, elapsed=0.1 * index)
+
+    monkeypatch.setattr(cli, "iter_full_user_data", fake_iter)
+    return seen
+
+
+def write_credentials(path, usernames):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["username", "password"])
+        writer.writerows((username, "secret") for username in usernames)
+
+
+def run(argv) -> tuple[int, str]:
+    args = cli.build_parser().parse_args(argv)
+    report = io.StringIO()
+    return cli.export(args, report=report), report.getvalue()
+
+
+def test_export_ndjson_and_report(tmp_path, fake_batch):
+    write_credentials(tmp_path / "users.csv", ["alice", "bob"])
+    output = tmp_path / "out.ndjson"
+
+    code, report = run(
+        [
+            "export",
+            str(tmp_path / "users.csv"),
+            "-o",
+            str(output),
+            "--timings",
+            str(tmp_path / "timings.csv"),
+        ]
+    )
+
+    assert code == 0
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [record["username"] for record in records] == ["alice", "bob"]
+    assert records[0]["accounts"][0]["transactions"] == [{"amount": 1}]
+    assert "Exported 2 users, 0 failed" in report
+    assert "users/s" in report
+    with open(tmp_path / "timings.csv") as f:
+        assert [row["username"] for row in csv.DictReader(f)] == ["alice", "bob"]
+
+
+def test_interrupted_export_resumes(tmp_path, fake_batch):
+    write_credentials(tmp_path / "users.csv", ["alice", "broken", "carol"])
+    output = tmp_path / "out.ndjson"
+    Checkpoint(f"{output}.checkpoint").mark(["alice"])
+    output.write_text('{"username": "alice"}\n')
+
+    code, report = run(["export", str(tmp_path / "users.csv"), "-o", str(output)])
+
+    assert code == 1
+    assert fake_batch == ["broken", "carol"]
+    lines = [json.loads(line)["username"] for line in output.read_text().splitlines()]
+    assert lines == ["alice", "carol"]
+    assert Checkpoint(f"{output}.checkpoint").done == {"alice", "carol"}
+    assert "1 skipped" in report
+    assert "Failed: broken: boom" in report
+
+    code, _ = run(
+        ["export", str(tmp_path / "users.csv"), "-o", str(output), "--restart"]
+    )
+    assert fake_batch[-3:] == ["alice", "broken", "carol"]
+
+
+def test_export_csv_has_one_row_per_account(tmp_path, fake_batch, valid_account):
+    (tmp_path / "users.json").write_text(
+        json.dumps([{"username": "alice", "password": "secret"}])
+    )
+    output = tmp_path / "out.csv"
+
+    code, _ = run(["export", str(tmp_path / "users.json"), "-o", str(output)])
+
+    assert code == 0
+    with open(output, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 1
+    assert rows[0]["username"] == "alice"
+    assert rows[0]["account_id"] == valid_account["id"]
+    assert json.loads(rows[0]["transactions"]) == [{"amount": 1}]
+
+
+@pytest.mark.parametrize("format", ["ndjson", "csv"])
+def test_written_users_are_synced_before_they_are_reported(
+    tmp_path, monkeypatch, format, valid_user_identity, valid_account
+):
+    synced = []
+    monkeypatch.setattr(export.os, "fsync", synced.append)
+    writer = open_writer(tmp_path / f"out.{format}", format)
+    data = make_data("alice", valid_user_identity, valid_account)
+
+    done = writer.write(UserDataResult(0, "alice", data))
+
+    assert done == ["alice"]
+    assert synced == [writer._file.fileno()]
+    writer.close()
+
+
+def test_writers_must_implement_write(tmp_path):
+    class Incomplete(export.ExportWriter):
+        pass
+
+    with pytest.raises(TypeError, match="abstract"):
+        Incomplete(tmp_path / "out")
+
+
+def test_unknown_format_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        open_writer(tmp_path / "out.xml", "xml")
@@ -44,3 +44,16 @@ def test_get_method_raises_runtime_error_on_http_error(authenticated_client):
 
         with pytest.raises(RuntimeError, match="Failed GET"):
             authenticated_client.api.get("/failing-endpoint")
+
+
+def test_unvalidated_lists_are_plain_dicts(authenticated_client, valid_account):
+    with patch.object(authenticated_client.api._client, "get") as mock_get:
+        mock_get.return_value.raise_for_status.return_value = None
+        mock_get.return_value.json.return_value = [valid_account]
+        mock_get.return_value.content = b'[{"amount": 12, "type": "CLBD"}]'
+
+        accounts = authenticated_client.get_accounts(validate=False)
+        balances = authenticated_client.get_balances("acct_1", validate=False)
+
+    assert accounts == [valid_account]
+    assert balances == [{"amount": 12, "type": "CLBD"}]
@@ -0,0 +1,182 @@
+import threading
+from collections import Counter
+
+import httpx
+import pytest
+
+from dsp2_client.api.client_pool import DSP2ClientPool
+from dsp2_client.api.http_config import SharedTransport
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def requests():
+    return Counter()
+
+
+@pytest.fixture
+def transport(requests):
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests[request.url.path] += 1
+        if request.url.path == "/oauth/token":
+            return httpx.Response(
+                200, json={"access_token": "token", "expires_in": 3600}
+            )
+        return httpx.Response(200, json=[])
+
+    shared = SharedTransport(transport=httpx.MockTransport(handler))
+    yield shared
+    shared.shutdown()
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def make_pool(transport, clock, **options) -> DSP2ClientPool:
+    return DSP2ClientPool(
+        base_url="http://api.test", transport=transport, clock=clock, **options
+    )
+
+
+def test_sessions_are_reused(transport, clock, requests):
+    with make_pool(transport, clock) as pool:
+        with pool.session("alice", "secret") as first:
+            first.get_accounts()
+        with pool.session("alice", "secret") as second:
+            second.get_accounts()
+
+        assert first is second
+        assert requests["/oauth/token"] == 1
+        stats = pool.stats()
+        assert (stats.hits, stats.misses, stats.size) == (1, 1, 1)
+        assert stats.hit_rate == 0.5
+
+
+def test_least_recently_used_session_is_evicted_and_closed(transport, clock):
+    with make_pool(transport, clock, max_size=2) as pool:
+        clients = {}
+        for username in ("alice", "bob", "alice", "carol"):
+            with pool.session(username, "secret") as client:
+                clients[username] = client
+
+        assert "bob" not in pool
+        assert len(pool) == 2
+        assert clients["bob"].api._client.is_closed
+        assert not clients["alice"].api._client.is_closed
+        assert pool.stats().evictions == 1
+
+
+def test_idle_sessions_expire(transport, clock):
+    with make_pool(transport, clock, idle_ttl=60) as pool:
+        with pool.session("alice", "secret"):
+            pass
+        clock.now = 30
+        with pool.session("bob", "secret"):
+            pass
+
+        clock.now = 70
+        assert pool.evict_idle() == 1
+        assert list(pool._sessions) == ["bob"]
+        assert pool.stats().expirations == 1
+
+
+def test_session_in_use_is_closed_on_release(transport, clock):
+    with make_pool(transport, clock, max_size=1) as pool:
+        with pool.session("alice", "secret") as alice:
+            with pool.session("bob", "secret"):
+                assert "alice" not in pool
+                assert not alice.api._client.is_closed
+        assert alice.api._client.is_closed
+
+
+def test_evicted_user_reuses_cached_token_and_shared_transport(
+    transport, clock, requests
+):
+    with make_pool(transport, clock) as pool:
+        with pool.session("alice", "secret"):
+            pass
+        assert pool.evict("alice")
+        with pool.session("alice", "secret") as client:
+            client.get_accounts()
+
+        assert requests["/oauth/token"] == 1
+    # The pool does not own the transport it was given.
+    transport.handle_request(httpx.Request("GET", "http://api.test/stet/account"))
+
+
+def test_new_password_replaces_session(transport, clock, requests):
+    with make_pool(transport, clock) as pool:
+        with pool.session("alice", "old") as old:
+            pass
+        with pool.session("alice", "new") as new:
+            pass
+
+        assert old is not new
+        assert old.api._client.is_closed
+        assert new.authenticator.password == "new"
+
+
+def test_wrong_password_does_not_reuse_a_cached_token(clock):
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/oauth/token":
+            if b"password=secret" not in request.content:
+                return httpx.Response(401, json={"error": "invalid_grant"})
+            return httpx.Response(
+                200, json={"access_token": "alice-token", "expires_in": 3600}
+            )
+        return httpx.Response(200, json=[])
+
+    shared = SharedTransport(transport=httpx.MockTransport(handler))
+    with make_pool(shared, clock) as pool:
+        with pool.session("alice", "secret") as alice:
+            pass
+        with pytest.raises(RuntimeError):
+            with pool.session("alice", "WRONG"):
+                pass
+
+        with pool.session("alice", "secret") as client:
+            assert client is alice
+    shared.shutdown()
+
+
+def test_concurrent_sessions_of_one_user(transport, clock):
+    with make_pool(transport, clock) as pool:
+        clients = []
+        barrier = threading.Barrier(8)
+
+        def use():
+            barrier.wait()
+            with pool.session("alice", "secret") as client:
+                clients.append(client)
+
+        threads = [threading.Thread(target=use) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(pool) == 1
+        pooled = pool._sessions["alice"].client
+        assert sum(client is pooled for client in clients) == len(clients)
+        assert pool.stats().in_use == 0
+
+
+def test_closed_pool_refuses_sessions(transport, clock):
+    pool = make_pool(transport, clock)
+    with pool.session("alice", "secret") as client:
+        pass
+    pool.close()
+
+    assert client.api._client.is_closed
+    with pytest.raises(RuntimeError):
+        with pool.session("alice", "secret"):
+            pass
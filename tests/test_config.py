@@ -0,0 +1,52 @@
+import os
+
+import pytest
+
+from dsp2_client import config
+
+
+@pytest.fixture(autouse=True)
+def fresh_settings():
+    config.reset()
+    yield
+    config.reset()
+
+
+def test_settings_are_read_on_first_use(monkeypatch):
+    monkeypatch.setenv("API_BASE_URL", "https://bank.example")
+    monkeypatch.setenv("CACHE_TTL_BALANCE", "42")
+
+    assert config.API_BASE_URL == "https://bank.example"
+    assert config.CACHE_TTLS[config.BALANCE] == 42
+
+    monkeypatch.setenv("API_BASE_URL", "https://other.example")
+    assert config.API_BASE_URL == "https://bank.example"
+    config.reset()
+    assert config.API_BASE_URL == "https://other.example"
+
+
+def test_configure_overrides_settings():
+    config.configure(api_base_url="https://bank.example", http_timeout=1.5)
+
+    assert config.API_BASE_URL == "https://bank.example"
+    assert config.HTTP_TIMEOUT == 1.5
+    assert config.get_settings().identity == "/stet/identity"
+
+
+def test_dotenv_is_opt_in(tmp_path, monkeypatch):
+    env_file = tmp_path / ".env"
+    env_file.write_text("TOKEN_ENDPOINT=/custom/token\n")
+    monkeypatch.chdir(tmp_path)
+    # load_dotenv writes to os.environ: give it a scratch copy.
+    environ = {k: v for k, v in os.environ.items() if k != "TOKEN_ENDPOINT"}
+    monkeypatch.setattr(os, "environ", environ)
+
+    assert config.TOKEN_ENDPOINT == "/oauth/token"
+
+    assert config.load_dotenv(env_file)
+    assert config.TOKEN_ENDPOINT == "/custom/token"
+
+
+def test_unknown_attribute():
+    with pytest.raises(AttributeError):
+        config.NOT_A_SETTING
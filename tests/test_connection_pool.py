@@ -0,0 +1,77 @@
+import httpx
+import pytest
+
+from dsp2_client.api.api_client import DSP2Client
+from dsp2_client.api.base_client import BaseAPIClient
+from dsp2_client.api.http_config import HTTPConfig, SharedTransport
+
+
+@pytest.fixture
+def api_transport(valid_user_identity):
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.url.path == "/oauth/token":
+            return httpx.Response(200, json={"access_token": "token123"})
+        return httpx.Response(200, json=valid_user_identity)
+
+    transport = httpx.MockTransport(handler)
+    transport.requests = requests
+    return transport
+
+
+def test_auth_and_data_share_one_client(api_transport):
+    client = DSP2Client("user", "pass", transport=api_transport)
+
+    assert client.authenticator.client is client.api._client
+    client.get_identity()
+    assert [request.url.path for request in api_transport.requests] == [
+        "/oauth/token",
+        "/stet/identity",
+    ]
+
+
+def test_http_config_is_applied(api_transport):
+    http_config = HTTPConfig(timeout=2.5, connect_timeout=1.0)
+    client = DSP2Client(
+        "user", "pass", http_config=http_config, transport=api_transport
+    )
+
+    assert client.api._client.timeout == httpx.Timeout(2.5, connect=1.0)
+
+
+def test_context_manager_closes_client(api_transport):
+    with DSP2Client("user", "pass", transport=api_transport) as client:
+        assert not client.api._client.is_closed
+    assert client.api._client.is_closed
+
+
+def test_shared_transport_outlives_clients(api_transport):
+    shared = SharedTransport(transport=api_transport)
+
+    with DSP2Client("alice", "pass", transport=shared) as first:
+        first.get_identity()
+    with DSP2Client("bob", "pass", transport=shared) as second:
+        identity = second.get_identity()
+
+    assert identity.first_name == "John"
+    assert len(api_transport.requests) == 4
+
+
+def test_failed_authentication_closes_client(monkeypatch):
+    transport = httpx.MockTransport(lambda request: httpx.Response(401))
+    closed = []
+    close = BaseAPIClient.close
+
+    def recording_close(api):
+        close(api)
+        closed.append(api._client)
+
+    monkeypatch.setattr(BaseAPIClient, "close", recording_close)
+
+    with pytest.raises(RuntimeError, match="Authentication failed"):
+        DSP2Client("user", "pass", transport=transport)
+
+    assert len(closed) == 1
+    assert closed[0].is_closed
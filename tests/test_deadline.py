@@ -0,0 +1,199 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+from dsp2_client.api.deadline import Deadline, current_deadline
+from dsp2_client.api.errors import DSP2ClientError, DSP2DeadlineExceededError
+from dsp2_client.api.scheduler import (
+    RequestScheduler,
+    RetryPolicy,
+    circuit_breaker_for,
+)
+
+SLOW_PATHS = ("/stet/identity", "/stet/account")
+
+
+@pytest.fixture
+def slow(accounts):
+    """Id of the account whose requests are made to fail or time out."""
+    return accounts[1]["id"]
+
+
+def test_deadline_caps_request_timeouts(bank, make_client):
+    client = make_client(bank)
+
+    data = client.get_full_user_data(deadline=0.5)
+
+    assert len(data["accounts"]) == 3
+    assert max(bank.timeouts[1:]) <= 0.5
+    assert current_deadline() is None
+
+
+def test_failures_are_marked_in_partial_mode(bank, make_client, slow):
+    bank.statuses[f"/stet/account/{slow}/balance"] = 404
+    client = make_client(bank)
+
+    with pytest.raises(DSP2ClientError):
+        client.get_full_user_data()
+    data = client.get_full_user_data(partial=True)
+
+    assert data["complete"] is False
+    assert data["errors"] == {}
+    failed = data["accounts"][1]
+    assert "balances" not in failed
+    assert failed["errors"]["balances"]["error"] == "DSP2ClientError"
+    assert failed["errors"]["balances"]["timed_out"] is False
+    assert len(failed["transactions"]) == 10
+    assert "errors" not in data["accounts"][0]
+
+
+def test_identity_failure_keeps_accounts(bank, make_client):
+    bank.statuses["/stet/identity"] = 500
+    client = make_client(bank, scheduler=RequestScheduler(RetryPolicy(1)))
+
+    data = client.get_full_user_data(partial=True)
+
+    assert "identity" not in data
+    assert data["errors"]["identity"]["error"] == "DSP2ServerError"
+    assert len(data["accounts"]) == 3
+
+
+def test_async_identity_failure_is_left_out(bank, make_async_client):
+    bank.statuses["/stet/identity"] = 404
+
+    async def run():
+        async with make_async_client(bank) as client:
+            return await client.get_full_user_data(partial=True)
+
+    data = asyncio.run(run())
+
+    assert "identity" not in data
+    assert data["errors"]["identity"]["error"] == "DSP2ClientError"
+    assert data["complete"] is False
+    assert len(data["accounts"]) == 3
+
+
+def test_slow_account_is_marked_timed_out(bank, make_client, slow):
+    bank.delays[f"/stet/account/{slow}/transaction"] = 0.5
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        client = make_client(bank, executor=executor)
+        start = time.perf_counter()
+        data = client.get_full_user_data(deadline=0.2, partial=True)
+        elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.45
+    assert data["complete"] is False
+    timed_out = data["accounts"][1]
+    assert timed_out["errors"]["transactions"]["timed_out"] is True
+    assert "errors" not in data["accounts"][0]
+    assert "errors" not in data["accounts"][2]
+
+
+def test_slow_account_raises_without_partial(bank, make_client, slow):
+    bank.delays[f"/stet/account/{slow}/transaction"] = 0.5
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        client = make_client(bank, executor=executor)
+        with pytest.raises(DSP2DeadlineExceededError):
+            client.get_full_user_data(deadline=0.2)
+
+
+def test_retries_stop_at_the_deadline(bank, make_client):
+    bank.statuses["/stet/account"] = 503
+    policy = RetryPolicy(max_attempts=10, backoff_base=0.05, jitter=False)
+    client = make_client(bank, scheduler=RequestScheduler(policy))
+
+    start = time.perf_counter()
+    with pytest.raises(DSP2DeadlineExceededError):
+        client.get_full_user_data(deadline=0.3)
+
+    assert time.perf_counter() - start < 0.3
+    assert bank.count("account") < 10
+
+
+def test_deadline_timeouts_leave_the_circuit_closed(bank, make_client):
+    bank.delays.update(dict.fromkeys(SLOW_PATHS, 0.2))
+    client = make_client(bank)
+
+    for _ in range(6):
+        data = client.get_full_user_data(deadline=0.05, partial=True)
+        assert data["errors"]["identity"]["timed_out"] is True
+
+    assert circuit_breaker_for("http://api.test").state == "closed"
+    bank.delays.clear()
+    assert len(client.get_accounts()) == 3
+
+
+def test_async_deadline_timeouts_leave_the_circuit_closed(bank, make_async_client):
+    bank.delays.update(dict.fromkeys(SLOW_PATHS, 0.2))
+
+    async def run():
+        async with make_async_client(bank) as client:
+            for _ in range(6):
+                await client.get_full_user_data(deadline=0.05, partial=True)
+            bank.delays.clear()
+            return await client.get_accounts()
+
+    accounts = asyncio.run(run())
+
+    assert len(accounts) == 3
+    assert circuit_breaker_for("http://api.test").state == "closed"
+
+
+@pytest.mark.parametrize("first", ["deadline", "unbounded"])
+def test_concurrent_callers_do_not_share_a_deadline(bank, make_client, first):
+    bank.delays["/stet/account"] = 0.3
+    client = make_client(bank)
+    client.ensure_authenticated()
+
+    def with_deadline():
+        with Deadline(0.1):
+            return client.get_accounts()
+
+    calls = {"deadline": with_deadline, "unbounded": client.get_accounts}
+    second = "unbounded" if first == "deadline" else "deadline"
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = {first: executor.submit(calls[first])}
+        time.sleep(0.02)
+        futures[second] = executor.submit(calls[second])
+
+        with pytest.raises(DSP2DeadlineExceededError):
+            futures["deadline"].result()
+        assert len(futures["unbounded"].result()) == 3
+
+    assert client.api.single_flight.shared == 0
+    assert bank.count("account") == 2
+
+
+def test_deadline_expiry():
+    now = [0.0]
+    deadline = Deadline(2.0, clock=lambda: now[0])
+    capped = deadline.cap(httpx.Timeout(5.0, connect=1.0))
+
+    assert (capped.connect, capped.read) == (1.0, 2.0)
+    deadline.check()
+    now[0] = 2.0
+    assert deadline.expired
+    with pytest.raises(DSP2DeadlineExceededError, match="before GET /x"):
+        deadline.check("GET /x")
+    with pytest.raises(ValueError):
+        Deadline(0)
+
+
+def test_async_partial_result(bank, make_async_client, slow):
+    bank.statuses[f"/stet/account/{slow}/transaction"] = 404
+
+    async def run():
+        async with make_async_client(bank) as client:
+            return await client.get_full_user_data(deadline=1.0, partial=True)
+
+    data = asyncio.run(run())
+
+    assert data["identity"]["first_name"] == "Ada"
+    assert data["complete"] is False
+    failed = data["accounts"][1]
+    assert failed["errors"]["transactions"]["error"] == "DSP2ClientError"
+    assert len(failed["balances"]) == 1
+    assert max(bank.timeouts[1:]) <= 1.0
@@ -0,0 +1,62 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Cumulative import time of the top-level package, in microseconds. Generous,
+# so that it only trips when a heavy dependency is imported eagerly again.
+IMPORT_BUDGET_US = 50_000
+
+HEAVY_MODULES = ["httpx", "pydantic", "dotenv"]
+
+
+def run_python(code: str, *options: str, **env) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *options, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=ROOT,
+        env={**os.environ, **env},
+    )
+
+
+def loaded_modules(statement: str) -> set[str]:
+    result = run_python(
+        f"import json, sys; {statement}; print(json.dumps(sorted(sys.modules)))"
+    )
+    return set(json.loads(result.stdout))
+
+
+def test_package_import_is_lazy():
+    modules = loaded_modules("import dsp2_client")
+
+    assert not modules & set(HEAVY_MODULES)
+    assert "dsp2_client.api.api_client" not in modules
+
+
+def test_config_import_does_not_load_dotenv():
+    modules = loaded_modules("from dsp2_client import config; config.API_BASE_URL")
+
+    assert "dotenv" not in modules
+
+
+def test_package_import_time_budget():
+    result = run_python("import dsp2_client", "-X", "importtime")
+
+    lines = [line for line in result.stderr.splitlines() if "|" in line]
+    cumulative = {
+        line.split("|")[2].strip(): int(line.split("|")[1]) for line in lines[1:]
+    }
+    assert cumulative["dsp2_client"] < IMPORT_BUDGET_US
+
+
+def test_client_classes_are_exported_lazily():
+    import dsp2_client
+    from dsp2_client.api.api_client import DSP2Client
+
+    assert dsp2_client.DSP2Client is DSP2Client
+    assert "DSP2Client" in dir(dsp2_client)
@@ -0,0 +1,130 @@
+import asyncio
+import logging
+
+import httpx
+import pytest
+
+from dsp2_client import config, instrumentation
+from dsp2_client.api.api_client import DSP2Client
+from dsp2_client.api.async_base_client import AsyncBaseAPIClient
+from dsp2_client.api.response_cache import ResponseCache
+from dsp2_client.api.scheduler import RequestScheduler, RetryPolicy
+from dsp2_client.instrumentation import Histogram, InMemoryInstrumentation
+
+BALANCE = {
+    "id": "blnc_1234567890abcdefABCDEF12",
+    "name": "Balance1",
+    "amount": 500,
+    "currency": "EUR",
+    "type": "CLBD",
+}
+
+
+@pytest.fixture
+def metrics():
+    metrics = InMemoryInstrumentation()
+    instrumentation.set_instrumentation(metrics)
+    yield metrics
+    instrumentation.set_instrumentation(None)
+
+
+@pytest.fixture
+def transport():
+    failures = {"count": 1}
+
+    def handler(request):
+        if request.url.path == "/oauth/token":
+            return httpx.Response(200, json={"access_token": "token123"})
+        if request.url.path.endswith("acct_2/balance") and failures["count"]:
+            failures["count"] -= 1
+            return httpx.Response(503)
+        return httpx.Response(200, json=[BALANCE])
+
+    return httpx.MockTransport(handler)
+
+
+def test_client_reports_metrics_by_endpoint_template(metrics, transport):
+    client = DSP2Client(
+        "user",
+        "pass",
+        transport=transport,
+        cache=ResponseCache(),
+        scheduler=RequestScheduler(RetryPolicy(backoff_base=0)),
+    )
+
+    for account_id in ("acct_1", "acct_2", "acct_1"):
+        client.get_balances(account_id)
+
+    assert metrics.token_refreshes == {"initial": 1}
+    assert set(metrics.latency) == {config.BALANCE}
+    assert metrics.latency[config.BALANCE].count == 3
+    assert metrics.statuses[(config.BALANCE, 200)] == 2
+    assert metrics.statuses[(config.BALANCE, 503)] == 1
+    assert metrics.retries == {(config.BALANCE, "DSP2ServerError"): 1}
+    assert metrics.bytes_received[config.BALANCE] > 0
+    assert metrics.validated_items["BalanceSchema"] == 3
+    assert metrics.cache[(config.BALANCE, "hit")] == 1
+    assert metrics.cache_hit_rate(config.BALANCE) == pytest.approx(1 / 3)
+
+
+def test_async_client_reports_requests(metrics):
+    async def handler(request):
+        return httpx.Response(200, json={"id": "acct_1"})
+
+    async def main():
+        async with AsyncBaseAPIClient(
+            "http://api.test", transport=httpx.MockTransport(handler)
+        ) as client:
+            await client.get(config.ACCOUNT, path_params={"account_id": "acct_1"})
+
+    asyncio.run(main())
+
+    assert metrics.statuses == {(config.ACCOUNT, 200): 1}
+
+
+def test_transport_failures_have_no_status(metrics):
+    def handler(request):
+        raise httpx.ConnectError("refused")
+
+    client = DSP2Client(
+        "user",
+        "pass",
+        transport=httpx.MockTransport(handler),
+        lazy_auth=True,
+        scheduler=RequestScheduler(RetryPolicy(max_attempts=1)),
+    )
+    client.api.set_token("token123")
+    client.api.token_manager = None
+
+    with pytest.raises(RuntimeError):
+        client.api.get(config.IDENTITY)
+    assert metrics.statuses == {(config.IDENTITY, None): 1}
+
+
+def test_default_instrumentation_is_a_noop(transport):
+    assert (
+        type(instrumentation.get_instrumentation()) is instrumentation.Instrumentation
+    )
+    client = DSP2Client("user", "pass", transport=transport)
+    assert client.get_balances("acct_1")[0].amount == 500
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram(buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value)
+
+    snapshot = histogram.snapshot()
+
+    assert snapshot["buckets"] == {0.1: 2, 1.0: 3, float("inf"): 4}
+    assert snapshot["count"] == 4
+    assert snapshot["sum"] == pytest.approx(3.65)
+
+
+def test_debug_logging_is_lazy(metrics, transport, caplog):
+    client = DSP2Client("user", "pass", transport=transport)
+    with caplog.at_level(logging.DEBUG, logger="dsp2client"):
+        client.get_balances("acct_1")
+
+    record = next(r for r in caplog.records if r.msg.startswith("GET "))
+    assert record.args == ("/stet/account/acct_1/balance", None)
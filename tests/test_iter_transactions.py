@@ -0,0 +1,80 @@
+import json
+from datetime import timedelta
+
+import pytest
+
+from dsp2_client.models.transaction import TransactionSchema
+
+
+@pytest.fixture
+def paged_api(authenticated_client, monkeypatch, make_transaction):
+    total = 23
+    requested_pages = []
+
+    def fake_get(endpoint, params=None, path_params=None):
+        page, count = params["page"], params["count"]
+        requested_pages.append(page)
+        start = (page - 1) * count
+        page_items = [
+            make_transaction(i) for i in range(start, min(start + count, total))
+        ]
+        return json.dumps(page_items).encode()
+
+    monkeypatch.setattr(authenticated_client.api, "get_bytes", fake_get)
+    return authenticated_client, requested_pages
+
+
+@pytest.mark.parametrize("prefetch", [0, 1, 3])
+def test_iter_transactions_walks_all_pages(paged_api, prefetch, make_transaction):
+    client, requested_pages = paged_api
+
+    transactions = list(
+        client.iter_transactions("acct_id", page_size=5, prefetch=prefetch)
+    )
+
+    assert all(isinstance(txn, TransactionSchema) for txn in transactions)
+    assert [txn.id for txn in transactions] == [
+        make_transaction(i)["id"] for i in range(23)
+    ]
+    assert set(range(1, 6)) <= set(requested_pages)
+
+
+def test_iter_transactions_stops_on_exact_multiple(paged_api):
+    client, requested_pages = paged_api
+
+    transactions = list(client.iter_transactions("acct_id", page_size=23, prefetch=0))
+
+    assert len(transactions) == 23
+    assert requested_pages == [1, 2]
+
+
+def test_iter_transactions_is_lazy(paged_api):
+    client, requested_pages = paged_api
+
+    iterator = client.iter_transactions("acct_id", page_size=5, prefetch=0)
+    next(iterator)
+
+    assert requested_pages == [1]
+    iterator.close()
+
+
+@pytest.mark.parametrize("prefetch", [0, 2])
+def test_iter_transactions_since(paged_api, prefetch, make_transaction, newest):
+    client, requested_pages = paged_api
+    since = (newest - timedelta(days=7)).replace(tzinfo=None)
+
+    transactions = list(
+        client.iter_transactions("acct_id", page_size=5, since=since, prefetch=prefetch)
+    )
+
+    assert [txn.id for txn in transactions] == [
+        make_transaction(i)["id"] for i in range(8)
+    ]
+    # Page 2 reaches past `since`: only already prefetched pages may follow.
+    assert max(requested_pages) <= 2 + prefetch
+
+
+@pytest.mark.parametrize("options", [{"page_size": 0}, {"prefetch": -1}])
+def test_iter_transactions_invalid_options(authenticated_client, options):
+    with pytest.raises(ValueError):
+        next(authenticated_client.iter_transactions("acct_id", **options))
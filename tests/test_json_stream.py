@@ -0,0 +1,110 @@
+import json
+
+import httpx
+import pytest
+
+from dsp2_client.api import json_stream
+from dsp2_client.api.api_client import DSP2Client
+from dsp2_client.api.base_client import BaseAPIClient
+from dsp2_client.api.errors import DSP2ClientError, DSP2Error
+from dsp2_client.api.json_stream import JSONArrayParser, iter_array_items
+from dsp2_client.models.transaction import TransactionSchema
+
+TRICKY = [
+    {"label": 'comma, bracket ] brace } quote " backslash \\', "nested": [1, {}]},
+    3.5,
+    "\\",
+    None,
+    [],
+    {},
+]
+
+
+def chunked(raw: bytes, size: int) -> list[bytes]:
+    return [raw[i : i + size] for i in range(0, len(raw), size)]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64])
+def test_elements_are_split_at_any_chunk_boundary(size):
+    raw = json.dumps(TRICKY, indent=2).encode()
+
+    items = list(iter_array_items(chunked(raw, size)))
+
+    assert [json.loads(item) for item in items] == TRICKY
+
+
+def test_buffer_holds_only_the_current_element(make_transaction):
+    parser = JSONArrayParser()
+    raw = json.dumps([make_transaction(i) for i in range(100)]).encode()
+
+    peak = 0
+    for chunk in chunked(raw, 50):
+        parser.feed(chunk)
+        peak = max(peak, len(parser._buffer))
+    parser.close()
+
+    assert peak < 2 * len(json.dumps(make_transaction(99)))
+
+
+@pytest.mark.parametrize("chunks", [[b'{"a": 1}'], [b"[1, 2"], [b"[1] 2"], [b"x[1]"]])
+def test_invalid_arrays_are_rejected(chunks):
+    with pytest.raises(ValueError):
+        list(iter_array_items(chunks))
+
+
+def test_loads_falls_back_to_json(monkeypatch):
+    monkeypatch.setattr(json_stream, "orjson", None)
+
+    assert json_stream.loads(b'{"a": [1]}') == {"a": [1]}
+
+
+def stream_transport(pages: dict, status_code: int = 200):
+    def handler(request):
+        if request.url.path == "/oauth/token":
+            return httpx.Response(200, json={"access_token": "token123"})
+        raw = json.dumps(pages[request.url.path]).encode()
+        return httpx.Response(status_code, content=iter(chunked(raw, 16)))
+
+    return httpx.MockTransport(handler)
+
+
+def test_client_streams_array_items():
+    client = BaseAPIClient(
+        "http://api.test", transport=stream_transport({"/items": TRICKY})
+    )
+
+    items = client.iter_array("/items")
+
+    assert [json.loads(item) for item in items] == TRICKY
+
+
+def test_stream_errors_are_typed():
+    client = BaseAPIClient(
+        "http://api.test",
+        transport=stream_transport({"/items": {"error": "missing"}}, 404),
+    )
+    with pytest.raises(DSP2ClientError) as error:
+        list(client.iter_array("/items"))
+    assert "missing" in error.value.response_text
+
+    client = BaseAPIClient(
+        "http://api.test", transport=stream_transport({"/items": {"a": 1}})
+    )
+    with pytest.raises(DSP2Error, match="Failed GET /items"):
+        list(client.iter_array("/items"))
+
+
+@pytest.mark.parametrize("validate", [True, False])
+def test_stream_transactions(validate, make_transaction):
+    payload = [make_transaction(i) for i in range(5)]
+    transport = stream_transport({"/stet/account/acc-1/transaction": payload})
+    client = DSP2Client("user", "pass", transport=transport)
+
+    transactions = list(client.stream_transactions("acc-1", count=5, validate=validate))
+
+    if validate:
+        assert all(isinstance(t, TransactionSchema) for t in transactions)
+        assert [t.id for t in transactions] == [t["id"] for t in payload]
+        assert transactions[0].date_operation.year == 2024
+    else:
+        assert transactions == payload
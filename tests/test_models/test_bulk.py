@@ -0,0 +1,100 @@
+import json
+from datetime import datetime
+
+import pytest
+from pydantic import BaseModel, ValidationError
+
+from dsp2_client.models.account import AccountSchema
+from dsp2_client.models.bulk import (
+    construct_many,
+    dict_list_adapter,
+    dump_many,
+    list_adapter,
+    validate_dicts,
+    validate_dicts_json,
+    validate_many,
+    validate_many_json,
+)
+from dsp2_client.models.transaction import TransactionSchema, TransactionStatus
+
+TRANSACTION = {
+    "id": "tran_1234567890abcdefABCDEF12",
+    "label": "Test Transaction",
+    "amount": 123,
+    "crdt_dbit_indicator": "CRDT",
+    "status": "BOOK",
+    "currency": "EUR",
+    "date_operation": "2024-01-01T10:00:00Z",
+    "date_processed": None,
+}
+
+
+def test_adapter_is_cached():
+    assert list_adapter(TransactionSchema) is list_adapter(TransactionSchema)
+
+
+def test_validate_many_json_matches_model_constructor():
+    raw = (
+        b'[{"id": "tran_1234567890abcdefABCDEF12", "label": "Test Transaction",'
+        b' "amount": 123, "crdt_dbit_indicator": "CRDT", "status": "BOOK",'
+        b' "currency": "EUR", "date_operation": "2024-01-01T10:00:00Z",'
+        b' "date_processed": null}]'
+    )
+
+    assert validate_many_json(TransactionSchema, raw) == [
+        TransactionSchema(**TRANSACTION)
+    ]
+    assert validate_many(TransactionSchema, [TRANSACTION]) == [
+        TransactionSchema(**TRANSACTION)
+    ]
+
+
+def test_validate_many_rejects_invalid_items():
+    with pytest.raises(ValidationError):
+        validate_many(TransactionSchema, [TRANSACTION, {**TRANSACTION, "id": "x"}])
+
+
+def test_construct_many_round_trips_dumped_models():
+    models = validate_many(TransactionSchema, [TRANSACTION])
+
+    rebuilt = construct_many(TransactionSchema, dump_many(TransactionSchema, models))
+
+    assert rebuilt == models
+    assert isinstance(rebuilt[0].date_operation, datetime)
+    assert rebuilt[0].status is TransactionStatus.BOOK
+
+
+def test_validate_dicts_matches_dumped_models(valid_account):
+    raw = json.dumps([TRANSACTION, {**TRANSACTION, "currency": None}])
+    account = {**valid_account, "iban": valid_account["iban"].lower()}
+
+    transactions = validate_dicts_json(TransactionSchema, raw)
+    accounts = validate_dicts(AccountSchema, [account])
+
+    assert transactions == dump_many(
+        TransactionSchema, validate_many_json(TransactionSchema, raw)
+    )
+    assert transactions[0]["status"] is TransactionStatus.BOOK
+    assert accounts == dump_many(AccountSchema, validate_many(AccountSchema, [account]))
+    assert accounts[0]["iban"] == valid_account["iban"].upper()
+    with pytest.raises(ValidationError):
+        validate_dicts(AccountSchema, [{**account, "iban": "FR76-1234567890123"}])
+    with pytest.raises(ValidationError):
+        validate_dicts(TransactionSchema, [{**TRANSACTION, "id": "x"}])
+
+
+def test_trusted_dicts_skip_validators():
+    adapter = dict_list_adapter(TransactionSchema, trusted=True)
+
+    items = adapter.validate_python([{**TRANSACTION, "id": "x"}])
+
+    assert items[0]["id"] == "x"
+    assert isinstance(items[0]["date_operation"], datetime)
+
+
+def test_unsupported_models_are_refused():
+    class WithDefault(BaseModel):
+        value: int = 0
+
+    with pytest.raises(TypeError):
+        dict_list_adapter(WithDefault)
@@ -0,0 +1,70 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from pydantic import ValidationError
+
+from dsp2_client.models.account import AccountSchema
+from dsp2_client.models.bulk import validate_dicts_json
+from dsp2_client.models.offload import ProcessValidator
+from dsp2_client.models.transaction import TransactionSchema, TransactionStatus
+
+
+class CountingExecutor(ThreadPoolExecutor):
+    def __init__(self):
+        super().__init__(max_workers=1)
+        self.submitted = 0
+
+    def submit(self, fn, *args, **kwargs):
+        self.submitted += 1
+        return super().submit(fn, *args, **kwargs)
+
+
+@pytest.fixture
+def raw(make_transaction):
+    """A page of 50 transactions as encoded by the API."""
+    return json.dumps([make_transaction(i) for i in range(50)]).encode()
+
+
+def test_offloaded_and_in_process_results_match(raw):
+    executor = CountingExecutor()
+    with ProcessValidator(threshold=len(raw), executor=executor) as validator:
+        offloaded = validator.validate_dicts(TransactionSchema, raw)
+        validator.threshold += 1
+        in_process = validator.validate_dicts(TransactionSchema, raw)
+
+    assert offloaded == in_process == validate_dicts_json(TransactionSchema, raw)
+    assert offloaded[0]["date_operation"].year == 2024
+    assert offloaded[0]["status"] is TransactionStatus.BOOK
+    assert executor.submitted == 1
+
+
+def test_worker_process_validation(make_account):
+    raw = json.dumps([dict(make_account(1), iban="fr7612345678901234")]).encode()
+    with ProcessValidator(max_workers=1, threshold=0) as validator:
+        accounts = validator.validate_dicts(AccountSchema, raw)
+        with pytest.raises(ValidationError):
+            validator.validate_dicts(AccountSchema, b'[{"id": "bad"}]')
+
+    assert accounts[0]["iban"] == "FR7612345678901234"
+
+
+def test_closed_validator_refuses_work(raw):
+    validator = ProcessValidator(threshold=0)
+    validator.close()
+
+    with pytest.raises(RuntimeError):
+        validator.validate_dicts(TransactionSchema, raw)
+
+
+def test_client_validates_sections_through_the_validator(bank, make_client):
+    executor = CountingExecutor()
+    with ProcessValidator(threshold=0, executor=executor) as validator:
+        client = make_client(bank, validator=validator)
+        offloaded = client.get_full_user_data()
+        client.validator = None
+        in_process = client.get_full_user_data()
+
+    assert offloaded == in_process
+    # Balances and transactions of three accounts.
+    assert executor.submitted == 6
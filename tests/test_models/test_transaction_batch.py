@@ -0,0 +1,106 @@
+import json
+from datetime import date, datetime, timezone
+
+import pytest
+
+from dsp2_client.models import transaction_batch
+from dsp2_client.models.transaction import TransactionSchema, TransactionStatus
+from dsp2_client.models.transaction_batch import TransactionBatch
+
+
+@pytest.fixture
+def pages(make_transaction):
+    """Two pages of transactions spread over January 1st to 3rd."""
+
+    def make(index, amount, indicator, status, currency, day):
+        return make_transaction(
+            index,
+            amount=amount,
+            crdt_dbit_indicator=indicator,
+            status=status,
+            currency=currency,
+            date_operation=f"2024-01-{day:02d}T10:00:00Z",
+            date_processed=(
+                None if status == "PDNG" else f"2024-01-{day:02d}T12:00:00Z"
+            ),
+        )
+
+    return [
+        [
+            make(0, 1000, "CRDT", "BOOK", "EUR", 1),
+            make(1, 250, "DBIT", "BOOK", "EUR", 1),
+        ],
+        [
+            make(2, 300, "DBIT", "PDNG", "USD", 2),
+            make(3, 50, "CRDT", "BOOK", None, 3),
+        ],
+    ]
+
+
+@pytest.fixture(params=["numpy", "python"])
+def batch(request, monkeypatch, pages):
+    if request.param == "python":
+        monkeypatch.setattr(transaction_batch, "np", None)
+    return TransactionBatch.from_pages([json.dumps(pages[0]).encode(), pages[1]])
+
+
+def test_rows_round_trip_as_models(batch, pages):
+    expected = [TransactionSchema(**item) for page in pages for item in page]
+
+    assert len(batch) == 4
+    assert list(batch) == expected
+    assert batch[-1] == expected[-1]
+    with pytest.raises(IndexError):
+        batch[4]
+
+
+def test_from_models_matches_from_pages(batch):
+    assert list(TransactionBatch.from_models(iter(batch))) == list(batch)
+
+
+def test_take_gathers_rows_in_order(batch):
+    taken = batch.take([3, 0, 3])
+
+    assert list(taken) == [batch[3], batch[0], batch[3]]
+    assert taken.signed_sum() == 50 + 1000 + 50
+    assert len(batch.take([])) == 0
+
+
+def test_signed_sum(batch):
+    assert batch.signed_sum() == 1000 - 250 - 300 + 50
+
+
+def test_filter(batch):
+    booked = batch.filter(status=TransactionStatus.BOOK)
+    assert [txn.amount for txn in booked] == [1000, 250, 50]
+
+    january_2 = batch.filter(
+        start=datetime(2024, 1, 2, tzinfo=timezone.utc),
+        end=datetime(2024, 1, 3),
+    )
+    assert [txn.amount for txn in january_2] == [300]
+
+    assert len(batch.filter(currency="EUR", indicator="DBIT")) == 1
+    assert len(batch.filter(currency="GBP")) == 0
+    assert len(batch.filter(status=["BOOK", "PDNG"])) == 4
+
+
+def test_group_sum(batch):
+    assert batch.group_sum("currency") == {"EUR": 750, "USD": -300, None: 50}
+    assert batch.group_sum("status") == {
+        TransactionStatus.BOOK: 800,
+        TransactionStatus.PDNG: -300,
+    }
+    assert batch.group_sum("day") == {
+        date(2024, 1, 1): 750,
+        date(2024, 1, 2): -300,
+        date(2024, 1, 3): 50,
+    }
+    with pytest.raises(ValueError):
+        batch.group_sum("label")
+
+
+def test_to_numpy_requires_numpy(monkeypatch):
+    monkeypatch.setattr(transaction_batch, "np", None)
+    with pytest.raises(ImportError):
+        TransactionBatch().to_numpy()
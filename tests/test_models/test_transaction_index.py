@@ -0,0 +1,112 @@
+import json
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from dsp2_client.models import transaction_index
+from dsp2_client.models.transaction import TransactionSchema
+from dsp2_client.models.transaction_index import TransactionIndex
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+WORDS = ["card", "payment", "transfer", "salary", "rent", "coffee"]
+
+
+def make_transactions(count, seed=1, first=0):
+    rng = random.Random(seed)
+    return [
+        TransactionSchema(
+            id=f"tran_{index:024d}",
+            label=" ".join(rng.sample(WORDS, 2)).title() + f" #{index % 7}",
+            amount=rng.randrange(1, 1000),
+            crdt_dbit_indicator=rng.choice(["CRDT", "DBIT"]),
+            status=rng.choice(["BOOK", "PDNG", "FUTR"]),
+            currency=rng.choice(["EUR", "USD", None]),
+            date_operation=START + timedelta(hours=rng.randrange(0, 24 * 60)),
+            date_processed=None,
+        )
+        for index in range(first, first + count)
+    ]
+
+
+def matches(transaction, criteria) -> bool:
+    status = criteria.get("status")
+    if isinstance(status, str):
+        status = [status]
+    words = set(criteria.get("text", "").lower().split())
+    return (
+        ("start" not in criteria or transaction.date_operation >= criteria["start"])
+        and ("end" not in criteria or transaction.date_operation < criteria["end"])
+        and (status is None or transaction.status in status)
+        and (
+            "indicator" not in criteria
+            or transaction.crdt_dbit_indicator == criteria["indicator"]
+        )
+        and ("currency" not in criteria or transaction.currency == criteria["currency"])
+        and (transaction.amount >= criteria.get("min_amount", 0))
+        and (transaction.amount <= criteria.get("max_amount", 1000))
+        and words <= set(transaction.label.lower().replace("#", " ").split())
+    )
+
+
+QUERIES = [
+    {},
+    {"start": START + timedelta(days=10), "end": START + timedelta(days=12)},
+    {"status": "BOOK", "indicator": "DBIT"},
+    {"status": ["PDNG", "FUTR"], "currency": "EUR"},
+    {"currency": "GBP"},
+    {"min_amount": 100, "max_amount": 120, "indicator": "CRDT"},
+    {"text": "salary RENT"},
+    {"text": "coffee 3", "status": "BOOK", "start": START + timedelta(days=30)},
+    {"end": START + timedelta(days=5), "currency": "USD", "max_amount": 500},
+]
+
+
+@pytest.fixture(params=["numpy", "python"])
+def engine(request, monkeypatch):
+    if request.param == "python":
+        monkeypatch.setattr(transaction_index, "np", None)
+
+
+@pytest.mark.usefixtures("engine")
+def test_queries_match_a_scan():
+    transactions = make_transactions(600)
+    index = TransactionIndex()
+    # Later pages reach into earlier dates: every merge path is taken.
+    for chunk in (transactions[:300], transactions[300:310], transactions[310:]):
+        index.extend(chunk)
+        inserted = transactions[: len(index)]
+        for criteria in QUERIES:
+            expected = [t.id for t in inserted if matches(t, criteria)]
+            assert index.query(**criteria).ids == expected, criteria
+
+
+def test_reinserted_transactions_replace_their_row():
+    transactions = make_transactions(50)
+    index = TransactionIndex(transactions)
+    pending = [t for t in transactions if t.status == "PDNG"]
+
+    index.extend(t.model_copy(update={"status": "BOOK"}) for t in pending)
+
+    assert len(index) == 50
+    assert index.rows(status="PDNG") == []
+    booked = index.query(status="BOOK")
+    assert len(booked) == sum(t.status != "FUTR" for t in transactions)
+    assert index.get(pending[0].id).status == "BOOK"
+    assert pending[0].id in index
+
+
+def test_pages_are_inserted_incrementally():
+    pages = [make_transactions(20, seed=page, first=20 * page) for page in range(3)]
+    index = TransactionIndex()
+
+    index.extend_page(json.dumps([t.model_dump(mode="json") for t in pages[0]]))
+    index.extend_page([t.model_dump(mode="json") for t in pages[1]])
+    index.add(pages[2][0])
+
+    assert len(index) == 41
+    assert index.rows(text="nothing") == []
+    assert index.rows(start=START + timedelta(days=90)) == []
+    assert index.query(min_amount=0).ids == [t.id for t in pages[0] + pages[1]] + [
+        pages[2][0].id
+    ]
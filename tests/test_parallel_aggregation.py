@@ -0,0 +1,81 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from dsp2_client.api.api_client import DSP2Client
+from dsp2_client.api.batch import get_full_user_data_batch
+
+
+def make_response(payload):
+    response = MagicMock()
+    response.raise_for_status.return_value = None
+    response.json.return_value = payload
+    response.content = json.dumps(payload).encode()
+    return response
+
+
+@pytest.fixture
+def routed_get(valid_user_identity, valid_account):
+    accounts = [{**valid_account, "id": f"acct_{str(i) * 24}"} for i in range(3)]
+
+    def fake_get(endpoint, params=None):
+        if endpoint.endswith("/balance") or endpoint.endswith("/transaction"):
+            return make_response([])
+        if endpoint.endswith("/account"):
+            return make_response(accounts)
+        return make_response(valid_user_identity)
+
+    with patch("httpx.Client.get", side_effect=fake_get) as mock:
+        yield mock
+
+
+@pytest.fixture
+def mock_post():
+    with patch("httpx.Client.post") as mock:
+        mock.return_value = make_response({"access_token": "token123"})
+        yield mock
+
+
+@pytest.mark.parametrize("options", [{"max_workers": 4}, {"max_workers": 1}, {}])
+def test_get_full_user_data_with_workers(mock_post, routed_get, options):
+    client = DSP2Client("user", "pass", **options)
+    data = client.get_full_user_data()
+
+    assert [account["id"] for account in data["accounts"]] == [
+        f"acct_{str(i) * 24}" for i in range(3)
+    ]
+    assert routed_get.call_count == 2 + 2 * 3
+
+
+def test_get_full_user_data_with_injected_executor(mock_post, routed_get):
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        client = DSP2Client("user", "pass", executor=executor)
+        data = client.get_full_user_data()
+        assert len(data["accounts"]) == 3
+        assert executor.submit(lambda: "still running").result() == "still running"
+
+
+def test_invalid_max_workers():
+    with pytest.raises(ValueError):
+        DSP2Client("user", "pass", max_workers=0)
+
+
+def test_batch_isolates_user_failures(mock_post, routed_get):
+    credentials = [("alice", "pass"), ("", "missing"), ("bob", "pass")]
+
+    results = get_full_user_data_batch(credentials, max_workers=2)
+
+    assert [result.username for result in results] == ["alice", "", "bob"]
+    assert [result.ok for result in results] == [True, False, True]
+    assert isinstance(results[1].error, ValueError)
+    assert len(results[0].data["accounts"]) == 3
+
+
+def test_get_full_user_data_without_validation(mock_post, routed_get, valid_account):
+    client = DSP2Client("user", "pass")
+    data = client.get_full_user_data(validate=False)
+
+    assert data["accounts"][0]["type"] == valid_account["type"]
+    assert data["accounts"][0]["balances"] == []
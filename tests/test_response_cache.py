@@ -0,0 +1,111 @@
+import httpx
+import pytest
+
+from dsp2_client import config
+from dsp2_client.api.api_client import DSP2Client
+from dsp2_client.api.response_cache import ResponseCache
+
+ACCOUNT_ID = "acct_x05RAIZbtzKCUJ7m1MEnzOI5"
+
+
+@pytest.fixture
+def valid_balance():
+    return {
+        "id": "blnc_1234567890abcdefABCDEF12",
+        "name": "Balance1",
+        "amount": 500,
+        "currency": "EUR",
+        "type": "CLBD",
+    }
+
+
+@pytest.fixture
+def api_transport(valid_user_identity, valid_balance):
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/oauth/token":
+            return httpx.Response(200, json={"access_token": "token123"})
+        requests.append(request)
+        if request.url.path.endswith("/balance"):
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, json=[valid_balance], headers={"ETag": '"v1"'})
+        return httpx.Response(200, json=valid_user_identity)
+
+    transport = httpx.MockTransport(handler)
+    transport.requests = requests
+    return transport
+
+
+def test_fresh_entries_are_served_from_cache(api_transport):
+    cache = ResponseCache()
+    client = DSP2Client("user", "pass", transport=api_transport, cache=cache)
+
+    first = client.get_identity()
+    second = client.get_identity()
+
+    assert first == second
+    assert len(api_transport.requests) == 1
+    stats = cache.stats()
+    assert (stats.hits, stats.misses) == (1, 1)
+    assert stats.hit_rate == 0.5
+
+
+def test_entries_are_partitioned_by_user(api_transport):
+    cache = ResponseCache()
+    alice = DSP2Client("alice", "pass", transport=api_transport, cache=cache)
+    bob = DSP2Client("bob", "pass", transport=api_transport, cache=cache)
+
+    alice.get_identity()
+    bob.get_identity()
+
+    assert len(api_transport.requests) == 2
+    assert len(cache) == 2
+
+
+def test_expired_entries_are_revalidated(api_transport):
+    cache = ResponseCache(ttls={config.BALANCE: 0})
+    client = DSP2Client("user", "pass", transport=api_transport, cache=cache)
+
+    first = client.get_balances(ACCOUNT_ID)
+    second = client.get_balances(ACCOUNT_ID)
+
+    assert first == second
+    assert api_transport.requests[1].headers["If-None-Match"] == '"v1"'
+    assert cache.stats().revalidations == 1
+
+
+def test_invalidate_account(api_transport):
+    cache = ResponseCache()
+    client = DSP2Client("user", "pass", transport=api_transport, cache=cache)
+    client.get_identity()
+    client.get_balances(ACCOUNT_ID)
+
+    client.invalidate_account(ACCOUNT_ID)
+    client.get_balances(ACCOUNT_ID)
+    client.get_identity()
+
+    assert len(api_transport.requests) == 3
+
+
+def test_uncacheable_responses_are_not_stored(api_transport):
+    cache = ResponseCache(ttls={})
+    client = DSP2Client("user", "pass", transport=api_transport, cache=cache)
+
+    client.get_identity()
+    client.get_identity()
+
+    assert len(api_transport.requests) == 2
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = ResponseCache(maxsize=2)
+    for url in ("/a", "/b"):
+        cache.store(cache.key("user", url, None), url, ttl=60)
+    cache.lookup(cache.key("user", "/a", None))
+    cache.store(cache.key("user", "/c", None), "/c", ttl=60)
+
+    assert cache.lookup(cache.key("user", "/b", None)) is None
+    assert cache.lookup(cache.key("user", "/a", None)).data == "/a"
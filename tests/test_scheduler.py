@@ -0,0 +1,210 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from dsp2_client.api.async_base_client import AsyncBaseAPIClient
+from dsp2_client.api.base_client import BaseAPIClient
+from dsp2_client.api.deadline import Deadline
+from dsp2_client.api.errors import (
+    DSP2CircuitOpenError,
+    DSP2ClientError,
+    DSP2DeadlineExceededError,
+    DSP2RateLimitError,
+    DSP2ServerError,
+    DSP2TransportError,
+    parse_retry_after,
+)
+from dsp2_client.api.scheduler import (
+    CircuitBreaker,
+    RateLimiter,
+    RequestScheduler,
+    RetryPolicy,
+)
+
+FAST_RETRIES = RetryPolicy(max_attempts=3, backoff_base=0, max_retry_after=0)
+
+
+def make_client(responses, scheduler=None):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    client = BaseAPIClient(
+        "http://api.test",
+        transport=httpx.MockTransport(handler),
+        scheduler=scheduler or RequestScheduler(FAST_RETRIES),
+    )
+    return client, calls
+
+
+def test_transient_errors_are_retried():
+    client, calls = make_client(
+        [
+            httpx.Response(503),
+            httpx.Response(429, headers={"Retry-After": "1"}),
+            httpx.Response(200, json={"result": "ok"}),
+        ]
+    )
+
+    assert client.get("/test") == {"result": "ok"}
+    assert len(calls) == 3
+
+
+def test_retries_are_bounded():
+    client, calls = make_client([httpx.Response(502)] * 3)
+
+    with pytest.raises(DSP2ServerError, match="Failed GET") as error:
+        client.get("/test")
+
+    assert error.value.status_code == 502
+    assert error.value.retryable
+    assert len(calls) == 3
+
+
+def test_client_errors_are_not_retried():
+    client, calls = make_client([httpx.Response(404, text="missing")])
+
+    with pytest.raises(DSP2ClientError) as error:
+        client.get("/test")
+
+    assert not error.value.retryable
+    assert error.value.response_text == "missing"
+    assert len(calls) == 1
+
+
+def test_transport_errors_are_retried():
+    client, calls = make_client(
+        [httpx.ConnectError("refused"), httpx.Response(200, json=[])]
+    )
+
+    assert client.get("/test") == []
+    assert len(calls) == 2
+
+    client, _ = make_client([httpx.ReadTimeout("slow")] * 3)
+    with pytest.raises(DSP2TransportError, match="Failed GET"):
+        client.get("/test")
+
+
+def test_retry_after_takes_precedence():
+    policy = RetryPolicy(backoff_base=1, jitter=False, max_retry_after=30)
+
+    assert policy.delay(1) == 1
+    assert policy.delay(3) == 4
+    assert policy.delay(1, retry_after=12) == 12
+    assert policy.delay(1, retry_after=120) == 30
+    assert parse_retry_after("7") == 7
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+    assert parse_retry_after("soon") is None
+
+
+def test_rate_limit_error_exposes_retry_after():
+    scheduler = RequestScheduler(RetryPolicy(max_attempts=1))
+    client, _ = make_client(
+        [httpx.Response(429, headers={"Retry-After": "5"})], scheduler
+    )
+
+    with pytest.raises(DSP2RateLimitError) as error:
+        client.get("/test")
+    assert error.value.retry_after == 5
+
+
+def test_rate_limiter_spaces_requests():
+    limiter = RateLimiter(rate=10, capacity=2)
+
+    delays = [limiter.reserve() for _ in range(4)]
+
+    assert delays[:2] == [0, 0]
+    assert delays[2] == pytest.approx(0.1, abs=0.01)
+    assert delays[3] == pytest.approx(0.2, abs=0.01)
+
+
+def test_rate_limiter_waits_stop_at_the_deadline():
+    limiter = RateLimiter(rate=1, capacity=1)
+    scheduler = RequestScheduler(FAST_RETRIES, rate_limiter=limiter)
+    client, calls = make_client([httpx.Response(200, json={})], scheduler)
+    client.get("/test")
+
+    start = time.perf_counter()
+    with Deadline(0.2):
+        with pytest.raises(DSP2DeadlineExceededError, match="GET /test"):
+            client.get("/test")
+        with pytest.raises(DSP2DeadlineExceededError):
+            asyncio.run(limiter.acquire_async())
+
+    assert time.perf_counter() - start < 0.1
+    assert len(calls) == 1
+    # Refused waits give their token back.
+    assert limiter.reserve() == pytest.approx(1.0, abs=0.1)
+
+
+def test_circuit_breaker_opens_and_recovers():
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=60)
+    scheduler = RequestScheduler(RetryPolicy(max_attempts=1), circuit_breaker=breaker)
+    client, calls = make_client([httpx.Response(500)] * 2, scheduler)
+
+    for _ in range(2):
+        with pytest.raises(DSP2ServerError):
+            client.get("/test")
+    with pytest.raises(DSP2CircuitOpenError):
+        client.get("/test")
+    assert len(calls) == 2
+    assert breaker.state == "open"
+
+    breaker.recovery_timeout = 0
+    client, _ = make_client([httpx.Response(200, json={})], scheduler)
+    assert client.get("/test") == {}
+    assert breaker.state == "closed"
+
+
+@pytest.fixture
+def half_open():
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0)
+    breaker.record_failure()
+    return breaker
+
+
+def test_trial_refused_by_the_rate_limiter_is_released(half_open):
+    limiter = RateLimiter(rate=20, capacity=1)
+    limiter.reserve()
+    scheduler = RequestScheduler(
+        FAST_RETRIES, rate_limiter=limiter, circuit_breaker=half_open
+    )
+    client, calls = make_client([httpx.Response(200, json={})], scheduler)
+
+    with Deadline(0.01):
+        with pytest.raises(DSP2DeadlineExceededError):
+            client.get("/test")
+    client.get("/test")
+
+    assert len(calls) == 1
+    assert half_open.state == "closed"
+
+
+def test_cancelled_trial_is_released(half_open):
+    async def handler(request):
+        if request.url.path == "/slow":
+            await asyncio.sleep(1)
+        return httpx.Response(200, json={})
+
+    async def scenario():
+        async with AsyncBaseAPIClient(
+            "http://api.test",
+            transport=httpx.MockTransport(handler),
+            scheduler=RequestScheduler(FAST_RETRIES, circuit_breaker=half_open),
+        ) as client:
+            slow = asyncio.ensure_future(client.get("/slow"))
+            await asyncio.sleep(0.01)
+            slow.cancel()
+            await asyncio.gather(slow, return_exceptions=True)
+            await asyncio.sleep(0)
+            return await client.get("/fast")
+
+    assert asyncio.run(scenario()) == {}
+    assert half_open.state == "closed"
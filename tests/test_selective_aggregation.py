@@ -0,0 +1,123 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from dsp2_client.api.selection import AccountSelection, DateWindow
+from dsp2_client.models.account import AccountType, AccountUsage
+
+
+@pytest.fixture
+def client(bank, make_client):
+    return make_client(bank)
+
+
+def test_unselected_accounts_are_never_fetched(client, bank, accounts):
+    data = client.get_full_user_data(
+        account_types=AccountType.CACC, account_usages=["PRIV"]
+    )
+
+    assert [account["id"] for account in data["accounts"]] == [accounts[0]["id"]]
+    assert {key[1] for key in bank.requests if isinstance(key, tuple)} == {
+        accounts[0]["id"]
+    }
+
+
+def test_excluded_sections_are_skipped(client, bank, accounts):
+    data = client.get_full_user_data(
+        account_ids=[accounts[1]["id"]],
+        include_identity=False,
+        include_transactions=False,
+    )
+
+    assert "identity" not in data
+    assert set(data["accounts"][0]) == set(accounts[1]) | {"balances"}
+    assert bank.count("identity") == 0
+    assert bank.count("transaction") == 0
+    assert bank.count("balance") == 1
+
+
+def test_accounts_only(client, bank):
+    data = client.get_full_user_data(
+        include_identity=False, include_balances=False, include_transactions=False
+    )
+
+    assert len(data["accounts"]) == 3
+    assert bank.count("balance") == bank.count("transaction") == 0
+
+
+@pytest.mark.parametrize("validate", [True, False])
+def test_date_window_pages_until_past_since(
+    client, bank, validate, accounts, make_transaction, newest
+):
+    since = newest - timedelta(days=12)
+    until = newest - timedelta(days=2)
+
+    data = client.get_full_user_data(
+        transactions_per_account=5,
+        validate=validate,
+        account_ids=[accounts[0]["id"]],
+        include_balances=False,
+        since=since,
+        until=until,
+    )
+
+    transactions = data["accounts"][0]["transactions"]
+    assert [t["id"] for t in transactions] == [
+        make_transaction(i)["id"] for i in range(3, 13)
+    ]
+    # Pages 1-3 hold transactions 0-14; page 3 reaches before `since`.
+    assert bank.count("transaction") == 3
+
+
+def test_date_window_stops_at_end_of_history(client, bank, accounts, newest):
+    data = client.get_full_user_data(
+        transactions_per_account=8,
+        account_ids=[accounts[0]["id"]],
+        since=newest - timedelta(days=365),
+    )
+
+    assert len(data["accounts"][0]["transactions"]) == bank.transactions
+    assert bank.count("transaction") == 4
+
+
+def test_async_client_applies_the_same_selection(
+    bank, make_async_client, accounts, newest
+):
+    async def run():
+        async with make_async_client(bank) as client:
+            return await client.get_full_user_data(
+                transactions_per_account=5,
+                account_usages=AccountUsage.ORGA,
+                include_identity=False,
+                include_balances=False,
+                until=newest - timedelta(days=27),
+            )
+
+    data = asyncio.run(run())
+
+    assert "identity" not in data
+    assert [account["id"] for account in data["accounts"]] == [accounts[2]["id"]]
+    assert len(data["accounts"][0]["transactions"]) == 2
+    assert bank.count("balance") == 0
+    assert bank.count("identity") == 0
+
+
+def test_selection_normalizes_values():
+    selection = AccountSelection.build("acct_1", ["CARD"], AccountUsage.PRIV)
+
+    assert selection.account_ids == {"acct_1"}
+    assert selection.types == {AccountType.CARD}
+    with pytest.raises(ValueError):
+        AccountSelection.build(account_types=["SAVINGS"])
+
+
+def test_date_window_bounds():
+    window = DateWindow(since=datetime(2024, 1, 1), until=datetime(2024, 2, 1))
+
+    assert window.contains("2024-01-01T00:00:00+00:00")
+    assert not window.contains(datetime(2024, 2, 1, tzinfo=timezone.utc))
+    assert window.is_before("2023-12-31T23:59:59+00:00")
+    assert not DateWindow()
+    with pytest.raises(ValueError):
+        DateWindow(since=datetime(2024, 2, 1), until=datetime(2024, 1, 1))
@@ -0,0 +1,146 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+from dsp2_client.api.async_base_client import AsyncBaseAPIClient
+from dsp2_client.api.base_client import BaseAPIClient
+from dsp2_client.api.single_flight import AsyncSingleFlight, SingleFlight
+
+
+def test_concurrent_calls_share_one_result():
+    group = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def fn():
+        calls.append(1)
+        release.wait(1)
+        return {"value": 42}
+
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        futures = [executor.submit(group.do, "key", fn) for _ in range(5)]
+        time.sleep(0.05)
+        release.set()
+        results = [future.result() for future in futures]
+
+    assert len(calls) == 1
+    assert group.shared == 4
+    assert all(result is results[0] for result in results)
+
+
+def test_errors_are_shared_and_not_cached():
+    group = SingleFlight()
+    release = threading.Event()
+
+    def fail():
+        release.wait(1)
+        raise RuntimeError("boom")
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = [executor.submit(group.do, "key", fail) for _ in range(3)]
+        time.sleep(0.05)
+        release.set()
+        for future in futures:
+            with pytest.raises(RuntimeError, match="boom"):
+                future.result()
+
+    assert group.do("key", lambda: "ok") == "ok"
+
+
+def test_client_coalesces_identical_gets():
+    release = threading.Event()
+    requests = []
+
+    def handler(request):
+        requests.append(str(request.url))
+        release.wait(1)
+        return httpx.Response(200, json=[{"id": "acc-1"}])
+
+    client = BaseAPIClient("http://api.test", transport=httpx.MockTransport(handler))
+    client.set_token("token")
+
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        futures = [executor.submit(client.get, "/accounts") for _ in range(4)]
+        futures += [
+            executor.submit(client.get, "/accounts", {"page": 2}) for _ in range(2)
+        ]
+        time.sleep(0.05)
+        release.set()
+        results = [future.result() for future in futures]
+
+    assert results == [[{"id": "acc-1"}]] * 6
+    assert sorted(requests) == [
+        "http://api.test/accounts",
+        "http://api.test/accounts?page=2",
+    ]
+    assert client.get("/accounts") == [{"id": "acc-1"}]
+    assert len(requests) == 3
+
+
+def test_async_client_coalesces_identical_gets():
+    requests = []
+
+    async def handler(request):
+        requests.append(str(request.url))
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json={"id": "acc-1"})
+
+    async def main():
+        client = AsyncBaseAPIClient(
+            "http://api.test", transport=httpx.MockTransport(handler)
+        )
+        path_params = {"account_id": "acc-1"}
+        results = await asyncio.gather(
+            *(
+                client.get("/account/{account_id}", path_params=path_params)
+                for _ in range(5)
+            )
+        )
+        await client.aclose()
+        return client, results
+
+    client, results = asyncio.run(main())
+
+    assert results == [{"id": "acc-1"}] * 5
+    assert requests == ["http://api.test/account/acc-1"]
+    assert client.single_flight.shared == 4
+
+
+def test_async_cancelled_caller_does_not_cancel_others():
+    async def fn():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def main():
+        group = AsyncSingleFlight()
+        first = asyncio.ensure_future(group.do("key", fn))
+        second = asyncio.ensure_future(group.do("key", fn))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second, first.cancelled()
+
+    assert asyncio.run(main()) == ("done", True)
+
+
+def test_async_call_is_cancelled_with_its_last_caller():
+    started = []
+
+    async def fn():
+        started.append(asyncio.current_task())
+        await asyncio.sleep(1)
+
+    async def main():
+        group = AsyncSingleFlight()
+        callers = [asyncio.ensure_future(group.do("key", fn)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        for caller in callers:
+            caller.cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        await asyncio.sleep(0)
+        return started[0].cancelled()
+
+    assert asyncio.run(main())
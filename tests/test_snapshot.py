@@ -0,0 +1,143 @@
+import io
+import mmap
+import struct
+
+import pytest
+
+from dsp2_client.models.account import AccountSchema
+from dsp2_client.models.transaction import TransactionSchema, TransactionStatus
+from dsp2_client.snapshot import (
+    MAGIC,
+    SNAPSHOT_VERSION,
+    Snapshot,
+    SnapshotError,
+    dumps_snapshot,
+    read_snapshot,
+    write_snapshot,
+)
+
+
+@pytest.fixture
+def data(bank, make_client):
+    return make_client(bank).get_full_user_data()
+
+
+def test_round_trip(data):
+    snapshot = Snapshot(dumps_snapshot(data))
+
+    assert snapshot.version == SNAPSHOT_VERSION
+    assert len(snapshot) == 3
+    assert snapshot.to_dict() == data
+
+
+def test_loads_models_without_validation(data):
+    snapshot = Snapshot(dumps_snapshot(data))
+
+    account = snapshot.account(1)
+    transaction = account.transactions[0]
+
+    assert isinstance(account.account, AccountSchema)
+    assert isinstance(transaction, TransactionSchema)
+    assert isinstance(transaction.status, TransactionStatus)
+    assert account.account.model_dump() == {
+        key: value
+        for key, value in data["accounts"][1].items()
+        if key not in ("balances", "transactions")
+    }
+    assert [t.model_dump() for t in account.transactions] == (
+        data["accounts"][1]["transactions"]
+    )
+    assert snapshot.identity.model_dump() == data["identity"]
+
+
+def test_unvalidated_and_model_input(data, bank, make_client):
+    raw = make_client(bank).get_full_user_data(validate=False)
+    models = {
+        "accounts": [
+            AccountSchema.model_validate(account) for account in data["accounts"]
+        ]
+    }
+
+    assert Snapshot(dumps_snapshot(raw)).to_dict() == data
+    loaded = Snapshot(dumps_snapshot(models)).to_dict()
+    assert "identity" not in loaded
+    assert "balances" not in loaded["accounts"][0]
+    assert "transactions" not in loaded["accounts"][0]
+    assert loaded["accounts"][2]["iban"] == data["accounts"][2]["iban"]
+
+
+def test_memory_mapped_file(data, tmp_path):
+    path = tmp_path / "user.snap"
+    write_snapshot(data, path)
+
+    with Snapshot.open(path) as snapshot:
+        transactions = snapshot.transactions(2)
+    buffer = io.BytesIO()
+    write_snapshot(data, buffer)
+
+    assert [t.model_dump() for t in transactions] == data["accounts"][2]["transactions"]
+    assert read_snapshot(path) == data
+    assert buffer.getvalue() == path.read_bytes()
+
+
+def test_non_ascii_and_missing_values():
+    account = {
+        "id": "acct_x05RAIZbtzKCUJ7m1MEnzOI5",
+        "type": "CACC",
+        "usage": "PRIV",
+        "iban": "FR7612345678901234",
+        "name": "Compte épargne €",
+        "currency": "EUR",
+    }
+    data = {"identity": None, "accounts": [dict(account, balances=[])]}
+
+    loaded = Snapshot(dumps_snapshot(data)).to_dict()
+
+    assert loaded == data
+
+
+def test_rejects_other_files_and_versions(data):
+    encoded = dumps_snapshot(data)
+    newer = MAGIC + struct.pack("<H", SNAPSHOT_VERSION + 1) + encoded[10:]
+
+    with pytest.raises(SnapshotError, match="Not a dsp2client snapshot"):
+        Snapshot(b"{" + encoded[1:])
+    with pytest.raises(SnapshotError, match="newer"):
+        Snapshot(newer)
+    with pytest.raises(SnapshotError):
+        Snapshot(encoded[: len(encoded) // 2])
+
+
+@pytest.mark.parametrize("corrupt", ["magic", "truncated", "garbage"])
+def test_open_releases_a_rejected_file(data, tmp_path, monkeypatch, corrupt):
+    encoded = dumps_snapshot(data)
+    path = tmp_path / "user.snap"
+    path.write_bytes(
+        {
+            "magic": b"XXXX" + encoded[4:],
+            "truncated": encoded[: len(encoded) // 2],
+            "garbage": encoded[:12] + b"\xff" * 64,
+        }[corrupt]
+    )
+    mapped = []
+    mmap_type = mmap.mmap
+
+    def recording_mmap(*args, **kwargs):
+        mapped.append(mmap_type(*args, **kwargs))
+        return mapped[-1]
+
+    monkeypatch.setattr(mmap, "mmap", recording_mmap)
+
+    with pytest.raises(SnapshotError):
+        Snapshot.open(path)
+
+    assert mapped[0].closed
+
+
+def test_rejects_unknown_enum_values(data):
+    transaction = dict(data["accounts"][0]["transactions"][0], status="LOST")
+
+    with pytest.raises(SnapshotError, match="LOST"):
+        dumps_snapshot(
+            {"accounts": [dict(data["accounts"][0], transactions=[transaction])]}
+        )
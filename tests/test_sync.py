@@ -0,0 +1,92 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from dsp2_client.models.transaction import TransactionSchema, TransactionStatus
+from dsp2_client.sync.engine import TransactionSync
+from dsp2_client.sync.store import TransactionStore
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+ACCOUNT_ID = "acct_x05RAIZbtzKCUJ7m1MEnzOI5"
+
+
+@pytest.fixture
+def make_transaction(make_transaction):
+    """Transaction models one day apart, oldest first from START."""
+
+    def make(index: int, status: str = "BOOK") -> TransactionSchema:
+        return TransactionSchema(
+            **make_transaction(
+                index,
+                amount=index,
+                status=status,
+                date_operation=START + timedelta(days=index),
+            )
+        )
+
+    return make
+
+
+class FakeClient:
+    """Serves a transaction history most recent first, like the API."""
+
+    def __init__(self, transactions):
+        self.history = transactions
+        self.requested_pages = []
+
+    def get_transactions(self, account_id, page=1, count=10):
+        self.requested_pages.append(page)
+        ordered = sorted(
+            self.history, key=lambda t: (t.date_operation, t.id), reverse=True
+        )
+        return ordered[(page - 1) * count : page * count]
+
+
+@pytest.fixture
+def store():
+    with TransactionStore() as store:
+        yield store
+
+
+def test_first_sync_downloads_full_history(store, make_transaction):
+    client = FakeClient([make_transaction(i) for i in range(100)])
+
+    result = TransactionSync(client, store, page_size=10).sync_account(ACCOUNT_ID)
+
+    assert (result.inserted, result.updated, result.pages) == (100, 0, 11)
+    assert store.count(ACCOUNT_ID) == 100
+    assert store.high_water_mark(ACCOUNT_ID) == (
+        START + timedelta(days=99),
+        make_transaction(99).id,
+    )
+
+
+def test_incremental_sync_fetches_only_new_pages(store, make_transaction):
+    history = [make_transaction(i) for i in range(98)] + [
+        make_transaction(98, "PDNG"),
+        make_transaction(99, "PDNG"),
+    ]
+    client = FakeClient(history)
+    sync = TransactionSync(client, store, page_size=10, overlap=timedelta(days=5))
+    sync.sync_account(ACCOUNT_ID)
+
+    client.history = [make_transaction(i) for i in range(103)]
+    client.requested_pages = []
+    result = sync.sync_account(ACCOUNT_ID)
+
+    assert client.requested_pages == [1]
+    assert (result.inserted, result.updated) == (3, 2)
+    assert store.count(ACCOUNT_ID) == 103
+    assert store.transactions(ACCOUNT_ID, status=TransactionStatus.PDNG) == []
+
+
+def test_store_reads_back_models(store, make_transaction):
+    transactions = [make_transaction(i) for i in range(5)]
+    store.upsert(ACCOUNT_ID, transactions)
+
+    assert store.upsert(ACCOUNT_ID, transactions) == (0, 0)
+    assert store.transactions(ACCOUNT_ID) == transactions[::-1]
+    assert store.transactions(
+        ACCOUNT_ID, start=START + timedelta(days=1), end=START + timedelta(days=3)
+    ) == [transactions[2], transactions[1]]
+    assert store.transactions(ACCOUNT_ID, limit=1) == [transactions[4]]
@@ -0,0 +1,153 @@
+import json
+import stat
+import sys
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from dsp2_client.api.api_client import DSP2Client
+from dsp2_client.api.token_cache import (
+    CachedToken,
+    FileTokenCache,
+    InMemoryTokenCache,
+    TokenCache,
+)
+
+KEY = ("https://api.test", "user", "stet")
+
+
+@pytest.fixture
+def mock_post():
+    with patch("httpx.Client.post") as mock:
+        response = MagicMock()
+        response.status_code = 200
+        response.json.return_value = {
+            "access_token": "token123",
+            "refresh_token": "refresh123",
+            "expires_in": 3600,
+        }
+        mock.return_value = response
+        yield mock
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    pytest.importorskip("cryptography")
+    return tmp_path / "tokens.json"
+
+
+def test_in_memory_cache_evicts_least_recently_used():
+    cache = InMemoryTokenCache(maxsize=2)
+    cache.set(("a", "u", "s"), CachedToken("a"))
+    cache.set(("b", "u", "s"), CachedToken("b"))
+    cache.get(("a", "u", "s"))
+    cache.set(("c", "u", "s"), CachedToken("c"))
+
+    assert cache.get(("b", "u", "s")) is None
+    assert cache.get(("a", "u", "s")).access_token == "a"
+    assert len(cache) == 2
+
+
+def test_in_memory_cache_expires_entries():
+    cache = InMemoryTokenCache(ttl=0)
+    cache.set(KEY, CachedToken("token"))
+    assert cache.get(KEY) is None
+
+    cache = InMemoryTokenCache()
+    cache.set(KEY, CachedToken("token", expires_at=time.time() - 1))
+    assert cache.get(KEY) is None
+
+
+def test_incomplete_cache_fails_on_creation():
+    class GetOnly(TokenCache):
+        def get(self, key):
+            return None
+
+    with pytest.raises(TypeError, match="abstract"):
+        GetOnly()
+
+
+def test_file_cache_round_trip_is_encrypted(cache_path):
+    token = CachedToken("token123", "refresh123", time.time() + 60, 60.0)
+
+    FileTokenCache(cache_path, secret="s3cret").set(KEY, token)
+
+    content = cache_path.read_text()
+    assert "token123" not in content
+    assert "user" not in content
+    assert stat.S_IMODE(cache_path.stat().st_mode) == 0o600
+    assert FileTokenCache(cache_path, secret="s3cret").get(KEY) == token
+    assert FileTokenCache(cache_path, secret="other").get(KEY) is None
+
+
+def test_file_cache_entries_are_bound_to_their_key(cache_path):
+    cache = FileTokenCache(cache_path, secret="s3cret")
+    other = ("https://api.test", "other", "stet")
+    cache.set(KEY, CachedToken("token123"))
+    cache.set(other, CachedToken("token456"))
+
+    entries = json.loads(cache_path.read_text())
+    first, second = entries
+    entries[first], entries[second] = entries[second], entries[first]
+    cache_path.write_text(json.dumps(entries))
+
+    assert cache.get(KEY) is None
+    assert cache.get(other) is None
+
+
+def test_file_cache_drops_expired_entries_on_write(cache_path):
+    cache = FileTokenCache(cache_path, secret="s3cret")
+    cache.set(("a", "u", "s"), CachedToken("a", expires_at=time.time() - 1))
+    cache.set(("b", "u", "s"), CachedToken("b"))
+
+    assert len(json.loads(cache_path.read_text())) == 1
+    assert cache.get(("b", "u", "s")).access_token == "b"
+
+
+def test_file_cache_delete(cache_path):
+    cache = FileTokenCache(cache_path, secret="s3cret")
+    cache.set(KEY, CachedToken("token123"))
+    cache.delete(KEY)
+
+    assert cache.get(KEY) is None
+
+
+def test_file_cache_requires_secret(cache_path, monkeypatch):
+    monkeypatch.delenv("DSP2CLIENT_TOKEN_CACHE_KEY", raising=False)
+    with pytest.raises(ValueError):
+        FileTokenCache(cache_path)
+
+
+def test_file_cache_requires_cryptography(tmp_path, monkeypatch):
+    monkeypatch.setitem(
+        sys.modules, "cryptography.hazmat.primitives.ciphers.aead", None
+    )
+    with pytest.raises(ImportError, match="dsp2client\\[encryption\\]"):
+        FileTokenCache(tmp_path / "tokens.json", secret="s3cret")
+
+
+def test_clients_share_cached_token(mock_post):
+    cache = InMemoryTokenCache()
+
+    first = DSP2Client("user", "pass", token_cache=cache)
+    second = DSP2Client("user", "pass", token_cache=cache)
+    other_user = DSP2Client("other", "pass", token_cache=cache)
+
+    assert mock_post.call_count == 2
+    assert second.authenticator.token == first.authenticator.token == "token123"
+    assert second.authenticator.refresh_token == "refresh123"
+    assert other_user.authenticator.token == "token123"
+
+
+def test_lazy_auth_defers_token_request(mock_post, valid_user_identity):
+    client = DSP2Client("user", "pass", lazy_auth=True)
+    assert mock_post.call_count == 0
+
+    with patch.object(client.api._client, "get") as mock_get:
+        mock_get.return_value.status_code = 200
+        mock_get.return_value.json.return_value = valid_user_identity
+        client.get_identity()
+
+    assert mock_post.call_count == 1
+    assert client.api._client.headers["Authorization"] == "Bearer token123"
@@ -0,0 +1,132 @@
+import asyncio
+import threading
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from dsp2_client.api.api_client import DSP2Client
+from dsp2_client.api.async_api_client import AsyncDSP2Client
+
+
+def make_response(payload, status_code=200):
+    response = MagicMock()
+    response.status_code = status_code
+    response.raise_for_status.return_value = None
+    response.json.return_value = payload
+    return response
+
+
+def token_response(access_token, refresh_token="refresh123", expires_in=3600):
+    return make_response(
+        {
+            "access_token": access_token,
+            "refresh_token": refresh_token,
+            "expires_in": expires_in,
+        }
+    )
+
+
+@pytest.fixture
+def mock_post():
+    with patch("httpx.Client.post") as mock:
+        mock.return_value = token_response("token123")
+        yield mock
+
+
+def test_records_expiry_and_refresh_token(mock_post):
+    client = DSP2Client("user", "pass")
+
+    assert client.authenticator.refresh_token == "refresh123"
+    assert client.authenticator.expires_at == pytest.approx(time.time() + 3600, 5)
+    assert not client.token_manager.needs_refresh()
+
+
+def test_refreshes_before_expiry_with_refresh_grant(mock_post):
+    client = DSP2Client("user", "pass")
+    client.authenticator.expires_at = time.time() + 10
+    mock_post.return_value = token_response("token456")
+
+    assert client.token_manager.get_token() == "token456"
+    assert mock_post.call_args.kwargs["data"]["grant_type"] == "refresh_token"
+
+
+def test_refresh_falls_back_to_password_grant(mock_post):
+    client = DSP2Client("user", "pass")
+    client.authenticator.expires_at = time.time() - 1
+    rejected = make_response({}, status_code=400)
+    rejected.raise_for_status.side_effect = Exception("invalid_grant")
+    mock_post.side_effect = [rejected, token_response("token789")]
+
+    assert client.token_manager.get_token() == "token789"
+    grants = [call.kwargs["data"]["grant_type"] for call in mock_post.call_args_list]
+    assert grants[-2:] == ["refresh_token", "password"]
+
+
+def test_token_without_expiry_is_kept(mock_post):
+    mock_post.return_value = make_response({"access_token": "token123"})
+    client = DSP2Client("user", "pass")
+
+    assert client.authenticator.expires_at is None
+    assert not client.token_manager.needs_refresh()
+
+
+def test_unauthorized_response_is_replayed_once(mock_post, valid_account):
+    client = DSP2Client("user", "pass")
+    mock_post.return_value = token_response("token456")
+
+    with patch.object(client.api._client, "get") as mock_get:
+        mock_get.side_effect = [
+            make_response({}, status_code=401),
+            make_response([valid_account]),
+        ]
+        accounts = client.get_accounts()
+
+    assert accounts[0].id == valid_account["id"]
+    assert mock_get.call_count == 2
+    assert client.api._client.headers["Authorization"] == "Bearer token456"
+
+
+def test_concurrent_callers_share_one_refresh(mock_post):
+    client = DSP2Client("user", "pass")
+    client.authenticator.expires_at = time.time() - 1
+
+    def slow_post(*args, **kwargs):
+        time.sleep(0.05)
+        return token_response("token456")
+
+    mock_post.side_effect = slow_post
+    calls_before = mock_post.call_count
+    tokens = []
+    threads = [
+        threading.Thread(target=lambda: tokens.append(client.token_manager.get_token()))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert tokens == ["token456"] * 8
+    assert mock_post.call_count - calls_before == 1
+
+
+def test_async_unauthorized_response_is_replayed_once(valid_account):
+    async def scenario():
+        with patch("httpx.AsyncClient.post", new_callable=AsyncMock) as mock_post:
+            mock_post.side_effect = [token_response("token123"), token_response("t2")]
+            async with AsyncDSP2Client("user", "pass") as client:
+                with patch.object(
+                    client.api._client, "get", new_callable=AsyncMock
+                ) as mock_get:
+                    mock_get.side_effect = [
+                        make_response({}, status_code=401),
+                        make_response([valid_account]),
+                    ]
+                    accounts = await client.get_accounts()
+            return accounts, mock_post.call_count
+
+    accounts, post_calls = asyncio.run(scenario())
+
+    assert accounts[0].id == valid_account["id"]
+    assert post_calls == 2
@@ -0,0 +1,175 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+import pytest
+
+from dsp2_client.models.balance import BalanceSchema
+from dsp2_client.watch.watcher import BalanceChange, BalanceWatcher, diff_balances
+
+
+def balance(index: int, amount: int) -> BalanceSchema:
+    return BalanceSchema(
+        id=f"blnc_{index:024d}",
+        name=f"Balance {index}",
+        amount=amount,
+        currency="EUR",
+        type="CLBD",
+    )
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def bank():
+    balances = {"acct_1": [balance(1, 100)], "acct_2": [balance(2, 500)]}
+    client = MagicMock()
+    client.get_balances.side_effect = lambda account_id: list(balances[account_id])
+    return client, balances
+
+
+def make_watcher(clock, **options) -> BalanceWatcher:
+    options = {"min_interval": 10, "max_interval": 80, "backoff": 2, **options}
+    return BalanceWatcher(clock=clock, **options)
+
+
+def test_only_changes_are_emitted(bank):
+    client, balances = bank
+    clock = Clock()
+    watcher = make_watcher(clock)
+    received = []
+    watcher.on_change(received.append)
+    watcher.watch(client, "acct_1")
+    watcher.watch(client, "acct_2")
+
+    assert watcher.poll_once() == []
+    clock.now = 20
+    balances["acct_1"] = [balance(1, 80), balance(3, 5)]
+    changes = watcher.poll_once()
+
+    assert [(c.balance_id[-1], c.kind, c.delta) for c in changes] == [
+        ("1", "changed", -20),
+        ("3", "added", 5),
+    ]
+    assert received == changes
+
+
+def test_intervals_adapt_to_activity(bank):
+    client, balances = bank
+    clock = Clock()
+    watcher = make_watcher(clock)
+    watcher.watch(client, "acct_1")
+    watcher.watch(client, "acct_2")
+
+    watcher.poll_once()
+    assert watcher.interval("acct_1") == 20
+    for clock.now in (20, 60):
+        watcher.poll_once()
+    assert watcher.interval("acct_1") == 80
+    assert watcher.next_poll_in() == 80
+
+    clock.now = 140
+    balances["acct_2"] = [balance(2, 400)]
+    watcher.poll_once()
+    assert watcher.interval("acct_1") == 80
+    assert watcher.interval("acct_2") == 10
+    assert watcher.next_poll_in() == 10
+
+
+def test_quiet_accounts_are_not_polled(bank):
+    client, _ = bank
+    clock = Clock()
+    watcher = make_watcher(clock)
+    watcher.watch(client, "acct_1")
+    watcher.poll_once()
+
+    clock.now = 5
+    assert watcher.poll_once() == []
+    assert client.get_balances.call_count == 1
+
+
+def test_errors_are_reported_and_retried(bank):
+    client, balances = bank
+    clock = Clock()
+    watcher = make_watcher(clock)
+    errors = []
+    watcher.on_error(lambda account_id, error: errors.append(account_id))
+    watcher.watch(client, "acct_1")
+    del balances["acct_1"]
+
+    assert watcher.poll_once() == []
+    assert errors == ["acct_1"]
+    assert watcher.next_poll_in() == 20
+
+
+def test_removed_balances_and_unwatch(bank):
+    client, balances = bank
+    clock = Clock()
+    watcher = make_watcher(clock)
+    watcher.watch(client, "acct_1")
+    watcher.poll_once()
+
+    clock.now = 20
+    balances["acct_1"] = []
+    [change] = watcher.poll_once()
+    assert change.kind == "removed"
+    assert change.delta == -100
+
+    watcher.unwatch("acct_1")
+    assert watcher.next_poll_in() is None
+    assert len(watcher) == 0
+
+
+def test_due_accounts_are_fetched_concurrently(bank):
+    client, _ = bank
+    barrier = threading.Barrier(2, timeout=1)
+
+    def get_balances(account_id):
+        barrier.wait()
+        return [balance(1, 1)]
+
+    client.get_balances.side_effect = get_balances
+    watcher = make_watcher(Clock(), max_workers=2)
+    watcher.watch(client, "acct_1")
+    watcher.watch(client, "acct_2")
+
+    watcher.poll_once()
+    assert client.get_balances.call_count == 2
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        watcher = make_watcher(Clock(), executor=executor)
+        watcher.watch(client, "acct_1")
+        watcher.watch(client, "acct_2")
+        watcher.poll_once()
+
+
+def test_async_iterator_yields_changes(bank):
+    client, balances = bank
+    watcher = BalanceWatcher(min_interval=0.01, max_interval=0.02, emit_initial=True)
+    watcher.watch(client, "acct_1")
+
+    async def first_changes(count):
+        changes = []
+        async for change in watcher.changes():
+            changes.append(change)
+            balances["acct_1"] = [balance(1, 100 + len(changes))]
+            if len(changes) == count:
+                return changes
+
+    changes = asyncio.run(first_changes(2))
+
+    assert [c.kind for c in changes] == ["added", "changed"]
+    assert changes[1].delta == 1
+
+
+def test_diff_balances():
+    assert diff_balances("acct_1", {"a": 1}, []) == [
+        BalanceChange("acct_1", "a", 1, None)
+    ]